@@ -18,6 +18,13 @@ from api import auth_models
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # FTS5 virtual table + shadow tables are managed by raw DDL (services/search.py)
+    if type_ == "table" and name and name.startswith("books_fts"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     raise RuntimeError("Offline migrations are not supported; run alembic in online mode for Turso/libSQL.")
 
@@ -32,6 +39,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             render_as_batch=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
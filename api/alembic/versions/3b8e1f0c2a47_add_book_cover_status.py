@@ -0,0 +1,30 @@
+"""add book cover_status
+
+Revision ID: 3b8e1f0c2a47
+Revises: daeede6634d4
+Create Date: 2026-10-17 09:12:41.318204
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "3b8e1f0c2a47"
+down_revision: Union[str, Sequence[str], None] = "daeede6634d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_column("books", "cover_status"):
+        op.add_column("books", sa.Column("cover_status", sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    if _has_column("books", "cover_status"):
+        op.drop_column("books", "cover_status")
@@ -0,0 +1,41 @@
+"""add token_blocklist.expires_at for pruning revoked tokens
+
+Revision ID: 5a1d7c3e9b20
+Revises: e9b04f7d1c63
+Create Date: 2026-10-17 15:02:11.604318
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "5a1d7c3e9b20"
+down_revision: Union[str, Sequence[str], None] = "e9b04f7d1c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    # existing rows keep NULL; the pruner ages those out by created_at
+    if not _has_column("token_blocklist", "expires_at"):
+        op.add_column("token_blocklist", sa.Column("expires_at", sa.DateTime(), nullable=True))
+    if not _has_index("token_blocklist", "ix_token_blocklist_expires_at"):
+        op.create_index(op.f("ix_token_blocklist_expires_at"), "token_blocklist", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    if _has_index("token_blocklist", "ix_token_blocklist_expires_at"):
+        op.drop_index(op.f("ix_token_blocklist_expires_at"), table_name="token_blocklist")
+    if _has_column("token_blocklist", "expires_at"):
+        op.drop_column("token_blocklist", "expires_at")
@@ -0,0 +1,37 @@
+"""add cover_cache table
+
+Revision ID: 8d2c6a41e9f3
+Revises: 3b8e1f0c2a47
+Create Date: 2026-10-17 10:03:55.604112
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "8d2c6a41e9f3"
+down_revision: Union[str, Sequence[str], None] = "3b8e1f0c2a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if "cover_cache" not in set(insp.get_table_names()):
+        op.create_table(
+            "cover_cache",
+            sa.Column("lookup_key", sa.String(40), primary_key=True),
+            sa.Column("cover_url", sa.String(512), nullable=True),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_cover_cache_expires_at", "cover_cache", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if "cover_cache" in set(insp.get_table_names()):
+        op.drop_index("ix_cover_cache_expires_at", table_name="cover_cache")
+        op.drop_table("cover_cache")
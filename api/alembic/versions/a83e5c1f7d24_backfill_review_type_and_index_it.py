@@ -0,0 +1,70 @@
+"""backfill books.review_type from is_recommended and move the review-type indexes onto it
+
+Revision ID: a83e5c1f7d24
+Revises: f4a9c2e83b61
+Create Date: 2026-10-17 19:32:40.118305
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a83e5c1f7d24"
+down_revision: Union[str, Sequence[str], None] = "f4a9c2e83b61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = {
+    "idx_books_review_type_created_id": ["review_type", "created_at", "id"],
+    "idx_books_review_type_review_length_id": ["review_type", "review_length", "id"],
+    "idx_books_genre_review_type_created_id": ["genre", "review_type", "created_at", "id"],
+}
+
+_IS_RECOMMENDED_INDEXES = {
+    "idx_books_is_recommended_created_id": ["is_recommended", "created_at", "id"],
+    "idx_books_is_recommended_review_length_id": ["is_recommended", "review_length", "id"],
+    "idx_books_genre_is_recommended_created_id": ["genre", "is_recommended", "created_at", "id"],
+}
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    if not _has_column("books", "review_type"):
+        op.add_column("books", sa.Column("review_type", sa.String(20), nullable=True))
+
+    # is_recommended is what the API has always written; whatever the seed
+    # script put in review_type disagrees with it, so overwrite every row.
+    # The column stays nullable in existing databases (no ALTER COLUMN in
+    # SQLite, and a batch table rebuild would drop the books_fts triggers);
+    # Book fills it on every ORM write.
+    op.execute(
+        "UPDATE books SET review_type = CASE is_recommended "
+        "WHEN 1 THEN 'RECOMMENDED' WHEN 0 THEN 'NOT_RECOMMENDED' ELSE 'NEUTRAL' END;"
+    )
+
+    for name, cols in _INDEXES.items():
+        if not _has_index("books", name):
+            op.create_index(name, "books", cols, unique=False)
+    for name in _IS_RECOMMENDED_INDEXES:
+        if _has_index("books", name):
+            op.drop_index(name, table_name="books")
+
+
+def downgrade() -> None:
+    for name, cols in _IS_RECOMMENDED_INDEXES.items():
+        if not _has_index("books", name):
+            op.create_index(name, "books", cols, unique=False)
+    for name in _INDEXES:
+        if _has_index("books", name):
+            op.drop_index(name, table_name="books")
@@ -0,0 +1,34 @@
+"""add replica_heartbeat table for read-replica lag tracking
+
+Revision ID: b61e4f2d8a95
+Revises: 5a1d7c3e9b20
+Create Date: 2026-10-17 16:41:27.318804
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "b61e4f2d8a95"
+down_revision: Union[str, Sequence[str], None] = "5a1d7c3e9b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if "replica_heartbeat" not in set(insp.get_table_names()):
+        op.create_table(
+            "replica_heartbeat",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("written_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if "replica_heartbeat" in set(insp.get_table_names()):
+        op.drop_table("replica_heartbeat")
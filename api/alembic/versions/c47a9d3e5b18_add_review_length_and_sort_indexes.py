@@ -0,0 +1,56 @@
+"""add books.review_length and feed sort indexes
+
+Revision ID: c47a9d3e5b18
+Revises: 8d2c6a41e9f3
+Create Date: 2026-10-17 11:26:09.771530
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "c47a9d3e5b18"
+down_revision: Union[str, Sequence[str], None] = "8d2c6a41e9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    if not _has_column("books", "review_length"):
+        op.add_column(
+            "books",
+            sa.Column("review_length", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    op.execute("UPDATE books SET review_length = COALESCE(LENGTH(review_text), 0);")
+
+    if not _has_index("books", "idx_books_review_length_id"):
+        op.create_index("idx_books_review_length_id", "books", ["review_length", "id"], unique=False)
+
+    if not _has_index("books", "idx_books_is_recommended_created_id"):
+        op.create_index(
+            "idx_books_is_recommended_created_id",
+            "books",
+            ["is_recommended", "created_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    if _has_index("books", "idx_books_is_recommended_created_id"):
+        op.drop_index("idx_books_is_recommended_created_id", table_name="books")
+    if _has_index("books", "idx_books_review_length_id"):
+        op.drop_index("idx_books_review_length_id", table_name="books")
+    if _has_column("books", "review_length"):
+        op.drop_column("books", "review_length")
@@ -0,0 +1,88 @@
+"""books.review_type NOT NULL with a NEUTRAL server default
+
+Revision ID: c5e2a7f19d36
+Revises: a83e5c1f7d24
+Create Date: 2026-10-17 21:05:12.447210
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "c5e2a7f19d36"
+down_revision: Union[str, Sequence[str], None] = "a83e5c1f7d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# same trigger DDL as api/services/search.py at the time of this revision;
+# the batch rebuild drops the old books table and its triggers with it
+_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, review_text ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+]
+
+
+def _has_table(name: str) -> bool:
+    bind = op.get_bind()
+    return name in set(sa.inspect(bind).get_table_names())
+
+
+def _foreign_keys_off() -> None:
+    # the rebuild drops books; with foreign keys on, that DROP cascades into
+    # likes / comments / timeline_entries. The PRAGMA is a no-op inside an
+    # open transaction, so run this revision on its own if this fails.
+    op.execute("PRAGMA foreign_keys=OFF;")
+    if op.get_bind().exec_driver_sql("PRAGMA foreign_keys").scalar():
+        raise RuntimeError(
+            "foreign keys are still on; run `alembic upgrade a83e5c1f7d24` first, then upgrade again"
+        )
+
+
+def _rebuild_books(nullable: bool, server_default) -> None:
+    # reflection loses genre's NOCASE collation, which the genre filters rely on
+    genre = sa.Column("genre", sa.String(length=50, collation="NOCASE"), nullable=True)
+    with op.batch_alter_table("books", recreate="always", reflect_args=[genre]) as batch_op:
+        batch_op.alter_column(
+            "review_type",
+            existing_type=sa.String(length=20),
+            nullable=nullable,
+            server_default=server_default,
+        )
+    if _has_table("books_fts"):
+        for ddl in _FTS_TRIGGERS:
+            op.execute(ddl)
+    op.execute("PRAGMA foreign_keys=ON;")
+
+
+def upgrade() -> None:
+    _foreign_keys_off()
+    # rows written around the ORM (raw SQL, bulk inserts) since a83e5c1f7d24
+    op.execute(
+        "UPDATE books SET review_type = CASE is_recommended "
+        "WHEN 1 THEN 'RECOMMENDED' WHEN 0 THEN 'NOT_RECOMMENDED' ELSE 'NEUTRAL' END "
+        "WHERE review_type IS NULL;"
+    )
+    _rebuild_books(nullable=False, server_default=sa.text("'NEUTRAL'"))
+
+
+def downgrade() -> None:
+    _foreign_keys_off()
+    _rebuild_books(nullable=True, server_default=None)
@@ -0,0 +1,64 @@
+"""add books_fts full-text index with sync triggers
+
+Revision ID: d3f8a2c61e47
+Revises: b61e4f2d8a95
+Create Date: 2026-10-17 17:20:48.915362
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d3f8a2c61e47"
+down_revision: Union[str, Sequence[str], None] = "b61e4f2d8a95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# same DDL as api/services/search.py at the time of this revision
+_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, review_text,
+        content='books', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, review_text ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    created = "books_fts" not in set(insp.get_table_names())
+
+    for ddl in _DDL:
+        op.execute(ddl)
+    if created:
+        # index the rows that already exist
+        op.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for trigger in ("books_fts_au", "books_fts_ad", "books_fts_ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS books_fts")
@@ -0,0 +1,51 @@
+"""add books.genre and per-sort genre indexes
+
+Revision ID: e72b5d9f0c14
+Revises: d3f8a2c61e47
+Create Date: 2026-10-17 18:05:33.207461
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "e72b5d9f0c14"
+down_revision: Union[str, Sequence[str], None] = "d3f8a2c61e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = {
+    "idx_books_genre_created_id": ["genre", "created_at", "id"],
+    "idx_books_genre_review_length_id": ["genre", "review_length", "id"],
+    "idx_books_genre_is_recommended_created_id": ["genre", "is_recommended", "created_at", "id"],
+}
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    # existing reviews have no genre; they only show up in unfiltered feeds
+    if not _has_column("books", "genre"):
+        op.add_column("books", sa.Column("genre", sa.String(50, collation="NOCASE"), nullable=True))
+
+    for name, cols in _INDEXES.items():
+        if not _has_index("books", name):
+            op.create_index(name, "books", cols, unique=False)
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        if _has_index("books", name):
+            op.drop_index(name, table_name="books")
+    if _has_column("books", "genre"):
+        op.drop_column("books", "genre")
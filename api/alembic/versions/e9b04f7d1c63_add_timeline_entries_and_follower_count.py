@@ -0,0 +1,84 @@
+"""add timeline_entries, users.follower_count and per-owner book index
+
+Revision ID: e9b04f7d1c63
+Revises: c47a9d3e5b18
+Create Date: 2026-10-17 12:48:30.052917
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "e9b04f7d1c63"
+down_revision: Union[str, Sequence[str], None] = "c47a9d3e5b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(c["name"] == col for c in insp.get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if not _has_column("users", "follower_count"):
+        op.add_column(
+            "users",
+            sa.Column("follower_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+    op.execute(
+        "UPDATE users SET follower_count = "
+        "(SELECT COUNT(*) FROM follows WHERE follows.followee_id = users.id);"
+    )
+
+    if not _has_index("books", "idx_books_owner_created_id"):
+        op.create_index("idx_books_owner_created_id", "books", ["owner_id", "created_at", "id"], unique=False)
+
+    if "timeline_entries" not in set(insp.get_table_names()):
+        op.create_table(
+            "timeline_entries",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("review_id", sa.Integer(), nullable=False),
+            sa.Column("author_id", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["review_id"], ["books.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id", "review_id"),
+        )
+        op.create_index("idx_timeline_user_created", "timeline_entries", ["user_id", "created_at", "review_id"], unique=False)
+        op.create_index("idx_timeline_user_author", "timeline_entries", ["user_id", "author_id"], unique=False)
+
+        # backfill existing follows with each followee's recent reviews
+        op.execute("""
+            INSERT OR IGNORE INTO timeline_entries (user_id, review_id, author_id, created_at)
+            SELECT f.follower_id, b.id, b.owner_id, b.created_at
+            FROM follows f
+            JOIN books b ON b.owner_id = f.followee_id
+            WHERE b.created_at IS NOT NULL;
+        """)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    if "timeline_entries" in set(insp.get_table_names()):
+        op.drop_index("idx_timeline_user_author", table_name="timeline_entries")
+        op.drop_index("idx_timeline_user_created", table_name="timeline_entries")
+        op.drop_table("timeline_entries")
+
+    if _has_index("books", "idx_books_owner_created_id"):
+        op.drop_index("idx_books_owner_created_id", table_name="books")
+
+    if _has_column("users", "follower_count"):
+        op.drop_column("users", "follower_count")
@@ -0,0 +1,54 @@
+"""index the feed sort keys and per-review lookups; drop the unused review_date index
+
+Revision ID: f4a9c2e83b61
+Revises: e72b5d9f0c14
+Create Date: 2026-10-17 18:48:12.550917
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "f4a9c2e83b61"
+down_revision: Union[str, Sequence[str], None] = "e72b5d9f0c14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, name, columns); the likes / follows ones already exist on databases
+# migrated through daeede6634d4 but not on ones created by create_all
+_INDEXES = [
+    ("books", "idx_books_created_id", ["created_at", "id"]),
+    ("books", "idx_books_is_recommended_review_length_id", ["is_recommended", "review_length", "id"]),
+    ("likes", "idx_likes_review", ["review_id"]),
+    ("follows", "idx_follows_follower", ["follower_id"]),
+    ("follows", "idx_follows_followee", ["followee_id"]),
+    ("timeline_entries", "idx_timeline_review", ["review_id"]),
+]
+
+
+def _has_index(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return any(ix["name"] == name for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    for table, name, cols in _INDEXES:
+        if not _has_index(table, name):
+            op.create_index(name, table, cols, unique=False)
+
+    # no query orders or filters by review_date; it only cost writes
+    if _has_index("books", "idx_books_review_date_id"):
+        op.drop_index("idx_books_review_date_id", table_name="books")
+
+
+def downgrade() -> None:
+    if not _has_index("books", "idx_books_review_date_id"):
+        op.create_index("idx_books_review_date_id", "books", ["review_date", "id"], unique=False)
+
+    for table, name, _ in _INDEXES:
+        if table in ("likes", "follows"):
+            # owned by daeede6634d4
+            continue
+        if _has_index(table, name):
+            op.drop_index(name, table_name=table)
@@ -1,15 +1,9 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from passlib.context import CryptContext
 
 from .database import Base
-
-# set up password hashing context
-pwd_context = CryptContext(
-    schemes=["bcrypt_sha256", "bcrypt"],
-    deprecated="auto",
-)
+from .services.passwords import password_hasher, pwd_context
 
 class User(Base):
     __tablename__ = 'users'
@@ -17,23 +11,25 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     username = Column(String(80), unique=True, nullable=False, index=True)
     password_hash = Column(String(128), nullable=False)
+    # maintained by services.timeline; decides fan-out-on-write vs merge-on-read
+    follower_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # link to Book table (one user has many books)
     books = relationship("Book", back_populates="owner")
 
     # User Model Methods
+    # both run in the password_hasher pool and may raise PasswordHasherBusy
     def set_password(self, password):
-        self.password_hash = pwd_context.hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        try:
-            return pwd_context.verify(password, self.password_hash)
-        except ValueError:
-            return False
+        return password_hasher.verify(password, self.password_hash)
     
 class TokenBlocklist(Base):
     __tablename__ = 'token_blocklist'
 
     id = Column(Integer, primary_key=True)
     jti = Column(String(36), nullable=False, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # when the revoked token would have expired anyway; prunable after that
+    expires_at = Column(DateTime, nullable=True, index=True)
\ No newline at end of file
@@ -4,8 +4,10 @@ from datetime import timedelta
 
 from . import auth_schemas, jwt_utils
 from .database import get_db
-from .auth_models import User, pwd_context, TokenBlocklist
+from .auth_models import User, pwd_context
 from .config import settings
+from .services.passwords import PasswordHasherBusy
+from .services.revocation import expiry_from_claims, revocation_list
 
 # init FastAPI router
 auth_router = APIRouter(
@@ -17,8 +19,16 @@ auth_router = APIRouter(
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
 
-def is_token_in_blocklist(db: Session, jti: str):
-    return db.query(TokenBlocklist).filter(TokenBlocklist.jti == jti).first() is not None
+def is_token_in_blocklist(jti: str):
+    # in-memory view of token_blocklist, kept in sync by services.revocation
+    return revocation_list.is_revoked(jti)
+
+def hasher_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts right now, try again shortly",
+        headers={"Retry-After": "1"},
+    )
 
 # route fncts
 
@@ -30,7 +40,10 @@ def register_user(user_in: auth_schemas.UserCreate, db: Session = Depends(get_db
     
     # 2. hash password and create new user
     new_user = User(username=user_in.username)
-    new_user.set_password(user_in.password)
+    try:
+        new_user.set_password(user_in.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
 
     # 3. save to db
     db.add(new_user)
@@ -44,7 +57,11 @@ def login_for_access_token(user_in: auth_schemas.LoginRequest, db: Session = Dep
     user = get_user_by_username(db, user_in.username)
 
     # 1. check user existence & passw
-    if not user or not user.check_password(user_in.password):
+    try:
+        password_ok = user is not None and user.check_password(user_in.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -54,9 +71,10 @@ def login_for_access_token(user_in: auth_schemas.LoginRequest, db: Session = Dep
     # 2. create jwt token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    # store user ID as the subject ("sub") for the token identity
+    # store user ID as the subject ("sub") for the token identity; the username
+    # lets routes that only need id/username skip the user lookup
     access_token = jwt_utils.create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user.id), "username": user.username}, expires_delta=access_token_expires
     )
 
     return {
@@ -65,8 +83,17 @@ def login_for_access_token(user_in: auth_schemas.LoginRequest, db: Session = Dep
         "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 # convert minutes to seconds for client
     }
 
+@auth_router.post("/logout")
+def logout(claims: dict = Depends(jwt_utils.get_current_claims), db: Session = Depends(get_db)):
+    # revoke this token; it stays blocklisted until it would have expired anyway
+    jti = claims.get("jti")
+    if not jti:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token cannot be revoked")
+    revocation_list.revoke(db, jti, expiry_from_claims(claims))
+    return {"ok": True}
+
 # protected route ex
 @auth_router.get("/profile", response_model=auth_schemas.UserResponse)
-def read_profile(current_user: User = Depends(jwt_utils.get_current_user)):
+def read_profile(current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user)):
     # the get_current_user dependency automatically checks the token & fetches the user obj
     return current_user
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -9,6 +11,92 @@ class Settings(BaseSettings):
     TURSO_DATABASE_URL: str | None = None
     TURSO_AUTH_TOKEN: str | None = None
 
+    # optional read replica for public GET routes (libsql embedded replica,
+    # local SQLite copy, ...). Reads fall back to the primary while the replica
+    # lags more than READ_REPLICA_MAX_LAG_SECONDS, and for READ_YOUR_WRITES_SECONDS
+    # after a user's own write. READ_REPLICA_SYNC_SECONDS > 0 copies a SQLite
+    # primary into a SQLite replica file on that interval (local / testing).
+    # Anonymous feed pages can sit in the feed cache, so the worst case there
+    # is max lag + FEED_CACHE_TTL_SECONDS.
+    READ_DATABASE_URL: str | None = None
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    READ_REPLICA_HEARTBEAT_SECONDS: float = 1.0
+    READ_REPLICA_SYNC_SECONDS: float = 0.0
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    # cover enrichment (Open Library)
+    OPENLIBRARY_SEARCH_URL: str = "https://openlibrary.org/search.json"
+    OPENLIBRARY_COVERS_URL: str = "https://covers.openlibrary.org/b/id"
+    COVER_LOOKUP_TIMEOUT_SECONDS: float = 5.0
+    COVER_MAX_CONCURRENCY: int = 4
+    COVER_RATE_PER_SECOND: float = 5.0
+    COVER_BREAKER_FAILURES: int = 5
+    COVER_BREAKER_RESET_SECONDS: float = 30.0
+    COVER_WORKERS: int = 4
+    COVER_MAX_ATTEMPTS: int = 3
+    COVER_RETRY_BACKOFF_SECONDS: float = 1.0
+    COVER_CACHE_MAX_ENTRIES: int = 5000
+    COVER_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    COVER_CACHE_NEGATIVE_TTL_SECONDS: int = 24 * 3600
+
+    # connection pool (both engines). DB_POOL_PRE_PING: "always" pings on every
+    # checkout, "idle" only after DB_POOL_PING_IDLE_SECONDS unused, "never" skips it
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PING_IDLE_SECONDS: float = 30.0
+
+    # PRAGMA profile for local SQLite files (see api/utils/sqlite.py); Turso ignores it.
+    # "defaults" leaves SQLite as-is, "durable" = WAL + synchronous=FULL,
+    # "fast" = WAL + synchronous=NORMAL + bigger cache / mmap
+    SQLITE_PROFILE: Literal["defaults", "durable", "fast"] = "fast"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # async stack for the hot routes (see api/routers/aio.py); without a URL
+    # it is aiosqlite on the local file, and Turso needs an async libsql URL
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # anonymous feed page cache (per worker process)
+    FEED_CACHE_ENABLED: bool = True
+    FEED_CACHE_TTL_SECONDS: float = 30.0
+    FEED_CACHE_MAX_ENTRIES: int = 512
+
+    # /feed/search ranks at most this many of the newest matches by bm25
+    # (0 = all); keeps near-universal terms from scoring the whole index
+    SEARCH_MAX_RANKED_MATCHES: int = 10000
+
+    # write-behind for like_count / comment_count (off = update in the same transaction)
+    COUNTER_WRITE_BEHIND: bool = False
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # following timeline: authors above this follower count are merged on read
+    TIMELINE_FANOUT_MAX_FOLLOWERS: int = 1000
+    TIMELINE_BACKFILL_ON_FOLLOW: int = 50
+
+    # verified token claims / user records cached by the auth dependencies
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt runs in a process pool; 0 workers = hash inline. Running + queued
+    # hashes each hold a request thread, so workers + queue stays small (and is
+    # capped at passwords.MAX_HASH_THREADS); with no free slot a login gets 503
+    # at once unless PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS > 0
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 4
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 0.0
+
+    # /metrics is served only with "Authorization: Bearer <METRICS_TOKEN>";
+    # unset = the endpoint answers 404
+    METRICS_TOKEN: str | None = None
+
+    # revoked-token filter: other workers' logouts are picked up every sync
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_SYNC_SECONDS: float = 5.0
+    REVOCATION_PRUNE_SECONDS: float = 3600.0
+
     model_config = SettingsConfigDict(
         env_file=".env.backend",
         env_file_encoding="utf-8",
@@ -2,6 +2,16 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from api.config import settings
+from api.utils.metrics import get_stats
+from api.utils.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    InstrumentedReadQueuePool,
+    install_liveness_check,
+)
+from api.utils.sqlite import install_sqlite_profile
+
 def _normalize_libsql_url(url: str | None) -> str | None:
     """Accept libsql:// or sqlite+libsql:// and normalize to sqlite+libsql://"""
     if not url:
@@ -15,27 +25,99 @@ def _normalize_libsql_url(url: str | None) -> str | None:
 TURSO_URL = _normalize_libsql_url(os.getenv("TURSO_DATABASE_URL"))
 TURSO_TOKEN = os.getenv("TURSO_AUTH_TOKEN")
 
+def _pool_options(poolclass) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+def _ping_idle_seconds() -> float | None:
+    return settings.DB_POOL_PING_IDLE_SECONDS if settings.DB_POOL_PRE_PING == "idle" else None
+
 if TURSO_URL and TURSO_TOKEN:
     # turso (remote)
     engine = create_engine(
         TURSO_URL,
         connect_args={"auth_token": TURSO_TOKEN},
-        pool_pre_ping=True,
+        **_pool_options(InstrumentedQueuePool),
     )
 else:
     # fall back to sqlite otherwise (hopefully doesn't get here)
     engine = create_engine(
         "sqlite:///../db.sqlite",
         connect_args={"check_same_thread": False},
-        pool_pre_ping=True,
+        **_pool_options(InstrumentedQueuePool),
     )
+install_liveness_check(engine, _ping_idle_seconds(), get_stats("db_pool"))
+install_sqlite_profile(engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+# read engine for public GETs (see api/services/replica.py for routing); the primary
+# doubles as the read engine when READ_DATABASE_URL isn't set
+READ_DATABASE_URL = _normalize_libsql_url(settings.READ_DATABASE_URL)
+
+if READ_DATABASE_URL:
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        connect_args=(
+            {"check_same_thread": False} if READ_DATABASE_URL.startswith("sqlite:") else {"auth_token": TURSO_TOKEN}
+        ),
+        **_pool_options(InstrumentedReadQueuePool),
+    )
+    install_liveness_check(read_engine, _ping_idle_seconds(), get_stats("db_pool_read"))
+    install_sqlite_profile(read_engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# optional async stack (ASYNC_DB=1): the hot feed / like / comment / book routes
+# run as `async def` on an AsyncSession, so a request waiting on Turso doesn't
+# hold a threadpool thread. Needs an async driver: aiosqlite locally, or an
+# async libsql URL in ASYNC_DATABASE_URL for Turso.
+ASYNC_DB = settings.ASYNC_DB
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or (
+    None if TURSO_URL and TURSO_TOKEN else "sqlite+aiosqlite:///../db.sqlite"
+)
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    """Created on first use so the async driver is only needed when ASYNC_DB is on."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        if not ASYNC_DATABASE_URL:
+            raise RuntimeError("ASYNC_DB is set but there is no ASYNC_DATABASE_URL for this database")
+        connect_args = {"auth_token": TURSO_TOKEN} if TURSO_URL and TURSO_TOKEN else {}
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args=connect_args,
+            **_pool_options(InstrumentedAsyncQueuePool),
+        )
+        install_liveness_check(_async_engine.sync_engine, _ping_idle_seconds(), get_stats("db_pool_async"))
+        install_sqlite_profile(_async_engine.sync_engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+        # expire_on_commit=False: attributes can't lazy-load outside the session's greenlet
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
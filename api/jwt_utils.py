@@ -1,13 +1,18 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .auth_models import User
+from .services.auth_cache import AuthUser, auth_cache
+from .services.revocation import revocation_list
 from .config import settings
-from .database import get_db
+from .database import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
@@ -22,7 +27,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         else datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
-    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
+    # jti identifies the token for logout / revocation
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc), "jti": uuid4().hex})
 
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
 
@@ -34,19 +40,48 @@ def decode_access_token(token: str) -> dict | None:
         return None
 
 
+def _load_auth_user(db: Session, user_id: int) -> AuthUser | None:
+    row = db.execute(select(User.id, User.username).where(User.id == user_id)).first()
+    return AuthUser(id=row.id, username=row.username) if row else None
+
+
+def _claims_user_id(payload: dict | None) -> int | None:
+    try:
+        return int(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def get_current_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified, unrevoked claims of the bearer token (no user lookup)."""
+    payload = auth_cache.claims(token, decode_access_token)
+    if payload is None or revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials or token expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
-    payload = decode_access_token(token)
-    if payload is None:
+) -> AuthUser:
+    """
+    Resolves the bearer token to an AuthUser (id + username). Claims and
+    user records come from auth_cache; the DB is only hit on a cold user,
+    and a deleted account stops resolving once its entry is dropped.
+    """
+    payload = auth_cache.claims(token, decode_access_token)
+    if payload is None or revocation_list.is_revoked(payload.get("jti")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials or token expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
+    user_id = _claims_user_id(payload)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,7 +89,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = auth_cache.user(user_id, lambda uid: _load_auth_user(db, uid))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,16 +103,73 @@ def get_current_user(
 def get_current_user_optional(
     token: str | None = Depends(oauth2_scheme_optional),
     db: Session = Depends(get_db),
-) -> User | None:
+) -> AuthUser | None:
+    """
+    Best-effort identity for public reads (liked_by_me and the like).
+    Tokens that carry a username claim are trusted as-is, without a DB
+    lookup; older tokens fall back to the cached lookup.
+    """
     if not token:
         return None
 
-    payload = decode_access_token(token)
-    if payload is None:
+    payload = auth_cache.claims(token, decode_access_token)
+    user_id = _claims_user_id(payload)
+    if user_id is None or revocation_list.is_revoked(payload.get("jti")):
         return None
 
-    user_id = payload.get("sub")
+    username = payload.get("username")
+    if username:
+        auth_cache.token_only()
+        return AuthUser(id=user_id, username=username)
+
+    return auth_cache.user(user_id, lambda uid: _load_auth_user(db, uid))
+
+
+# async variants for the ASYNC_DB routes: same caches, lookup on an AsyncSession
+
+async def _load_auth_user_async(db: AsyncSession, user_id: int) -> AuthUser | None:
+    row = (await db.execute(select(User.id, User.username).where(User.id == user_id))).first()
+    return AuthUser(id=row.id, username=row.username) if row else None
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthUser:
+    payload = get_current_claims(token)
+    user_id = _claims_user_id(payload)
     if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = await auth_cache.user_async(user_id, lambda uid: _load_auth_user_async(db, uid))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_user_optional_async(
+    token: str | None = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthUser | None:
+    if not token:
         return None
 
-    return db.query(User).filter(User.id == int(user_id)).first()
+    payload = auth_cache.claims(token, decode_access_token)
+    user_id = _claims_user_id(payload)
+    if user_id is None or revocation_list.is_revoked(payload.get("jti")):
+        return None
+
+    username = payload.get("username")
+    if username:
+        auth_cache.token_only()
+        return AuthUser(id=user_id, username=username)
+
+    return await auth_cache.user_async(user_id, lambda uid: _load_auth_user_async(db, uid))
@@ -1,18 +1,23 @@
-from datetime import datetime
 from typing import List
 
-import requests
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from api import models, auth_routes, jwt_utils, schemas
 from api.auth_models import User
-from api.database import engine, get_db, Base
-from api.routers import health, feed
-from api.utils.time import iso_utc
+from api.database import ASYNC_DB, engine, get_db, Base
+from api.routers import health, feed, follows
+from api.services import books
+from api.services.covers import cover_enricher
+from api.services.cover_cache import cover_cache
+from api.services.cover_client import cover_client
+from api.services.counters import counter_buffer
+from api.services.passwords import password_hasher
+from api.services.replica import replica_router, token_user_id
+from api.services.revocation import revocation_list
+from api.services.search import ensure_search_index
+from api.utils.responses import UTCJSONResponse
 from .routers import comments
 import api.database as db_mod
 
@@ -22,32 +27,7 @@ print("ENGINE DIALECT:", engine.dialect.name)
 print("ENGINE URL:", str(engine.url))
 
 
-def fetch_book_cover(title: str, author: str) -> str | None:
-    search_url = "https://openlibrary.org/search.json"
-    query = f"title: ({title}) AND author:({author})" if author else f"title:({title})"
-
-    try:
-        response = requests.get(search_url, params={"q": query, "limit": 1}, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("numFound", 0) > 0 and data.get("docs"):
-            first_doc = data["docs"][0]
-            cover_id = first_doc.get("cover_i")
-            if cover_id:
-                return f"https://covers.openlibrary.org/b/id/{cover_id}-M.jpg"
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching cover from Open Library: {e}")
-        return None
-
-    return None
-
-
-def json_utc(payload):
-    return JSONResponse(content=jsonable_encoder(payload, custom_encoder={datetime: iso_utc}))
-
-
-app = FastAPI()
+app = FastAPI(default_response_class=UTCJSONResponse)
 
 origins = [
     "http://localhost:5173",
@@ -70,12 +50,94 @@ app.add_middleware(
 @app.on_event("startup")
 def _create_tables():
     Base.metadata.create_all(bind=engine)
+    # FTS5 table + triggers aren't ORM models
+    ensure_search_index(engine)
+
+
+@app.on_event("startup")
+def _start_cover_enricher():
+    cover_cache.prune_expired()
+    cover_enricher.start()
+    cover_enricher.enqueue_pending()
+
+
+@app.on_event("shutdown")
+def _stop_cover_enricher():
+    cover_enricher.shutdown(wait=False)
+    cover_client.close()
+
+
+@app.on_event("startup")
+def _start_counter_flush():
+    counter_buffer.start()
+
+
+@app.on_event("shutdown")
+def _stop_counter_flush():
+    # final flush so buffered like/comment deltas aren't lost
+    counter_buffer.stop()
+
+
+@app.on_event("startup")
+def _start_password_hasher():
+    # spawn the workers now rather than on the first login
+    password_hasher.start()
+
+
+@app.on_event("shutdown")
+def _stop_password_hasher():
+    password_hasher.shutdown(wait=False)
 
 
+@app.on_event("startup")
+def _start_revocation_sync():
+    revocation_list.load()
+    revocation_list.start()
+
+
+@app.on_event("shutdown")
+def _stop_revocation_sync():
+    revocation_list.stop()
+
+
+@app.on_event("startup")
+def _start_replica_heartbeat():
+    replica_router.start()
+
+
+@app.on_event("shutdown")
+def _stop_replica_heartbeat():
+    replica_router.stop()
+
+
+if replica_router.enabled:
+
+    @app.middleware("http")
+    async def _read_your_writes(request: Request, call_next):
+        # a user's successful write pins their reads to the primary until the
+        # replica catches up (see services.replica)
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            scheme, _, token = request.headers.get("authorization", "").partition(" ")
+            user_id = token_user_id(token) if scheme.lower() == "bearer" else None
+            if user_id is not None:
+                replica_router.note_write(user_id)
+        return response
+
+
+if ASYNC_DB:
+    # ahead of the sync routers so the async handlers win on shared paths
+    from api.routers import aio
+
+    app.include_router(aio.feed_router)
+    app.include_router(aio.comments_router)
+    app.include_router(aio.books_router)
+
 app.include_router(auth_routes.auth_router)
 app.include_router(health.router)
 app.include_router(feed.router)
 app.include_router(comments.router)
+app.include_router(follows.router)
 
 
 @app.get("/ping-db")
@@ -93,102 +155,53 @@ def read_root():
 @app.post("/books/", response_model=schemas.Book)
 def create_book(
     book: schemas.BookCreate,
-    current_user: User = Depends(jwt_utils.get_current_user),
+    current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user),
     db: Session = Depends(get_db),
 ):
-    cover_url = fetch_book_cover(book.title, book.author or "")
-
-    db_book = models.Book(
-        title=book.title,
-        author=book.author,
-        cover_image_url=cover_url,
-        review_text=book.review_text,
-        is_recommended=book.is_recommended,
-        owner_id=current_user.id,
-    )
-    db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
-    return json_utc(db_book)
+    return UTCJSONResponse(books.create_book(db, current_user.id, book.model_dump()))
 
 
 @app.get("/books/", response_model=List[schemas.Book])
 def read_books(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(jwt_utils.get_current_user),
+    current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user),
     db: Session = Depends(get_db),
 ):
-    books = (
-        db.query(models.Book)
-        .filter(models.Book.owner_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return json_utc(books)
+    return UTCJSONResponse(books.list_books(db, current_user.id, skip=skip, limit=limit))
 
 
 @app.get("/books/{book_id}", response_model=schemas.Book)
 def read_book(
     book_id: int,
-    current_user: User = Depends(jwt_utils.get_current_user),
+    current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user),
     db: Session = Depends(get_db),
 ):
-    book = (
-        db.query(models.Book)
-        .filter(models.Book.id == book_id, models.Book.owner_id == current_user.id)
-        .first()
-    )
+    book = books.get_book(db, book_id, current_user.id)
     if book is None:
         raise HTTPException(status_code=404, detail="Book not found")
-    return json_utc(book)
+    return UTCJSONResponse(book)
 
 
 @app.put("/books/{book_id}", response_model=schemas.Book)
 def update_book(
     book_id: int,
     book_update: schemas.BookUpdate,
-    current_user: User = Depends(jwt_utils.get_current_user),
+    current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user),
     db: Session = Depends(get_db),
 ):
-    db_book = (
-        db.query(models.Book)
-        .filter(models.Book.id == book_id, models.Book.owner_id == current_user.id)
-        .first()
-    )
-    if db_book is None:
+    book = books.update_book(db, book_id, current_user.id, book_update.model_dump(exclude_unset=True))
+    if book is None:
         raise HTTPException(status_code=404, detail="Book not found")
-
-    update_data = book_update.model_dump(exclude_unset=True)
-
-    if "title" in update_data or "author" in update_data:
-        new_title = update_data.get("title", db_book.title)
-        new_author = update_data.get("author", db_book.author or "")
-        db_book.cover_image_url = fetch_book_cover(new_title, new_author)
-
-    for key, value in update_data.items():
-        setattr(db_book, key, value)
-
-    db.commit()
-    db.refresh(db_book)
-    return json_utc(db_book)
+    return UTCJSONResponse(book)
 
 
 @app.delete("/books/{book_id}", status_code=204)
 def delete_book(
     book_id: int,
-    current_user: User = Depends(jwt_utils.get_current_user),
+    current_user: jwt_utils.AuthUser = Depends(jwt_utils.get_current_user),
     db: Session = Depends(get_db),
 ):
-    book = (
-        db.query(models.Book)
-        .filter(models.Book.id == book_id, models.Book.owner_id == current_user.id)
-        .first()
-    )
-    if book is None:
+    if not books.delete_book(db, book_id, current_user.id):
         raise HTTPException(status_code=404, detail="Book not found")
-
-    db.delete(book)
-    db.commit()
-    return {}
\ No newline at end of file
+    return {}
@@ -1,20 +1,49 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Date, text # foreignkey for auth
-from sqlalchemy.orm import relationship # for auth
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Date, Index, text # foreignkey for auth
+from sqlalchemy.orm import relationship, validates # for auth
 from api.database import Base
 from datetime import datetime
 
+# review_type -> is_recommended
+REVIEW_TYPES = {"RECOMMENDED": True, "NOT_RECOMMENDED": False, "NEUTRAL": None}
+
+
+def review_type_for(is_recommended):
+    if is_recommended is None:
+        return "NEUTRAL"
+    return "RECOMMENDED" if is_recommended else "NOT_RECOMMENDED"
+
+
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # keyset pagination for the newest / oldest, review_length and review_type feed sorts
+        Index("idx_books_created_id", "created_at", "id"),
+        Index("idx_books_review_length_id", "review_length", "id"),
+        Index("idx_books_review_type_created_id", "review_type", "created_at", "id"),
+        Index("idx_books_review_type_review_length_id", "review_type", "review_length", "id"),
+        # per-author reads for the following timeline
+        Index("idx_books_owner_created_id", "owner_id", "created_at", "id"),
+        # ?genre= on each feed sort: the equality prefix leaves the sort order intact
+        Index("idx_books_genre_created_id", "genre", "created_at", "id"),
+        Index("idx_books_genre_review_length_id", "genre", "review_length", "id"),
+        Index("idx_books_genre_review_type_created_id", "genre", "review_type", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # core book data
     title = Column(String(255), nullable=False)
     author = Column(String(255))
+    # NOCASE: ?genre=fantasy matches "Fantasy" and still uses the genre indexes
+    genre = Column(String(50, collation="NOCASE"), nullable=True)
     cover_image_url = Column(String(512))
+    # pending -> found / missing / failed, filled in by services.covers
+    cover_status = Column(String(20), nullable=True)
 
     # flip side of card
     review_text = Column(Text)
+    # stored so the review_length sort can walk an index instead of length(review_text)
+    review_length = Column(Integer, nullable=False, default=0, server_default="0")
     is_recommended = Column(Boolean)
 
 
@@ -22,7 +51,10 @@ class Book(Base):
     read_on = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    review_type = Column(String(20), nullable=True)
+    # RECOMMENDED / NOT_RECOMMENDED / NEUTRAL; what the feed filters and sorts on.
+    # Kept in step with is_recommended (the API field) by _sync_review_type;
+    # rows inserted around the ORM get NEUTRAL from the server default.
+    review_type = Column(String(20), nullable=False, default="NEUTRAL", server_default="NEUTRAL")
     review_date = Column(Date, nullable=True)
     started_date = Column(Date, nullable=True)
     finished_date = Column(Date, nullable=True)
@@ -33,22 +65,92 @@ class Book(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="books")
 
+    @validates("review_text")
+    def _sync_review_length(self, key, value):
+        self.review_length = len(value) if value else 0
+        return value
+
+    @validates("is_recommended", "review_type")
+    def _sync_review_type(self, key, value):
+        if key == "review_type":
+            if value not in REVIEW_TYPES:
+                raise ValueError(f"unknown review_type {value!r}")
+            other, other_value = "is_recommended", REVIEW_TYPES[value]
+        else:
+            other, other_value = "review_type", review_type_for(value)
+        # setting the other column re-enters this validator; stop after one hop
+        if "_syncing_review_type" not in self.__dict__:
+            self._syncing_review_type = True
+            try:
+                setattr(self, other, other_value)
+            finally:
+                # not left behind, or it shows up in vars(book) responses
+                del self._syncing_review_type
+        return value
+
+    @validates("genre")
+    def _normalize_genre(self, key, value):
+        value = value.strip() if value else None
+        return value or None
+
 class Follow(Base):
     __tablename__ = "follows"
+    __table_args__ = (
+        Index("idx_follows_follower", "follower_id"),
+        # fan-out on write: a new review's author -> followers
+        Index("idx_follows_followee", "followee_id"),
+    )
     follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     followee_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     created_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
 
+class TimelineEntry(Base):
+    """Fan-out-on-write copy of a followed author's review in a follower's home timeline."""
+    __tablename__ = "timeline_entries"
+    __table_args__ = (
+        Index("idx_timeline_user_created", "user_id", "created_at", "review_id"),
+        Index("idx_timeline_user_author", "user_id", "author_id"),
+        # remove_review / ON DELETE CASCADE from books
+        Index("idx_timeline_review", "review_id"),
+    )
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    review_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # copy of books.created_at so the timeline pages without touching books
+    created_at = Column(DateTime, nullable=False)
+
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        # per-review counts and ON DELETE CASCADE from books; the PK leads with user_id
+        Index("idx_likes_review", "review_id"),
+    )
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     review_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True)
     created_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # keyset pages of a review's thread; the rowid tail breaks created_at ties
+        Index("idx_comments_review_created", "review_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     review_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     body = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+
+class CoverCacheEntry(Base):
+    __tablename__ = "cover_cache"
+    # sha1 of the normalized "title|author" pair
+    lookup_key = Column(String(40), primary_key=True)
+    # NULL = negative entry ("no cover found")
+    cover_url = Column(String(512), nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class ReplicaHeartbeat(Base):
+    """Single row rewritten on the primary every few seconds; its age on the read replica is the replica's lag."""
+    __tablename__ = "replica_heartbeat"
+    id = Column(Integer, primary_key=True)
+    written_at = Column(DateTime, nullable=False)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import schemas
+from ..database import get_async_db
+from ..jwt_utils import AuthUser, get_current_user_async, get_current_user_optional_async
+from ..services import aio
+from ..services.feed import MAX_ENGAGEMENT_IDS
+from ..utils.responses import UTCJSONResponse
+
+# `async def` versions of the hot feed / like / comment / book routes, used
+# when ASYNC_DB is on. main.py includes these routers ahead of the sync ones,
+# so they take over the paths they declare; everything else (following
+# timeline, liked status, follows, auth) keeps its sync handler.
+#
+# Ids use the :int path convertor so non-numeric segments like
+# /feed/following fall through to the sync router instead of failing here.
+
+feed_router = APIRouter(prefix="/feed", tags=["feed"])
+comments_router = APIRouter(prefix="/comments", tags=["comments"])
+books_router = APIRouter(prefix="/books", tags=["books"])
+
+
+class CommentCreate(BaseModel):
+    body: str
+
+
+@feed_router.get("")
+async def public_feed(
+    sort: str = Query("newest", pattern="^(newest|oldest|review_length|review_type)$"),
+    genre: str | None = None,
+    review_type: str | None = Query(None, pattern="^(RECOMMENDED|NOT_RECOMMENDED|NEUTRAL)$"),
+    limit: int = Query(20, ge=1, le=50),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser | None = Depends(get_current_user_optional_async),
+):
+    try:
+        page = await aio.get_public_feed(
+            db,
+            sort=sort,
+            genre=genre,
+            review_type=review_type,
+            limit=limit,
+            after=after,
+            user_id=(user.id if user else None),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
+
+
+@feed_router.get("/engagement")
+async def engagement(
+    ids: str = Query(..., description="Comma-separated review ids"),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser | None = Depends(get_current_user_optional_async),
+):
+    try:
+        id_list = [int(part) for part in ids.split(",") if part.strip()]
+        items = await aio.get_engagement(db, id_list, user_id=(user.id if user else None))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ids must be up to {MAX_ENGAGEMENT_IDS} comma-separated integers",
+        )
+    return UTCJSONResponse({"items": items})
+
+
+@feed_router.get("/{book_id:int}")
+async def public_feed_item(
+    book_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser | None = Depends(get_current_user_optional_async),
+):
+    item = await aio.get_public_feed_item(db, book_id=book_id, user_id=(user.id if user else None))
+    if not item:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return UTCJSONResponse(item)
+
+
+@feed_router.post("/{book_id:int}/like")
+async def like_post(
+    book_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    try:
+        like_count = await aio.add_like(db, book_id=book_id, user_id=user.id)
+        return {"book_id": book_id, "liked": True, "like_count": like_count}
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+
+@feed_router.delete("/{book_id:int}/like")
+async def unlike_post(
+    book_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    try:
+        like_count = await aio.remove_like(db, book_id=book_id, user_id=user.id)
+        return {"book_id": book_id, "liked": False, "like_count": like_count}
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+
+@feed_router.get("/{book_id:int}/comments")
+async def get_comments(
+    book_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    after: str | None = None,
+    before: str | None = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        page = await aio.list_comments(db, book_id, limit=limit, after=after, before=before, order=order)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse({"book_id": book_id, **page})
+
+
+@feed_router.post("/{book_id:int}/comments")
+async def post_comment(
+    book_id: int,
+    payload: dict,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    body = (payload or {}).get("body")
+    try:
+        c = await aio.add_comment(db, book_id, user, body)
+        return {"book_id": book_id, "comment": c}
+    except ValueError as e:
+        msg = str(e)
+        if msg == "book_not_commentable":
+            raise HTTPException(status_code=404, detail="Post not found")
+        if msg == "empty_body":
+            raise HTTPException(status_code=400, detail="Comment cannot be empty")
+        if msg == "too_long":
+            raise HTTPException(status_code=400, detail="Comment is too long")
+        raise HTTPException(status_code=400, detail="Bad request")
+
+
+@feed_router.delete("/comments/{comment_id:int}")
+async def delete_comment_route(
+    comment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    try:
+        ok = await aio.delete_comment(db, comment_id, user.id)
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if not ok:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return {"ok": True}
+
+
+@comments_router.get("/{book_id:int}")
+async def public_comments(
+    book_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    after: str | None = None,
+    before: str | None = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        page = await aio.list_comments(db, book_id, limit=limit, after=after, before=before, order=order)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
+
+
+@comments_router.post("/{book_id:int}")
+async def create_comment(
+    book_id: int,
+    payload: CommentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    try:
+        return await aio.add_comment(db, book_id, user, payload.body)
+    except ValueError as e:
+        if str(e) == "book_not_commentable":
+            raise HTTPException(status_code=404, detail="Book not found or not public")
+        if str(e) == "empty_body":
+            raise HTTPException(status_code=400, detail="Comment body cannot be empty")
+        if str(e) == "too_long":
+            raise HTTPException(status_code=400, detail="Comment too long")
+        raise HTTPException(status_code=400, detail="Invalid comment")
+
+
+@comments_router.delete("/{comment_id:int}")
+async def remove_comment(
+    comment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user_async),
+):
+    try:
+        ok = await aio.delete_comment(db, comment_id, user.id)
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Not allowed to delete this comment")
+    if not ok:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return {"ok": True}
+
+
+@books_router.post("/", response_model=schemas.Book)
+async def create_book(
+    book: schemas.BookCreate,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return UTCJSONResponse(await aio.create_book(db, current_user.id, book.model_dump()))
+
+
+@books_router.get("/", response_model=List[schemas.Book])
+async def read_books(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return UTCJSONResponse(await aio.list_books(db, current_user.id, skip=skip, limit=limit))
+
+
+@books_router.get("/{book_id:int}", response_model=schemas.Book)
+async def read_book(
+    book_id: int,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    book = await aio.get_book(db, book_id, current_user.id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return UTCJSONResponse(book)
+
+
+@books_router.put("/{book_id:int}", response_model=schemas.Book)
+async def update_book(
+    book_id: int,
+    book_update: schemas.BookUpdate,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    book = await aio.update_book(db, book_id, current_user.id, book_update.model_dump(exclude_unset=True))
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return UTCJSONResponse(book)
+
+
+@books_router.delete("/{book_id:int}", status_code=204)
+async def delete_book(
+    book_id: int,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not await aio.delete_book(db, book_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Book not found")
+    return {}
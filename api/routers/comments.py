@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..jwt_utils import get_current_user
-from ..auth_models import User
+from ..jwt_utils import AuthUser, get_current_user
 from ..services.comments import list_comments, add_comment, delete_comment
+from ..services.replica import get_read_db
+from ..utils.responses import UTCJSONResponse
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
@@ -17,9 +18,20 @@ class CommentCreate(BaseModel):
 
 
 @router.get("/{book_id}")
-def public_comments(book_id: int, db: Session = Depends(get_db)):
-    # returns [] if not public/not found
-    return {"items": list_comments(db, book_id)}
+def public_comments(
+    book_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    after: str | None = None,
+    before: str | None = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_read_db),
+):
+    # empty items if not public/not found
+    try:
+        page = list_comments(db, book_id, limit=limit, after=after, before=before, order=order)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
 
 
 @router.post("/{book_id}")
@@ -27,10 +39,10 @@ def create_comment(
     book_id: int,
     payload: CommentCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     try:
-        created = add_comment(db, book_id, user.id, payload.body)
+        created = add_comment(db, book_id, user, payload.body)
         return created
     except ValueError as e:
         if str(e) == "book_not_commentable":
@@ -46,7 +58,7 @@ def create_comment(
 def remove_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     try:
         ok = delete_comment(db, comment_id, user.id)
@@ -2,16 +2,21 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..jwt_utils import get_current_user, get_current_user_optional
-from ..auth_models import User
+from ..jwt_utils import AuthUser, get_current_user, get_current_user_optional
+from ..utils.responses import UTCJSONResponse
 
 from ..services.feed import (
+    MAX_ENGAGEMENT_IDS,
+    get_engagement,
     get_public_feed,
     get_public_feed_item,
     set_like,
     unset_like,
     has_liked,
 )
+from ..services.replica import get_read_db, wants_fresh_reads
+from ..services.search import search_reviews
+from ..services.timeline import get_following_timeline
 
 from ..services.comments import (
     list_comments,
@@ -27,39 +32,108 @@ def public_feed(
     sort: str = Query("newest", pattern="^(newest|oldest|review_length|review_type)$"),
     genre: str | None = None,
     review_type: str | None = Query(None, pattern="^(RECOMMENDED|NOT_RECOMMENDED|NEUTRAL)$"),
+    limit: int = Query(20, ge=1, le=50),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
+    user: AuthUser | None = Depends(get_current_user_optional),
+):
+    try:
+        page = get_public_feed(
+            db,
+            sort=sort,
+            genre=genre,
+            review_type=review_type,
+            limit=limit,
+            after=after,
+            user_id=(user.id if user else None),
+            use_cache=not wants_fresh_reads(db),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
+
+
+@router.get("/following")
+def following_feed(
     limit: int = Query(20, ge=1, le=50),
     after: str | None = None,
     db: Session = Depends(get_db),
-    user: User | None = Depends(get_current_user_optional),
+    user: AuthUser = Depends(get_current_user),
 ):
-    return get_public_feed(
-        db,
-        sort=sort,
-        genre=genre,
-        review_type=review_type,
-        limit=limit,
-        after=after,
-        user_id=(user.id if user else None),
-    )
+    # declared before /{book_id} so "following" isn't parsed as an id
+    try:
+        page = get_following_timeline(db, user_id=user.id, limit=limit, after=after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
+
+
+@router.get("/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    review_type: str | None = Query(None, description="Comma-separated: RECOMMENDED,NOT_RECOMMENDED,NEUTRAL"),
+    limit: int = Query(20, ge=1, le=50),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
+    user: AuthUser | None = Depends(get_current_user_optional),
+):
+    review_types = [t.strip() for t in review_type.split(",") if t.strip()] if review_type else None
+    try:
+        page = search_reviews(
+            db,
+            q,
+            review_types=review_types,
+            limit=limit,
+            after=after,
+            user_id=(user.id if user else None),
+        )
+    except ValueError as e:
+        msg = str(e)
+
+        if msg == "empty_query":
+            raise HTTPException(status_code=400, detail="Search query has no words")
+
+        if msg == "bad_review_type":
+            raise HTTPException(status_code=400, detail="Unknown review_type")
+
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse(page)
+
+
+@router.get("/engagement")
+def engagement(
+    ids: str = Query(..., description="Comma-separated review ids"),
+    db: Session = Depends(get_read_db),
+    user: AuthUser | None = Depends(get_current_user_optional),
+):
+    try:
+        id_list = [int(part) for part in ids.split(",") if part.strip()]
+        items = get_engagement(db, id_list, user_id=(user.id if user else None))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"ids must be up to {MAX_ENGAGEMENT_IDS} comma-separated integers",
+        )
+    return UTCJSONResponse({"items": items})
 
 
 @router.get("/{book_id}")
 def public_feed_item(
     book_id: int,
-    db: Session = Depends(get_db),
-    user: User | None = Depends(get_current_user_optional),
+    db: Session = Depends(get_read_db),
+    user: AuthUser | None = Depends(get_current_user_optional),
 ):
     item = get_public_feed_item(db, book_id=book_id, user_id=(user.id if user else None))
     if not item:
         raise HTTPException(status_code=404, detail="Post not found")
-    return item
+    return UTCJSONResponse(item)
 
 
 @router.post("/{book_id}/like")
 def like_post(
     book_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     try:
         like_count = set_like(db, user_id=user.id, book_id=book_id)
@@ -72,7 +146,7 @@ def like_post(
 def unlike_post(
     book_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     try:
         like_count = unset_like(db, user_id=user.id, book_id=book_id)
@@ -85,14 +159,25 @@ def unlike_post(
 def liked_status(
     book_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return {"book_id": book_id, "liked": has_liked(db, user_id=user.id, book_id=book_id)}
 
 
 @router.get("/{book_id}/comments")
-def get_comments(book_id: int, db: Session = Depends(get_db)):
-    return {"book_id": book_id, "items": list_comments(db, book_id=book_id)}
+def get_comments(
+    book_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    after: str | None = None,
+    before: str | None = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        page = list_comments(db, book_id=book_id, limit=limit, after=after, before=before, order=order)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return UTCJSONResponse({"book_id": book_id, **page})
 
 
 @router.post("/{book_id}/comments")
@@ -100,12 +185,12 @@ def post_comment(
     book_id: int,
     payload: dict,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     body = (payload or {}).get("body")
 
     try:
-        c = add_comment(db, user_id=user.id, book_id=book_id, body=body)
+        c = add_comment(db, book_id=book_id, user=user, body=body)
         return {"book_id": book_id, "comment": c}
     except ValueError as e:
         msg = str(e)
@@ -126,7 +211,7 @@ def post_comment(
 def delete_comment_route(
     comment_id: int,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     try:
         ok = delete_comment(db, comment_id=comment_id, user_id=user.id)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..jwt_utils import AuthUser, get_current_user
+from ..services.timeline import follow_user, unfollow_user
+
+router = APIRouter(prefix="/users", tags=["follows"])
+
+
+@router.post("/{user_id}/follow")
+def follow(
+    user_id: int,
+    db: Session = Depends(get_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    try:
+        count = follow_user(db, follower_id=user.id, followee_id=user_id)
+    except ValueError as e:
+        if str(e) == "cannot_follow_self":
+            raise HTTPException(status_code=400, detail="You cannot follow yourself")
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"user_id": user_id, "following": True, "follower_count": count}
+
+
+@router.delete("/{user_id}/follow")
+def unfollow(
+    user_id: int,
+    db: Session = Depends(get_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    count = unfollow_user(db, follower_id=user.id, followee_id=user_id)
+    return {"user_id": user_id, "following": False, "follower_count": count}
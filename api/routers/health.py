@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from ..config import settings
 from ..database import get_db
+from ..utils.metrics import snapshot_all
 
 router = APIRouter(tags=["health"])
 
@@ -14,4 +18,26 @@ def health(db: Session = Depends(get_db)):
     - Ensures we can talk to the DB
     """
     db.execute(text("SELECT 1"))
-    return {"status": "ok", "db": "ok"}
\ No newline at end of file
+    return {"status": "ok", "db": "ok"}
+
+
+def require_metrics_token(authorization: str | None = Header(None)):
+    # off (404) unless METRICS_TOKEN is set; then only "Bearer <METRICS_TOKEN>"
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not authorization or not secrets.compare_digest(authorization.encode(), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+def metrics():
+    """
+    In-process counters and latency percentiles (per worker): pool, caches,
+    breaker and hasher internals, so it's for operators and scrapers only.
+    """
+    return snapshot_all()
@@ -6,6 +6,7 @@ from typing import Optional
 class BookBase(BaseModel):
     title: str
     author: Optional[str] = None
+    genre: Optional[str] = None
     cover_image_url: Optional[str] = None
     review_text: Optional[str] = None
     is_recommended: Optional[bool] = None
@@ -17,6 +18,7 @@ class BookCreate(BookBase):
 # what the API sends back
 class Book(BookBase):
     id: int
+    cover_status: Optional[str] = None
     read_on: datetime
     created_at: datetime
 
@@ -29,6 +31,7 @@ class Book(BookBase):
 class BookUpdate(BaseModel):
     title: Optional[str] = None
     author: Optional[str] = None
+    genre: Optional[str] = None
     cover_image_url: Optional[str] = None
     review_text: Optional[str] = None
     is_recommended: Optional[bool] = None
\ No newline at end of file
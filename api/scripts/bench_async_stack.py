@@ -0,0 +1,167 @@
+# api/scripts/bench_async_stack.py
+# Sustained RPS / latency of the sync vs. ASYNC_DB route stacks when every
+# database round trip costs a few ms (as it does against remote Turso).
+#   python -m api.scripts.bench_async_stack [--latency-ms N] [--concurrency N] [--seconds N]
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+POOL_SIZE = 100  # connections, same for both stacks
+BOOKS = 500
+
+parser = argparse.ArgumentParser(description="sync vs. async stack under DB latency")
+parser.add_argument("--latency-ms", type=float, default=50.0, help="simulated per-statement round trip")
+parser.add_argument("--concurrency", type=int, default=200, help="simultaneous clients")
+parser.add_argument("--seconds", type=float, default=10.0, help="measurement time per stack")
+parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+ARGS = parser.parse_known_args()[0]
+
+
+def _slow_statements(conn) -> None:
+    # runs in whichever thread executes the statement: a request thread on
+    # the sync stack, aiosqlite's connection thread on the async one
+    conn.set_trace_callback(lambda _sql: time.sleep(ARGS.latency_ms / 1000))
+
+
+def _pct(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else 0.0
+
+
+async def _load(app) -> dict:
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + ARGS.seconds
+
+    async def client_loop(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            url = f"/feed/{random.randint(1, BOOKS)}" if random.random() < 0.5 else "/feed?limit=10"
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(ARGS.concurrency)))
+
+    return {
+        "rps": len(latencies) / ARGS.seconds,
+        "p50": _pct(latencies, 0.50),
+        "p99": _pct(latencies, 0.99),
+        "errors": errors,
+    }
+
+
+def _child():
+    from sqlalchemy import create_engine, event, insert
+    from sqlalchemy.orm import sessionmaker
+
+    from ..auth_models import User
+    from ..database import ASYNC_DB, Base, get_async_db, get_db
+    from ..main import app
+    from ..models import Book
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+    )
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.execute(insert(User), [{"id": 1, "username": "bench", "password_hash": "x"}])
+        now = datetime.utcnow()
+        db.execute(
+            insert(Book),
+            [
+                {"id": i, "title": f"Book {i}", "owner_id": 1, "review_text": "x" * 300, "created_at": now - timedelta(minutes=i)}
+                for i in range(1, BOOKS + 1)
+            ],
+        )
+        db.commit()
+
+    event.listen(engine, "connect", lambda dbapi_conn, _rec: _slow_statements(dbapi_conn))
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+
+    async def main():
+        if ASYNC_DB:
+            import aiosqlite
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            async def connect():
+                conn = await aiosqlite.connect(path)
+                await conn.set_trace_callback(lambda _sql: time.sleep(ARGS.latency_ms / 1000))
+                return conn
+
+            async_engine = create_async_engine(
+                f"sqlite+aiosqlite:///{path}", async_creator=connect, pool_size=POOL_SIZE, max_overflow=0
+            )
+            AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+            async def override_async_db():
+                async with AsyncSession() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_db] = override_async_db
+            try:
+                return await _load(app)
+            finally:
+                await async_engine.dispose()
+        return await _load(app)
+
+    try:
+        result = asyncio.run(main())
+    finally:
+        engine.dispose()
+        os.remove(path)
+    print(json.dumps(result))
+
+
+def run():
+    print(
+        f"{ARGS.latency_ms:.0f}ms per statement, {ARGS.concurrency} clients, "
+        f"pool {POOL_SIZE}, {ARGS.seconds:.0f}s per stack\n"
+    )
+    print(f"{'stack':>6}  {'rps':>7}  {'p50':>9}  {'p99':>9}  {'errors':>6}")
+    for name, flag in (("sync", "0"), ("async", "1")):
+        env = {**os.environ, "ASYNC_DB": flag, "FEED_CACHE_ENABLED": "false"}
+        out = subprocess.run(
+            [sys.executable, "-m", "api.scripts.bench_async_stack", "--child", *sys.argv[1:]],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{name:>6}  {r['rps']:7.0f}  {r['p50']:7.1f}ms  {r['p99']:7.1f}ms  {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    if ARGS.child:
+        _child()
+    else:
+        run()
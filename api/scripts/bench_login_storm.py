@@ -0,0 +1,139 @@
+# api/scripts/bench_login_storm.py
+# Feed latency during a login storm, with bcrypt inline vs. in the process pool.
+#   python -m api.scripts.bench_login_storm
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+PHASE_SECONDS = 5.0
+# more than Starlette's 40 threadpool threads, so an unbounded hasher would starve the feed
+STORM_THREADS = 64
+MODES = {"inline": "0", "process pool": str(max(1, (os.cpu_count() or 2) - 1))}
+
+
+def _pct(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else 0.0
+
+
+def _phase(client, storm: bool) -> dict:
+    stop = threading.Event()
+    feed_latencies: list[float] = []
+    logins = {"ok": 0, "busy": 0}
+    lock = threading.Lock()
+
+    def read_feed():
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/feed?limit=20")
+            feed_latencies.append(time.perf_counter() - started)
+
+    def login():
+        while not stop.is_set():
+            code = client.post("/auth/login", json={"username": "storm", "password": "hunter22"}).status_code
+            with lock:
+                logins["ok" if code == 200 else "busy"] += 1
+
+    threads = [threading.Thread(target=read_feed)]
+    if storm:
+        threads += [threading.Thread(target=login) for _ in range(STORM_THREADS)]
+    for t in threads:
+        t.start()
+    time.sleep(PHASE_SECONDS)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {
+        "feed_p50": _pct(feed_latencies, 0.50),
+        "feed_p99": _pct(feed_latencies, 0.99),
+        "feed_rps": len(feed_latencies) / PHASE_SECONDS,
+        "logins_per_s": logins["ok"] / PHASE_SECONDS,
+        "rejected": logins["busy"],
+    }
+
+
+def _child():
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+
+    from ..auth_models import User
+    from ..database import Base, get_db
+    from ..main import app
+    from ..models import Book
+    from ..services.passwords import password_hasher, pwd_context
+    from ..services.replica import get_read_db
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Session = sessionmaker(bind=engine)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with Session() as db:
+            db.execute(
+                insert(User),
+                [{"id": 1, "username": "storm", "password_hash": pwd_context.hash("hunter22")}],
+            )
+            now = datetime.utcnow()
+            db.execute(
+                insert(Book),
+                [
+                    {"title": f"Book {i}", "owner_id": 1, "review_text": "x" * 400, "created_at": now - timedelta(minutes=i)}
+                    for i in range(500)
+                ],
+            )
+            db.commit()
+
+        def override_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[get_read_db] = override_db
+        client = TestClient(app)  # no lifespan: skip the app's startup hooks
+        password_hasher.hash("warm-up")  # spawn the pool before measuring
+
+        result = {"idle": _phase(client, storm=False), "storm": _phase(client, storm=True)}
+        password_hasher.shutdown()
+    finally:
+        engine.dispose()
+        os.remove(path)
+    print(json.dumps(result))
+
+
+def run():
+    print(f"{PHASE_SECONDS:.0f}s per phase, {STORM_THREADS} login threads, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':>14}  {'phase':>6}  {'feed p50':>9}  {'feed p99':>9}  {'feed rps':>8}  {'logins/s':>8}  {'503s':>5}")
+    for mode, workers in MODES.items():
+        env = {**os.environ, "PASSWORD_HASH_WORKERS": workers, "FEED_CACHE_ENABLED": "false"}
+        out = subprocess.run(
+            [sys.executable, "-m", "api.scripts.bench_login_storm", "--child"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        for phase in ("idle", "storm"):
+            r = result[phase]
+            print(
+                f"{mode:>14}  {phase:>6}  {r['feed_p50']:7.1f}ms  {r['feed_p99']:7.1f}ms  "
+                f"{r['feed_rps']:8.0f}  {r['logins_per_s']:8.1f}  {r['rejected']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        _child()
+    else:
+        run()
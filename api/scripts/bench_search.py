@@ -0,0 +1,150 @@
+# api/scripts/bench_search.py
+# /feed/search query latency (FTS5 + bm25 + keyset) on a throwaway SQLite
+# file with N synthetic reviews, plus a LIKE '%term%' scan for comparison.
+#   python -m api.scripts.bench_search [--reviews N] [--runs N]
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from ..config import settings
+from ..database import Base
+from ..models import REVIEW_TYPES, Book
+from ..services.search import ensure_search_index, search_reviews
+from ..utils.sqlite import install_sqlite_profile
+
+USERS = 1000
+VOCABULARY = 20000
+WORDS_PER_REVIEW = 40
+BATCH = 50000
+
+parser = argparse.ArgumentParser(description="full-text search latency")
+parser.add_argument("--reviews", type=int, default=1_000_000, help="seeded reviews")
+parser.add_argument("--runs", type=int, default=30, help="queries per case")
+
+# (review_type, is_recommended) pairs; raw inserts skip Book's validators
+_REVIEW_TYPE_COLUMNS = list(REVIEW_TYPES.items())
+_SYLLABLES = ["ka", "lo", "mi", "ren", "tas", "vo", "el", "dun", "shi", "pra", "gor", "neb", "ul", "fen", "qui", "zar"]
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < VOCABULARY:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    # list position is the word's frequency rank in _seed
+    return sorted(words)
+
+
+def _seed(path: str, n: int, words: list[str], rng: random.Random) -> None:
+    # Zipf-ish: word i is picked with weight 1 / (i + 1)
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(words))))
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO users (id, username, password_hash, follower_count) VALUES (?, ?, 'x', 0)",
+        [(i, f"user{i}") for i in range(1, USERS + 1)],
+    )
+    for start in range(0, n, BATCH):
+        rows = []
+        for i in range(start + 1, min(n, start + BATCH) + 1):
+            text = " ".join(rng.choices(words, cum_weights=cum_weights, k=WORDS_PER_REVIEW))
+            rows.append(
+                (
+                    i,
+                    " ".join(rng.choices(words, cum_weights=cum_weights, k=3)).title(),
+                    " ".join(rng.choices(words[-5000:], k=2)).title(),
+                    text,
+                    len(text),
+                    *rng.choice(_REVIEW_TYPE_COLUMNS),
+                    (now - timedelta(seconds=i)).isoformat(sep=" "),
+                    rng.randint(1, USERS),
+                )
+            )
+        conn.executemany(
+            "INSERT INTO books (id, title, author, review_text, review_length, review_type, is_recommended, "
+            "created_at, owner_id, like_count, comment_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0)",
+            rows,
+        )
+        conn.commit()
+    conn.close()
+
+
+def _time(fn, runs: int) -> str:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1000
+    return f"p50={p50:8.2f}ms p99={p99:8.2f}ms"
+
+
+def run():
+    args = parser.parse_args()
+    rng = random.Random(7)
+    words = _vocabulary(rng)
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    install_sqlite_profile(engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+    try:
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        _seed(path, args.reviews, words, rng)
+        print(f"seeded {args.reviews} reviews in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        ensure_search_index(engine)
+        print(f"built the FTS index in {time.perf_counter() - started:.1f}s, file {os.path.getsize(path) / 1e6:.0f} MB\n")
+
+        db = sessionmaker(bind=engine)()
+        common, mid, rare = words[0], words[200], words[15000]
+
+        def deep(term: str, pages: int):
+            after = None
+            for _ in range(pages):
+                after = search_reviews(db, term, after=after)["next_cursor"]
+
+        cases = [
+            (f"rare term ({rare})", lambda: search_reviews(db, rare)),
+            (f"mid term ({mid})", lambda: search_reviews(db, mid)),
+            (f"common term ({common})", lambda: search_reviews(db, common)),
+            ("two terms (mid + common)", lambda: search_reviews(db, f"{mid} {common}")),
+            (f"prefix ({mid[:5]}*)", lambda: search_reviews(db, mid[:5] + "*")),
+            ("mid + review_type filter", lambda: search_reviews(db, mid, review_types=["RECOMMENDED", "NEUTRAL"])),
+            ("mid, 5 pages deep", lambda: deep(mid, 5)),
+        ]
+        for cap in (0, settings.SEARCH_MAX_RANKED_MATCHES):
+            settings.SEARCH_MAX_RANKED_MATCHES = cap
+            print(f"ranking {'every match' if cap == 0 else f'the newest {cap} matches'}:")
+            for name, fn in cases:
+                print(f"{name:>34}: {_time(fn, args.runs)}")
+            print()
+
+        # what ranking by relevance without the index would need: every match
+        like = lambda: db.execute(
+            select(func.count()).select_from(Book).where(Book.review_text.like(f"%{mid}%"))
+        ).scalar()
+        print(f"{'LIKE %mid% (all matches)':>34}: {_time(like, 3)}")
+        db.close()
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    run()
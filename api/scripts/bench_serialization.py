@@ -0,0 +1,104 @@
+# api/scripts/bench_serialization.py
+# Response serialization time for a 50-item feed page and a 100-book library,
+# old path (jsonable_encoder + JSONResponse) vs UTCJSONResponse. No database:
+# the payloads are built in memory the way the routes build them.
+#   python -m api.scripts.bench_serialization [--runs N]
+import argparse
+import statistics
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from .. import auth_models  # noqa: F401  (registers User for Book.owner)
+from ..models import REVIEW_TYPES, Book
+from ..services.feed import _feed_row_to_dict
+from ..utils.responses import UTCJSONResponse
+from ..utils.time import iso_utc
+
+parser = argparse.ArgumentParser(description="response serialization time")
+parser.add_argument("--runs", type=int, default=2000, help="renders per case")
+
+FeedRow = namedtuple(
+    "FeedRow",
+    "id title author genre cover_image_url body review_type review_length review_date "
+    "created_at like_count comment_count owner_id owner_username liked_by_me",
+)
+
+
+def _feed_page(n: int = 50) -> dict:
+    now = datetime.utcnow()
+    types = list(REVIEW_TYPES)
+    rows = [
+        FeedRow(
+            i, f"Book {i}", f"Author {i}", "Fantasy", f"https://covers.openlibrary.org/b/id/{i}-M.jpg",
+            "lorem ipsum " * 30, types[i % 3], 360, date(2026, 1, 1) + timedelta(days=i),
+            now - timedelta(minutes=i), i * 3, i, i % 7, f"user{i % 7}", False,
+        )
+        for i in range(1, n + 1)
+    ]
+    return {
+        "items": [_feed_row_to_dict(r, full_body=False) for r in rows],
+        "next_cursor": f"{rows[-1].created_at.isoformat()}|{rows[-1].id}",
+    }
+
+
+def _library(n: int = 100) -> list:
+    now = datetime.utcnow()
+    books = []
+    for i in range(1, n + 1):
+        # every column set, as after db.refresh / a query
+        book = Book(
+            id=i, title=f"Book {i}", author=f"Author {i}", genre="Fantasy", cover_image_url=None,
+            cover_status="found", review_text="lorem ipsum " * 60, is_recommended=bool(i % 2),
+            read_on=now, created_at=now - timedelta(minutes=i), review_date=None, started_date=None,
+            finished_date=None, like_count=i, comment_count=0, owner_id=1,
+        )
+        books.append(book)
+    return books
+
+
+def _old(payload) -> bytes:
+    # the json_utc helper this replaced
+    return JSONResponse(content=jsonable_encoder(payload, custom_encoder={datetime: iso_utc})).body
+
+
+def _dict_route(payload) -> bytes:
+    # a route returning plain data: FastAPI encodes it before the response class renders
+    return UTCJSONResponse(jsonable_encoder(payload)).body
+
+
+def _new(payload) -> bytes:
+    return UTCJSONResponse(payload).body
+
+
+def _time(fn, payload, runs: int) -> str:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(payload)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1e6
+    return f"p50={p50:8.1f}us p99={p99:8.1f}us"
+
+
+def run():
+    args = parser.parse_args()
+    cases = [
+        ("feed page (50 items)", _feed_page(), [("jsonable_encoder + json", _old), ("jsonable_encoder + orjson", _dict_route), ("UTCJSONResponse", _new)]),
+        ("library (100 books)", _library(), [("jsonable_encoder + json", _old), ("UTCJSONResponse", _new)]),
+    ]
+    for name, payload, paths in cases:
+        size = len(_new(payload))
+        print(f"{name}, {size / 1024:.1f} KB:")
+        for label, fn in paths:
+            print(f"{label:>30}: {_time(fn, payload, args.runs)}")
+        print()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,165 @@
+# api/scripts/bench_sqlite_profile.py
+# Concurrent feed reads + like/comment writes against a seeded SQLite file,
+# once per SQLITE_PROFILE (see api/utils/sqlite.py).
+#   python -m api.scripts.bench_sqlite_profile [--readers N] [--writers N] [--seconds N] [--books N]
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from ..auth_models import User
+from ..config import settings
+from ..database import Base
+from ..models import REVIEW_TYPES, Book
+from ..services.auth_cache import AuthUser
+from ..services.comments import add_comment
+from ..services.feed import get_public_feed, get_public_feed_item
+from ..services.feed_cache import feed_cache
+from ..services.likes import add_like, remove_like
+from ..utils.sqlite import SQLITE_PROFILES, install_sqlite_profile
+
+USERS = 500
+
+parser = argparse.ArgumentParser(description="SQLite PRAGMA profiles under concurrent reads and writes")
+parser.add_argument("--readers", type=int, default=8, help="reader threads")
+parser.add_argument("--writers", type=int, default=2, help="writer threads")
+parser.add_argument("--seconds", type=float, default=10.0, help="measurement time per profile")
+parser.add_argument("--books", type=int, default=20000, help="seeded reviews")
+
+
+def _seed(Session, books: int) -> float:
+    started = time.perf_counter()
+    with Session() as db:
+        db.execute(insert(User), [{"id": i, "username": f"user{i}", "password_hash": "x"} for i in range(1, USERS + 1)])
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": i,
+                "title": f"Book {i}",
+                "owner_id": random.randint(1, USERS),
+                "review_text": "x" * random.randint(50, 2000),
+                "review_type": review_type,
+                "is_recommended": REVIEW_TYPES[review_type],
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i, review_type in zip(range(1, books + 1), random.choices(list(REVIEW_TYPES), k=books))
+        ]
+        for i in range(0, len(rows), 5000):
+            db.execute(insert(Book), rows[i : i + 5000])
+        db.commit()
+    return time.perf_counter() - started
+
+
+def _pct(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else 0.0
+
+
+def _run(profile: str, args) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.readers + args.writers,
+        max_overflow=0,
+    )
+    install_sqlite_profile(engine, profile, settings.SQLITE_BUSY_TIMEOUT_MS)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    seed_seconds = _seed(Session, args.books)
+
+    reads: list[float] = []
+    writes: list[float] = []
+    errors = {"locked": 0}
+    deadline = time.perf_counter() + args.seconds
+
+    def reader():
+        rng = random.Random()
+        with Session() as db:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    if rng.random() < 0.5:
+                        after = None
+                        for _ in range(3):
+                            after = get_public_feed(db, limit=20, after=after)["next_cursor"]
+                    else:
+                        get_public_feed_item(db, rng.randint(1, args.books))
+                    db.rollback()
+                except OperationalError:
+                    db.rollback()
+                    errors["locked"] += 1
+                    continue
+                reads.append(time.perf_counter() - started)
+
+    def writer():
+        rng = random.Random()
+        with Session() as db:
+            while time.perf_counter() < deadline:
+                book_id = rng.randint(1, args.books)
+                user_id = rng.randint(1, USERS)
+                started = time.perf_counter()
+                try:
+                    op = rng.random()
+                    if op < 0.4:
+                        add_like(db, book_id, user_id)
+                    elif op < 0.6:
+                        remove_like(db, book_id, user_id)
+                    else:
+                        add_comment(db, book_id, AuthUser(id=user_id, username=f"user{user_id}"), "nice review")
+                except OperationalError:
+                    db.rollback()
+                    errors["locked"] += 1
+                    continue
+                writes.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    return {
+        "seed_s": seed_seconds,
+        "reads_s": len(reads) / args.seconds,
+        "read_p99": _pct(reads, 0.99),
+        "writes_s": len(writes) / args.seconds,
+        "write_p99": _pct(writes, 0.99),
+        "locked": errors["locked"],
+    }
+
+
+def run():
+    args = parser.parse_args()
+    # measure the database, not the page cache
+    feed_cache.enabled = False
+
+    print(
+        f"{args.books} reviews, {args.readers} readers + {args.writers} writers, "
+        f"{args.seconds:.0f}s per profile\n"
+    )
+    print(f"{'profile':>9}  {'seed':>6}  {'reads/s':>8}  {'read p99':>9}  {'writes/s':>8}  {'write p99':>9}  {'locked':>6}")
+    for profile in SQLITE_PROFILES:
+        r = _run(profile, args)
+        print(
+            f"{profile:>9}  {r['seed_s']:5.2f}s  {r['reads_s']:8.0f}  {r['read_p99']:7.1f}ms  "
+            f"{r['writes_s']:8.0f}  {r['write_p99']:7.1f}ms  {r['locked']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,106 @@
+# api/scripts/bench_timeline.py
+# Following-timeline latency vs. follow-graph size, on a throwaway SQLite file.
+#   python -m api.scripts.bench_timeline
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from ..config import settings
+from ..database import Base
+from ..auth_models import User
+from ..models import Book, Follow, TimelineEntry
+from ..services.timeline import get_following_timeline
+
+GRAPH_SIZES = (10, 100, 1000, 5000)
+POSTS_PER_AUTHOR = 5
+PULLED_SHARE = 0.05  # share of followed authors above the fan-out threshold
+RUNS = 30
+
+
+def _seed(db, following: int) -> int:
+    reader_id = 1
+    db.execute(insert(User), [{"id": reader_id, "username": "reader", "password_hash": "x"}])
+
+    now = datetime.utcnow()
+    pulled_count = settings.TIMELINE_FANOUT_MAX_FOLLOWERS + 1
+    users, books, follows, entries = [], [], [], []
+    book_id = 0
+    for a in range(following):
+        author_id = a + 2
+        pulled = random.random() < PULLED_SHARE
+        users.append(
+            {
+                "id": author_id,
+                "username": f"author{author_id}",
+                "password_hash": "x",
+                "follower_count": pulled_count if pulled else 1,
+            }
+        )
+        follows.append({"follower_id": reader_id, "followee_id": author_id})
+        for _ in range(POSTS_PER_AUTHOR):
+            book_id += 1
+            created = now - timedelta(minutes=random.randint(0, 60 * 24 * 30))
+            books.append({"id": book_id, "title": f"Book {book_id}", "owner_id": author_id, "created_at": created})
+            if not pulled:
+                entries.append(
+                    {"user_id": reader_id, "review_id": book_id, "author_id": author_id, "created_at": created}
+                )
+
+    db.execute(insert(User), users)
+    db.execute(insert(Book), books)
+    db.execute(insert(Follow), follows)
+    if entries:
+        db.execute(insert(TimelineEntry), entries)
+    db.commit()
+    return reader_id
+
+
+def _measure(db, reader_id: int, pages: int) -> list[float]:
+    samples = []
+    for _ in range(RUNS):
+        after = None
+        for _ in range(pages):
+            started = time.perf_counter()
+            page = get_following_timeline(db, reader_id, limit=20, after=after)
+            after = page["next_cursor"]
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _fmt(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1000
+    return f"p50={p50:7.2f}ms p99={p99:7.2f}ms"
+
+
+def run():
+    random.seed(7)
+    print(f"{'following':>10}  {'page 1':>28}  {'page 5':>28}")
+    for size in GRAPH_SIZES:
+        fd, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{path}")
+        try:
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                reader_id = _seed(db, size)
+                first = _measure(db, reader_id, pages=1)
+                deep = _measure(db, reader_id, pages=5)
+            finally:
+                db.close()
+        finally:
+            engine.dispose()
+            os.remove(path)
+        print(f"{size:>10}  {_fmt(first):>28}  {_fmt(deep):>28}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,228 @@
+# api/scripts/check_query_plans.py
+# Runs the hot read/write paths against a seeded throwaway SQLite file,
+# EXPLAIN QUERY PLANs every statement they issue, and exits non-zero if any
+# plan falls back to a full scan or a temp B-tree sort.
+#   python -m api.scripts.check_query_plans [--verbose]
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from ..auth_models import User
+from ..config import settings
+from ..database import Base
+from ..models import REVIEW_TYPES, Book, Comment, Follow, Like, TimelineEntry
+from ..services import books
+from ..services.auth_cache import AuthUser
+from ..services.comments import add_comment, comment_page, delete_comment
+from ..services.feed import _load_feed_page, _parse_cursor, get_engagement, get_public_feed, get_public_feed_item
+from ..services.feed_cache import feed_cache
+from ..services.likes import add_like, remove_like
+from ..services.timeline import follow_user, get_following_timeline, unfollow_user
+from ..utils.sqlite import install_sqlite_profile
+
+USERS = 300
+BOOKS = 5000
+GENRES = ["Fiction", "Nonfiction", "Sci-Fi", "Fantasy", "Mystery"]
+READER = 1
+PULLED_AUTHOR = 2  # above the fan-out threshold, merged on read
+
+# SCANs that read no table: constant rows and already-materialized subqueries.
+# Any other SCAN passes only as an index walked in ORDER BY order as the
+# outermost loop (it stops at the LIMIT); a TEMP B-TREE always fails.
+_SCAN_OK = ("SCAN CONSTANT ROW", "SCAN (subquery", "SCAN unnamed_subquery")
+
+parser = argparse.ArgumentParser(description="fail on full scans / temp B-tree sorts in hot queries")
+parser.add_argument("--verbose", action="store_true", help="print every plan, not just failures")
+
+
+def _seed(Session) -> None:
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    with Session() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": i,
+                    "username": f"user{i}",
+                    "password_hash": "x",
+                    "follower_count": settings.TIMELINE_FANOUT_MAX_FOLLOWERS + 1 if i == PULLED_AUTHOR else 1,
+                }
+                for i in range(1, USERS + 1)
+            ],
+        )
+        rows = []
+        for i in range(1, BOOKS + 1):
+            text = "x" * rng.randint(0, 800)
+            review_type = rng.choice(list(REVIEW_TYPES))
+            rows.append(
+                {
+                    "id": i,
+                    "title": f"Book {i}",
+                    "owner_id": rng.randint(1, USERS),
+                    "genre": rng.choice(GENRES),
+                    "review_text": text,
+                    "review_length": len(text),
+                    "review_type": review_type,
+                    "is_recommended": REVIEW_TYPES[review_type],
+                    "created_at": now - timedelta(minutes=i),
+                }
+            )
+        db.execute(insert(Book), rows)
+        db.execute(
+            insert(Follow),
+            [{"follower_id": READER, "followee_id": a} for a in range(2, 60)],
+        )
+        db.execute(
+            insert(TimelineEntry),
+            [
+                {"user_id": READER, "review_id": r["id"], "author_id": r["owner_id"], "created_at": r["created_at"]}
+                for r in rows
+                if 2 < r["owner_id"] < 60
+            ],
+        )
+        likes = {(rng.randint(1, USERS), rng.randint(1, BOOKS)) for _ in range(20000)}
+        db.execute(insert(Like), [{"user_id": u, "review_id": b} for u, b in likes])
+        db.execute(
+            insert(Comment),
+            [
+                {"review_id": rng.randint(1, 50), "user_id": rng.randint(1, USERS), "body": "c", "created_at": now - timedelta(seconds=i)}
+                for i in range(5000)
+            ],
+        )
+        db.commit()
+
+
+def _cases(db) -> List[Tuple[str, Callable[[], object]]]:
+    cases: List[Tuple[str, Callable[[], object]]] = []
+
+    def feed_pages(sort, genre, review_type):
+        first = _load_feed_page(db, sort, genre, review_type, 20, None)
+        _load_feed_page(db, sort, genre, review_type, 20, _parse_cursor(first["next_cursor"], sort))
+
+    for sort in ("newest", "oldest", "review_length", "review_type"):
+        for genre, review_type in ((None, None), ("Fantasy", None), (None, "RECOMMENDED"), (None, "NEUTRAL"), ("Fantasy", "NOT_RECOMMENDED")):
+            label = f"feed sort={sort} genre={genre} review_type={review_type}"
+            cases.append((label, lambda s=sort, g=genre, r=review_type: feed_pages(s, g, r)))
+
+    def comments(order):
+        rows, cursor = comment_page(db, 1, 20, None, None, order)
+        comment_page(db, 1, 20, cursor, None, order)
+        comment_page(db, 1, 20, None, cursor, order)
+
+    cases += [
+        ("feed page with liked_by_me", lambda: get_public_feed(db, user_id=READER)),
+        ("feed item", lambda: get_public_feed_item(db, 10, user_id=READER)),
+        ("engagement", lambda: get_engagement(db, list(range(1, 101)), user_id=READER)),
+        ("comments asc", lambda: comments("asc")),
+        ("comments desc", lambda: comments("desc")),
+        ("following timeline", lambda: get_following_timeline(
+            db, READER, after=get_following_timeline(db, READER)["next_cursor"])),
+        ("library list", lambda: books.list_books(db, 5, skip=0, limit=100)),
+        ("library get", lambda: books.get_book(db, 10, 5)),
+        ("like / unlike", lambda: (add_like(db, 7, READER), remove_like(db, 7, READER))),
+        ("comment add / delete", lambda: delete_comment(
+            db, add_comment(db, 7, AuthUser(id=READER, username="user1"), "hi")["id"], READER)),
+        ("follow / unfollow", lambda: (follow_user(db, 200, 3), unfollow_user(db, 200, 3))),
+        ("create / delete book", lambda: books.delete_book(
+            db, books.create_book(db, 3, {"title": "New", "genre": "Fantasy"}).id, 3)),
+    ]
+    return cases
+
+
+def _problems(plan: List[tuple]) -> List[str]:
+    """plan rows are (id, parent, notused, detail)."""
+    first_child = {}
+    for node_id, parent, _, detail in plan:
+        if detail.startswith(("SCAN", "SEARCH")):
+            first_child.setdefault(parent, node_id)
+
+    problems = []
+    for node_id, parent, _, detail in plan:
+        if "TEMP B-TREE" in detail:
+            problems.append(detail)
+        elif detail.startswith("SCAN") and not detail.startswith(_SCAN_OK):
+            ordered_walk = "INDEX" in detail and first_child.get(parent) == node_id
+            if not ordered_walk:
+                problems.append(detail)
+    return problems
+
+
+def _capture(engine) -> List[Tuple[str, object]]:
+    """Record every single-row statement the engine runs, for _explain."""
+    captured: List[Tuple[str, object]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+            captured.append((statement, parameters))
+
+    return captured
+
+
+def _explain(engine, captured: List[Tuple[str, object]]) -> List[Tuple[str, List[tuple], List[str]]]:
+    """(statement, plan, problems) for each captured statement that reads a table."""
+    raw = engine.raw_connection()
+    try:
+        explained = []
+        for statement, parameters in list(captured):
+            if statement.lstrip().upper().startswith("INSERT") and " SELECT " not in statement.upper():
+                continue
+            plan = raw.cursor().execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            explained.append((statement, plan, _problems(plan)))
+    finally:
+        raw.close()
+    return explained
+
+
+def run() -> int:
+    args = parser.parse_args()
+    # plans of the loaders, not cache hits
+    feed_cache.enabled = False
+    # covers are looked up by a background pool; keep it out of the run
+    books.cover_enricher.submit = lambda *a, **kw: None
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    install_sqlite_profile(engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+    failures = 0
+    try:
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        _seed(Session)
+
+        captured = _capture(engine)
+        with Session() as db:
+            for label, fn in _cases(db):
+                captured.clear()
+                fn()
+                explained = _explain(engine, captured)
+
+                bad = [e for e in explained if e[2]]
+                failures += len(bad)
+                print(f"{'FAIL' if bad else 'ok  '}  {label} ({len(explained)} statements)")
+                for statement, plan, problems in explained:
+                    if problems or args.verbose:
+                        print(f"      {' '.join(statement.split())}")
+                        for row in plan:
+                            print(f"        {'!!' if row[3] in problems else '  '} {row[3]}")
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print(f"\n{failures} statement(s) with a full scan or temp B-tree sort" if failures else "\nall plans use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
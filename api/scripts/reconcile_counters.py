@@ -0,0 +1,54 @@
+# api/scripts/reconcile_counters.py
+# Recompute books.like_count / comment_count from the likes and comments tables.
+#   python -m api.scripts.reconcile_counters [--dry-run] [--chunk-size N] [--write-behind-drained]
+# With COUNTER_WRITE_BEHIND on, the web workers buffer deltas this process
+# can't see. Stop them first (shutdown flushes the buffers), then pass
+# --write-behind-drained. Otherwise only --dry-run runs.
+import argparse
+import sys
+import time
+
+from .. import auth_models  # noqa: F401  (registers User for Book.owner)
+from ..database import SessionLocal
+from ..services.counters import reconcile_counters
+
+
+def run(chunk_size: int = 1000, dry_run: bool = False, write_behind_drained: bool = False):
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        report = reconcile_counters(
+            db, chunk_size=chunk_size, dry_run=dry_run, write_behind_drained=write_behind_drained
+        )
+    except RuntimeError as e:
+        print(f"Refusing to reconcile: {e} (then pass --write-behind-drained)")
+        sys.exit(2)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+
+    for s in report["samples"]:
+        print(
+            f"  book {s['id']}: like_count {s['like_count'][0]} -> {s['like_count'][1]}, "
+            f"comment_count {s['comment_count'][0]} -> {s['comment_count'][1]}"
+        )
+    verb = "would fix" if dry_run else "fixed"
+    print(
+        f"Scanned {report['scanned']} books in {elapsed:.1f}s: {report['drifted']} drifted "
+        f"(likes off by {report['like_drift']}, comments off by {report['comment_drift']}), "
+        f"{verb} {report['drifted'] if dry_run else report['fixed']}, "
+        f"skipped {report['skipped_pending']} with buffered deltas."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile like/comment counters.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--write-behind-drained",
+        action="store_true",
+        help="with COUNTER_WRITE_BEHIND on: every web worker is stopped and has flushed its counters",
+    )
+    args = parser.parse_args()
+    run(chunk_size=args.chunk_size, dry_run=args.dry_run, write_behind_drained=args.write_behind_drained)
@@ -40,9 +40,11 @@ def run():
             b = Book(
                 title=f"Book {i}",
                 author=f"Author {i}",
+                genre=random.choice(genres),
                 cover_image_url=None,
                 review_text=f"Review {i}: some thoughts about Book {i}.",
-                is_recommended=random.choice([True, False]),
+                # sets review_type too (see Book._sync_review_type)
+                is_recommended=random.choice([True, False, None]),
                 read_on=created_dt,
                 created_at=created_dt,
                 owner_id=owner.id,
@@ -51,15 +53,6 @@ def run():
             if hasattr(b, "review_date"):
                 b.review_date = rd
 
-            if hasattr(b, "review_type"):
-                b.review_type = random.choice(["RECOMMENDED", "NOT_RECOMMENDED", "NEUTRAL"])
-
-            if hasattr(b, "like_count"):
-                b.like_count = random.randint(0, 20)
-
-            if hasattr(b, "comment_count"):
-                b.comment_count = random.randint(0, 5)
-
             db.add(b)
             books.append(b)
 
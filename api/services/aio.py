@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models import Book
+from api.services import books, comments, feed, likes
+
+# Async entry points for the ASYNC_DB stack.
+#
+# Each one runs the existing sync service through AsyncSession.run_sync: the
+# service code (queries, caching, counters) is shared, but every round trip
+# is awaited on the event loop instead of blocking a threadpool thread, so
+# in-flight requests are bounded by the connection pool, not the threadpool.
+#
+# Whatever runs inside run_sync executes on the event loop between awaits,
+# so it must not block: the feed cache is used without single-flight waits.
+
+
+async def get_public_feed(db: AsyncSession, **kwargs) -> Dict[str, Any]:
+    return await db.run_sync(lambda s: feed.get_public_feed(s, coalesce=False, **kwargs))
+
+
+async def get_public_feed_item(db: AsyncSession, book_id: int, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    return await db.run_sync(lambda s: feed.get_public_feed_item(s, book_id=book_id, user_id=user_id))
+
+
+async def get_engagement(db: AsyncSession, ids: List[int], user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    return await db.run_sync(lambda s: feed.get_engagement(s, ids, user_id=user_id))
+
+
+async def add_like(db: AsyncSession, book_id: int, user_id: int) -> int:
+    return await db.run_sync(lambda s: likes.add_like(s, book_id=book_id, user_id=user_id))
+
+
+async def remove_like(db: AsyncSession, book_id: int, user_id: int) -> int:
+    return await db.run_sync(lambda s: likes.remove_like(s, book_id=book_id, user_id=user_id))
+
+
+async def list_comments(db: AsyncSession, book_id: int, **kwargs) -> Dict[str, Any]:
+    return await db.run_sync(lambda s: comments.list_comments(s, book_id, **kwargs))
+
+
+async def add_comment(db: AsyncSession, book_id: int, user, body: str) -> Dict[str, Any]:
+    return await db.run_sync(lambda s: comments.add_comment(s, book_id, user, body))
+
+
+async def delete_comment(db: AsyncSession, comment_id: int, user_id: int) -> bool:
+    return await db.run_sync(lambda s: comments.delete_comment(s, comment_id, user_id))
+
+
+async def list_books(db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100) -> List[Book]:
+    return await db.run_sync(lambda s: books.list_books(s, owner_id, skip=skip, limit=limit))
+
+
+async def get_book(db: AsyncSession, book_id: int, owner_id: int) -> Optional[Book]:
+    return await db.run_sync(lambda s: books.get_book(s, book_id, owner_id))
+
+
+async def create_book(db: AsyncSession, owner_id: int, data: Dict[str, Any]) -> Book:
+    return await db.run_sync(lambda s: books.create_book(s, owner_id, data))
+
+
+async def update_book(db: AsyncSession, book_id: int, owner_id: int, update_data: Dict[str, Any]) -> Optional[Book]:
+    return await db.run_sync(lambda s: books.update_book(s, book_id, owner_id, update_data))
+
+
+async def delete_book(db: AsyncSession, book_id: int, owner_id: int) -> bool:
+    return await db.run_sync(lambda s: books.delete_book(s, book_id, owner_id))
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from api.auth_models import User
+from api.config import settings
+from api.utils.metrics import get_stats
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """The slice of a user that request handlers need; cheap to cache and share."""
+
+    id: int
+    username: str
+
+
+class _TTLCache:
+    """Bounded LRU with a per-entry deadline (monotonic seconds)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, Tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Any, now: float) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Any, value: Any, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AuthCache:
+    """
+    Per-process cache for the auth dependencies:
+    - verified JWT claims by token, kept until min(ttl, token exp)
+    - AuthUser records by user id, dropped when the User row is updated or
+      deleted through the ORM (see the mapper events below)
+
+    The TTL bounds staleness for changes made by other worker processes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self._claims = _TTLCache(max_entries)
+        self._users = _TTLCache(max_entries)
+        self._lock = threading.Lock()
+        self.stats = get_stats("auth_cache")
+
+    def claims(self, token: str, decode: Callable[[str], Optional[dict]]) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._claims.get(token, now)
+        if cached is not None:
+            self.stats.incr("claims_hits")
+            return cached
+
+        self.stats.incr("claims_misses")
+        payload = decode(token)
+        if payload is None:
+            return None
+
+        expires_at = now + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, now + (exp - time.time()))
+        with self._lock:
+            self._claims.put(token, payload, expires_at)
+        return payload
+
+    def user(self, user_id: int, load: Callable[[int], Optional[AuthUser]]) -> Optional[AuthUser]:
+        cached = self._cached_user(user_id)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        user = load(user_id)
+        return self._store_user(user_id, user, started)
+
+    async def user_async(
+        self, user_id: int, load: Callable[[int], Awaitable[Optional[AuthUser]]]
+    ) -> Optional[AuthUser]:
+        cached = self._cached_user(user_id)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        user = await load(user_id)
+        return self._store_user(user_id, user, started)
+
+    def _cached_user(self, user_id: int) -> Optional[AuthUser]:
+        with self._lock:
+            cached = self._users.get(user_id, time.monotonic())
+        if cached is not None:
+            self.stats.incr("hits")
+            self.stats.incr("db_lookups_saved")
+        else:
+            self.stats.incr("misses")
+        return cached
+
+    def _store_user(self, user_id: int, user: Optional[AuthUser], started: float) -> Optional[AuthUser]:
+        self.stats.observe(time.perf_counter() - started)
+        if user is not None:
+            with self._lock:
+                self._users.put(user_id, user, time.monotonic() + self.ttl_seconds)
+        return user
+
+    def token_only(self) -> None:
+        """Record a request served from token claims alone."""
+        self.stats.incr("token_only")
+        self.stats.incr("db_lookups_saved")
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._users.pop(user_id)
+        self.stats.incr("invalidations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._claims.clear()
+            self._users.clear()
+
+
+auth_cache = AuthCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_cached_user(mapper, connection, target: User) -> None:
+    auth_cache.invalidate_user(target.id)
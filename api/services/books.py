@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from api.models import Book
+from api.services.covers import COVER_PENDING, cover_enricher
+from api.services.feed_cache import feed_cache
+from api.services.timeline import fan_out_review, remove_review
+
+# A user's own library (the /books routes). Every lookup is scoped to the
+# owner, so another user's book id behaves like a missing one.
+
+
+def list_books(db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[Book]:
+    # the order idx_books_owner_created_id already returns; explicit so skip/limit pages are stable
+    return (
+        db.query(Book)
+        .filter(Book.owner_id == owner_id)
+        .order_by(Book.created_at, Book.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_book(db: Session, book_id: int, owner_id: int) -> Optional[Book]:
+    return db.query(Book).filter(Book.id == book_id, Book.owner_id == owner_id).first()
+
+
+def create_book(db: Session, owner_id: int, data: Dict[str, Any]) -> Book:
+    # cover is looked up in the background; the book is returned right away
+    db_book = Book(
+        title=data["title"],
+        author=data.get("author"),
+        genre=data.get("genre"),
+        cover_image_url=None,
+        cover_status=COVER_PENDING,
+        review_text=data.get("review_text"),
+        is_recommended=data.get("is_recommended"),
+        owner_id=owner_id,
+    )
+    db.add(db_book)
+    db.flush()
+    fan_out_review(db, db_book.id, owner_id, db_book.created_at)
+    db.commit()
+    db.refresh(db_book)
+
+    cover_enricher.submit(db_book.id, db_book.title, db_book.author)
+    # a new review can land on any cached feed page
+    feed_cache.invalidate_all()
+    return db_book
+
+
+def update_book(db: Session, book_id: int, owner_id: int, update_data: Dict[str, Any]) -> Optional[Book]:
+    db_book = get_book(db, book_id, owner_id)
+    if db_book is None:
+        return None
+
+    needs_cover = "cover_image_url" not in update_data and (
+        "title" in update_data or "author" in update_data
+    )
+    if needs_cover:
+        db_book.cover_image_url = None
+        db_book.cover_status = COVER_PENDING
+    elif "cover_image_url" in update_data:
+        # explicit cover wins over any lookup still in flight
+        db_book.cover_status = None
+
+    for key, value in update_data.items():
+        setattr(db_book, key, value)
+
+    db.commit()
+    db.refresh(db_book)
+    feed_cache.invalidate_book(db_book.id, fields=update_data.keys())
+
+    if needs_cover:
+        cover_enricher.submit(db_book.id, db_book.title, db_book.author)
+    return db_book
+
+
+def delete_book(db: Session, book_id: int, owner_id: int) -> bool:
+    book = get_book(db, book_id, owner_id)
+    if book is None:
+        return False
+
+    remove_review(db, book_id)
+    db.delete(book)
+    db.commit()
+    feed_cache.invalidate_book(book_id)
+    return True
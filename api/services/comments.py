@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from datetime import timezone
+from datetime import datetime, timezone
+from typing import Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import String, delete, exists, func, insert, select, tuple_, type_coerce, update
+from sqlalchemy.orm import Session, aliased
 
 from ..models import Book, Comment
 from ..auth_models import User
+from .counters import counter_buffer
+from .feed_cache import feed_cache
 
-# OUTDATED, not using for deployment
+# Only PUBLIC books whose owner's profile is PUBLIC (same rule as the feed).
+_is_public = exists().where(User.id == Book.owner_id)
 
 
-# Comments (service helpers)
+# Comments: the one service behind /comments and /feed/{id}/comments,
+# sync and ASYNC_DB routes alike
 
 def iso_utc(dt):
     if not dt:
@@ -22,84 +28,160 @@ def iso_utc(dt):
     return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def list_comments(db: Session, book_id: int) -> list[dict]:
+def _parse_comment_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
     """
-    Public: list comments for a book (oldest -> newest).
-    Returns [] if book doesn't exist or isn't public / owner profile isn't public.
+    "<created_at>|<id>"; raises ValueError on a malformed cursor.
+
+    The timestamp is bound as text in the format SQLite's CURRENT_TIMESTAMP
+    stores ("YYYY-MM-DD HH:MM:SS"), not as a DateTime param, which would
+    render with ".000000" and compare after an equal stored value.
     """
-    # enforce same public rules as feed
-    book = (
-        db.query(Book)
-        .join(User, Book.owner_id == User.id)
-        .filter(
-            Book.id == book_id
-        )
-        .first()
-    )
-    if not book:
-        return []
+    if not cursor:
+        return None
+    ts, id_str = cursor.split("|")
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    fmt = "%Y-%m-%d %H:%M:%S.%f" if dt.microsecond else "%Y-%m-%d %H:%M:%S"
+    return (dt.strftime(fmt), int(id_str))
+
+
+def _encode_comment_cursor(created_at: datetime, comment_id: int) -> str:
+    return f"{created_at.isoformat()}|{comment_id}"
+
+
+def comment_page(
+    db: Session,
+    book_id: int,
+    limit: int = 50,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    order: str = "asc",
+) -> Tuple[list, Optional[str]]:
+    """
+    One keyset page of a review's comments, walking idx_comments_review_created
+    (review_id, created_at, + rowid) in `order`.
 
-    rows = (
-        db.query(Comment, User)
+    after / before are exclusive (created_at, id) bounds and can be combined.
+    Returns (rows, next_cursor); next_cursor continues in the same order
+    (pass it as `after` for asc, `before` for desc) and is None on the last page.
+    Only comments on books with an existing owner are listed, as in the feed.
+    """
+    lower = _parse_comment_cursor(after)
+    upper = _parse_comment_cursor(before)
+    key = tuple_(Comment.created_at, Comment.id)
+
+    owner = aliased(User)
+    stmt = (
+        select(
+            Comment.id,
+            Comment.review_id,
+            Comment.body,
+            Comment.created_at,
+            User.id.label("user_id"),
+            User.username,
+        )
         .join(User, Comment.user_id == User.id)
-        .filter(Comment.review_id == book_id)
-        .order_by(Comment.created_at.asc(), Comment.id.asc())
-        .all()
+        .join(Book, Book.id == Comment.review_id)
+        .join(owner, Book.owner_id == owner.id)
+        .where(Comment.review_id == book_id)
     )
-
-    out: list[dict] = []
-    for c, u in rows:
-        out.append(
+    if lower:
+        stmt = stmt.where(key > tuple_(type_coerce(lower[0], String), lower[1]))
+    if upper:
+        stmt = stmt.where(key < tuple_(type_coerce(upper[0], String), upper[1]))
+    if order == "desc":
+        stmt = stmt.order_by(Comment.created_at.desc(), Comment.id.desc())
+    else:
+        stmt = stmt.order_by(Comment.created_at.asc(), Comment.id.asc())
+
+    # one extra row tells us whether there is a next page
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, _encode_comment_cursor(last.created_at, last.id)
+
+
+def list_comments(
+    db: Session,
+    book_id: int,
+    limit: int = 50,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    order: str = "asc",
+) -> dict:
+    """
+    Public: one page of comments for a book (oldest -> newest by default).
+    Returns {"items": [...], "next_cursor": ...}; items is empty if the book
+    doesn't exist. Raises ValueError on a malformed cursor.
+    """
+    rows, next_cursor = comment_page(db, book_id, limit, after, before, order)
+    return {
+        "items": [
             {
-                "id": c.id,
-                "review_id": c.review_id,
-                "user": {"id": u.id, "username": u.username},
-                "body": c.body,
-                "created_at": iso_utc(c.created_at),
+                "id": r.id,
+                "review_id": r.review_id,
+                "user": {"id": r.user_id, "username": r.username},
+                "body": r.body,
+                "created_at": iso_utc(r.created_at),
             }
-        )
-    return out
+            for r in rows
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
-def add_comment(db: Session, book_id: int, user_id: int, body: str) -> dict:
+def add_comment(db: Session, book_id: int, user, body: str) -> dict:
     """
-    Auth: add a comment to a PUBLIC book (and PUBLIC profile).
+    Auth: add a comment to a PUBLIC book (and PUBLIC profile) as `user`,
+    the already-authenticated caller (anything with .id and .username).
     Raises ValueError if the book isn't commentable.
-    """
-    # comment only on public things
-    book = (
-        db.query(Book)
-        .join(User, Book.owner_id == User.id)
-        .filter(
-            Book.id == book_id
-        )
-        .first()
-    )
-    if not book:
-        raise ValueError("book_not_commentable")
 
+    Two statements and a commit: the counter bump (or, with write-behind,
+    an existence read) doubles as the book check, and the insert RETURNs
+    the generated id and timestamp, so nothing is read back afterwards.
+    """
     body = (body or "").strip()
     if not body:
         raise ValueError("empty_body")
     if len(body) > 2000:
         raise ValueError("too_long")
+    # read before the commit expires an ORM user
+    author = {"id": user.id, "username": user.username}
+
+    if counter_buffer.enabled:
+        found = db.execute(select(Book.id).where(Book.id == book_id, _is_public)).scalar()
+    else:
+        found = db.execute(
+            update(Book)
+            .where(Book.id == book_id, _is_public)
+            .values(comment_count=Book.comment_count + 1)
+            .returning(Book.id)
+        ).scalar()
+    if found is None:
+        db.rollback()
+        raise ValueError("book_not_commentable")
 
-    c = Comment(review_id=book_id, user_id=user_id, body=body)
-    db.add(c)
-
-    if getattr(book, "comment_count", None) is not None:
-        book.comment_count = int(book.comment_count or 0) + 1
-
+    row = db.execute(
+        insert(Comment)
+        .values(review_id=book_id, user_id=author["id"], body=body)
+        .returning(Comment.id, Comment.created_at)
+    ).one()
     db.commit()
-    db.refresh(c)
 
-    u = db.query(User).filter(User.id == user_id).first()
+    if counter_buffer.enabled:
+        counter_buffer.add(book_id, comments=1)
+    else:
+        feed_cache.invalidate_book(book_id)
+
     return {
-        "id": c.id,
-        "review_id": c.review_id,
-        "user": {"id": u.id, "username": u.username if u else None},
-        "body": c.body,
-        "created_at": iso_utc(c.created_at),
+        "id": row.id,
+        "review_id": book_id,
+        "user": author,
+        "body": body,
+        "created_at": iso_utc(row.created_at),
     }
 
 
@@ -108,17 +190,33 @@ def delete_comment(db: Session, comment_id: int, user_id: int) -> bool:
     Auth: delete your own comment.
     Returns True if deleted, False if not found.
     Raises PermissionError if not the owner.
+
+    The owner check is part of the DELETE; only a miss costs an extra
+    read to tell "not found" from "not yours".
     """
-    c = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not c:
-        return False
-    if c.user_id != user_id:
+    review_id = db.execute(
+        delete(Comment)
+        .where(Comment.id == comment_id, Comment.user_id == user_id)
+        .returning(Comment.review_id)
+    ).scalar()
+
+    if review_id is None:
+        db.rollback()
+        exists_ = db.execute(select(Comment.id).where(Comment.id == comment_id)).scalar()
+        if exists_ is None:
+            return False
         raise PermissionError("not_owner")
 
-    book = db.query(Book).filter(Book.id == c.review_id).first()
-    if book and getattr(book, "comment_count", None) is not None:
-        book.comment_count = max(0, int(book.comment_count or 0) - 1)
-
-    db.delete(c)
+    if not counter_buffer.enabled:
+        db.execute(
+            update(Book)
+            .where(Book.id == review_id)
+            .values(comment_count=func.max(Book.comment_count - 1, 0))
+        )
     db.commit()
+
+    if counter_buffer.enabled:
+        counter_buffer.add(review_id, comments=-1)
+    else:
+        feed_cache.invalidate_book(review_id)
     return True
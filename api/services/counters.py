@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.database import SessionLocal
+from api.models import Book, Comment, Like
+from api.services.feed_cache import feed_cache
+from api.utils.metrics import get_stats
+
+_books = Book.__table__
+
+
+class CounterBuffer:
+    """
+    Optional write-behind for books.like_count / books.comment_count.
+
+    When enabled, like/comment writes keep their own rows durable right away
+    but only record the counter delta here; a background thread folds the
+    deltas into the books table with one batched UPDATE per interval, so a
+    viral review costs one row write per flush instead of one per like.
+
+    Reads add pending() on top of the stored counts. Deltas are per worker
+    process: other workers see them after the next flush.
+    """
+
+    def __init__(self, enabled: bool, flush_interval: float):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        # review_id -> [like_delta, comment_delta]
+        self._pending: Dict[int, List[int]] = {}
+        # deltas taken by a flush that hasn't committed yet; still visible to reads
+        self._flushing: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = get_stats("counter_buffer")
+
+    def add(self, review_id: int, likes: int = 0, comments: int = 0) -> None:
+        with self._lock:
+            delta = self._pending.setdefault(review_id, [0, 0])
+            delta[0] += likes
+            delta[1] += comments
+        self.stats.incr("buffered")
+
+    def pending(self, review_id: int) -> Tuple[int, int]:
+        return self.pending_many((review_id,)).get(review_id, (0, 0))
+
+    def pending_many(self, review_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+        out: Dict[int, Tuple[int, int]] = {}
+        with self._lock:
+            if not self._pending and not self._flushing:
+                return out
+            for rid in review_ids:
+                a = self._pending.get(rid)
+                b = self._flushing.get(rid)
+                if a or b:
+                    out[rid] = (
+                        (a[0] if a else 0) + (b[0] if b else 0),
+                        (a[1] if a else 0) + (b[1] if b else 0),
+                    )
+        return out
+
+    def apply_pending(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return feed-style item dicts with pending deltas added to their counts."""
+        deltas = self.pending_many(item["id"] for item in items)
+        if not deltas:
+            return items
+        out = []
+        for item in items:
+            delta = deltas.get(item["id"])
+            if delta:
+                item = {
+                    **item,
+                    "like_count": max(0, (item.get("like_count") or 0) + delta[0]),
+                    "comment_count": max(0, (item.get("comment_count") or 0) + delta[1]),
+                }
+            out.append(item)
+        return out
+
+    def flush(self) -> int:
+        """Write all pending deltas in one transaction. Returns the number of rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+
+            params = [
+                {"b_id": rid, "d_likes": d[0], "d_comments": d[1]}
+                for rid, d in batch.items()
+                if d[0] or d[1]
+            ]
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                if params:
+                    db.execute(
+                        update(_books)
+                        .where(_books.c.id == bindparam("b_id"))
+                        .values(
+                            like_count=func.max(_books.c.like_count + bindparam("d_likes"), 0),
+                            comment_count=func.max(_books.c.comment_count + bindparam("d_comments"), 0),
+                        ),
+                        params,
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                # put the deltas back so the next flush retries them
+                with self._lock:
+                    for rid, d in batch.items():
+                        cur = self._pending.setdefault(rid, [0, 0])
+                        cur[0] += d[0]
+                        cur[1] += d[1]
+                    self._flushing = {}
+                self.stats.incr("flush_errors")
+                raise
+            finally:
+                db.close()
+
+            with self._lock:
+                self._flushing = {}
+            self.stats.incr("flushes")
+            self.stats.incr("rows_flushed", len(params))
+            self.stats.observe(time.perf_counter() - started)
+
+        for rid in batch:
+            feed_cache.invalidate_book(rid)
+        return len(params)
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval * 2 + 5)
+        self._thread = None
+        self.flush()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Counter flush failed, will retry: {e}")
+
+
+counter_buffer = CounterBuffer(
+    enabled=settings.COUNTER_WRITE_BEHIND,
+    flush_interval=settings.COUNTER_FLUSH_INTERVAL_SECONDS,
+)
+
+
+def reconcile_counters(
+    db: Session,
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+    max_samples: int = 20,
+    write_behind_drained: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recompute books.like_count / books.comment_count from the likes and
+    comments tables and fix the rows that drifted.
+
+    Walks books in id order, chunk_size ids at a time. Each chunk is one
+    grouped count per table (served by idx_likes_review /
+    idx_comments_review_created) compared against the stored counts in
+    Python, then one UPDATE of only the drifted rows, committed on its own,
+    so the write lock is held for a chunk and never for the whole table.
+    The UPDATE recounts in-statement, so likes landing between the read and
+    the write aren't lost.
+
+    With COUNTER_WRITE_BEHIND on, the web workers hold deltas this process
+    can't see. Resetting a row to the true count and then having a worker
+    flush its delta on top would leave a permanent over-count. So this
+    refuses to write (RuntimeError) unless the caller passes
+    write_behind_drained=True, meaning every worker has been stopped and
+    has flushed, or has write-behind turned off. Deltas buffered in this
+    process are flushed first, and rows still pending here are skipped.
+    """
+    if settings.COUNTER_WRITE_BEHIND and not dry_run and not write_behind_drained:
+        raise RuntimeError(
+            "COUNTER_WRITE_BEHIND is on: stop or drain the web workers' counter buffers first"
+        )
+    counter_buffer.flush()
+
+    report: Dict[str, Any] = {
+        "scanned": 0,
+        "drifted": 0,
+        "fixed": 0,
+        "like_drift": 0,
+        "comment_drift": 0,
+        "skipped_pending": 0,
+        "samples": [],
+    }
+    true_likes = select(func.count()).where(Like.review_id == Book.id).scalar_subquery()
+    true_comments = select(func.count()).where(Comment.review_id == Book.id).scalar_subquery()
+
+    last_id: Optional[int] = 0
+    while last_id is not None:
+        rows = db.execute(
+            select(Book.id, Book.like_count, Book.comment_count)
+            .where(Book.id > last_id)
+            .order_by(Book.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        lo, hi = rows[0].id, rows[-1].id
+        last_id = hi if len(rows) == chunk_size else None
+
+        likes = dict(
+            db.execute(
+                select(Like.review_id, func.count())
+                .where(Like.review_id.between(lo, hi))
+                .group_by(Like.review_id)
+            ).all()
+        )
+        comments = dict(
+            db.execute(
+                select(Comment.review_id, func.count())
+                .where(Comment.review_id.between(lo, hi))
+                .group_by(Comment.review_id)
+            ).all()
+        )
+        db.commit()  # end the read transaction before taking the write lock
+
+        pending = counter_buffer.pending_many(r.id for r in rows)
+        drifted: List[int] = []
+        for r in rows:
+            like_count, comment_count = likes.get(r.id, 0), comments.get(r.id, 0)
+            if r.like_count == like_count and r.comment_count == comment_count:
+                continue
+            if r.id in pending:
+                report["skipped_pending"] += 1
+                continue
+            drifted.append(r.id)
+            report["like_drift"] += abs(r.like_count - like_count)
+            report["comment_drift"] += abs(r.comment_count - comment_count)
+            if len(report["samples"]) < max_samples:
+                report["samples"].append(
+                    {
+                        "id": r.id,
+                        "like_count": [r.like_count, like_count],
+                        "comment_count": [r.comment_count, comment_count],
+                    }
+                )
+
+        report["scanned"] += len(rows)
+        report["drifted"] += len(drifted)
+        if drifted and not dry_run:
+            result = db.execute(
+                update(Book)
+                .where(Book.id.in_(drifted))
+                .values(like_count=true_likes, comment_count=true_comments)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            report["fixed"] += result.rowcount
+            for rid in drifted:
+                feed_cache.invalidate_book(rid)
+
+    return report
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from api.config import settings
+from api.database import SessionLocal
+from api.models import CoverCacheEntry
+from api.utils.metrics import get_stats
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def _normalize(value: Optional[str]) -> str:
+    value = _NON_WORD.sub(" ", (value or "").casefold())
+    return _SPACES.sub(" ", value).strip()
+
+
+def cover_cache_key(title: str, author: Optional[str]) -> str:
+    raw = f"{_normalize(title)}|{_normalize(author)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CoverCache:
+    """
+    Two-tier cache for Open Library cover lookups.
+
+    - tier 1: in-process LRU (bounded, per worker)
+    - tier 2: the cover_cache table, shared and surviving restarts
+
+    "No cover found" is cached too (with a shorter TTL) so titles without a
+    cover stop hitting the remote search. Lookup errors are never cached.
+    Concurrent misses for the same key wait on a single remote load.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, negative_ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._memory: OrderedDict[str, Tuple[Optional[str], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+        self.stats = get_stats("cover_cache")
+
+    def lookup(
+        self,
+        title: str,
+        author: Optional[str],
+        loader: Callable[[str, str], Optional[str]],
+    ) -> Optional[str]:
+        """Return the cached cover for (title, author), calling loader on a miss."""
+        started = time.perf_counter()
+        key = cover_cache_key(title, author)
+        try:
+            found, cover_url = self._memory_get(key)
+            if found:
+                self.stats.incr("hits")
+                self.stats.incr("memory_hits")
+                return cover_url
+
+            found, cover_url = self._db_get(key)
+            if found:
+                self.stats.incr("hits")
+                self.stats.incr("db_hits")
+                return cover_url
+
+            with self._lock:
+                key_lock = self._inflight.setdefault(key, threading.Lock())
+            try:
+                with key_lock:
+                    # another thread may have loaded it while we waited
+                    found, cover_url = self._memory_get(key)
+                    if found:
+                        self.stats.incr("hits")
+                        self.stats.incr("coalesced_hits")
+                        return cover_url
+
+                    self.stats.incr("misses")
+                    cover_url = loader(title, author or "")
+                    self.store(key, cover_url)
+                    if cover_url is None:
+                        self.stats.incr("negative_stores")
+                    return cover_url
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is key_lock:
+                        del self._inflight[key]
+        finally:
+            self.stats.observe(time.perf_counter() - started)
+
+    def store(self, key: str, cover_url: Optional[str]) -> None:
+        ttl = self.ttl_seconds if cover_url else self.negative_ttl_seconds
+        self._memory_put(key, cover_url, time.time() + ttl)
+
+        db = SessionLocal()
+        try:
+            stmt = sqlite_insert(CoverCacheEntry).values(
+                lookup_key=key,
+                cover_url=cover_url,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CoverCacheEntry.lookup_key],
+                set_={"cover_url": stmt.excluded.cover_url, "expires_at": stmt.excluded.expires_at},
+            )
+            db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+
+    def prune_expired(self) -> int:
+        """Bulk-delete expired rows from the DB tier."""
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                delete(CoverCacheEntry).where(CoverCacheEntry.expires_at <= datetime.utcnow())
+            )
+            db.commit()
+            return result.rowcount or 0
+        finally:
+            db.close()
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def _memory_get(self, key: str) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return False, None
+            cover_url, expires_at = entry
+            if expires_at <= time.time():
+                del self._memory[key]
+                return False, None
+            self._memory.move_to_end(key)
+            return True, cover_url
+
+    def _memory_put(self, key: str, cover_url: Optional[str], expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (cover_url, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _db_get(self, key: str) -> Tuple[bool, Optional[str]]:
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(CoverCacheEntry.cover_url, CoverCacheEntry.expires_at)
+                .filter(CoverCacheEntry.lookup_key == key)
+                .first()
+            )
+        finally:
+            db.close()
+
+        if row is None or row.expires_at <= datetime.utcnow():
+            return False, None
+
+        # promote into the memory tier with the remaining DB lifetime
+        remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+        self._memory_put(key, row.cover_url, time.time() + remaining)
+        return True, row.cover_url
+
+
+cover_cache = CoverCache(
+    max_entries=settings.COVER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COVER_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.COVER_CACHE_NEGATIVE_TTL_SECONDS,
+)
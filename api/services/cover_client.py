@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.config import settings
+from api.utils.metrics import get_stats
+
+
+class CoverClientError(requests.exceptions.RequestException):
+    """Raised without touching the network (breaker open / client saturated)."""
+
+
+class CircuitOpenError(CoverClientError):
+    pass
+
+
+class ClientSaturatedError(CoverClientError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures,
+    open -> half-open after `reset_timeout` seconds (one trial call),
+    half-open -> closed on success / back to open on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # half-open: let exactly one trial call through
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot that never reached the upstream."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                was_open = self.state == self.OPEN
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                return not was_open
+            return False
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class OpenLibraryClient:
+    """
+    Shared HTTP client for Open Library cover lookups:
+    - one keep-alive requests.Session with a bounded connection pool
+    - a global cap on in-flight calls plus a token-bucket rate limit
+    - a circuit breaker so an unhealthy upstream fails fast
+    """
+
+    def __init__(
+        self,
+        search_url: str,
+        covers_url: str,
+        timeout: float,
+        max_concurrency: int,
+        rate_per_second: float,
+        breaker: CircuitBreaker,
+    ):
+        self.search_url = search_url
+        self.covers_url = covers_url
+        self.timeout = timeout
+        self.breaker = breaker
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._bucket = TokenBucket(rate_per_second, burst=max(1, max_concurrency))
+        self.stats = get_stats("openlibrary")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, max_concurrency), max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def search_cover(self, title: str, author: str) -> Optional[str]:
+        """
+        Returns the cover URL, or None when the search has no cover.
+        Raises requests exceptions (incl. CoverClientError) on failure.
+        """
+        if not self.breaker.allow():
+            self.stats.incr("circuit_rejected")
+            raise CircuitOpenError("Open Library circuit is open")
+
+        if not self._slots.acquire(timeout=self.timeout):
+            self.breaker.release_trial()
+            self.stats.incr("saturated")
+            raise ClientSaturatedError("Open Library client is saturated")
+        try:
+            if not self._bucket.acquire(timeout=self.timeout):
+                self.breaker.release_trial()
+                self.stats.incr("rate_limited")
+                raise ClientSaturatedError("Open Library rate limit exceeded")
+            return self._search(title, author)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _search(self, title: str, author: str) -> Optional[str]:
+        query = f"title: ({title}) AND author:({author})" if author else f"title:({title})"
+
+        started = time.perf_counter()
+        self.stats.incr("requests")
+        try:
+            response = self.session.get(
+                self.search_url,
+                params={"q": query, "limit": 1},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            self.stats.incr("errors")
+            if not _is_upstream_failure(e):
+                self.breaker.record_success()
+            elif self.breaker.record_failure():
+                self.stats.incr("circuit_opened")
+            raise
+        finally:
+            self.stats.observe(time.perf_counter() - started)
+
+        self.breaker.record_success()
+        if data.get("numFound", 0) > 0 and data.get("docs"):
+            cover_id = data["docs"][0].get("cover_i")
+            if cover_id:
+                return f"{self.covers_url}/{cover_id}-M.jpg"
+        return None
+
+
+def _is_upstream_failure(e: requests.exceptions.RequestException) -> bool:
+    """Timeouts, connection errors, 5xx and 429 count against the breaker; other 4xx don't."""
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return e.response.status_code >= 500 or e.response.status_code == 429
+    return True
+
+
+cover_client = OpenLibraryClient(
+    search_url=settings.OPENLIBRARY_SEARCH_URL,
+    covers_url=settings.OPENLIBRARY_COVERS_URL,
+    timeout=settings.COVER_LOOKUP_TIMEOUT_SECONDS,
+    max_concurrency=settings.COVER_MAX_CONCURRENCY,
+    rate_per_second=settings.COVER_RATE_PER_SECOND,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.COVER_BREAKER_FAILURES,
+        reset_timeout=settings.COVER_BREAKER_RESET_SECONDS,
+    ),
+)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import requests
+from sqlalchemy import update
+
+from api.config import settings
+from api.database import SessionLocal
+from api.models import Book
+from api.services.cover_cache import cover_cache
+from api.services.cover_client import cover_client
+from api.services.feed_cache import feed_cache
+
+COVER_PENDING = "pending"
+COVER_FOUND = "found"
+COVER_MISSING = "missing"
+COVER_FAILED = "failed"
+
+
+class CoverEnricher:
+    """
+    Background pipeline that fills in Book.cover_image_url after the book
+    has been saved. Lookups run on a small thread pool (bounded concurrency)
+    and are retried with exponential backoff on transport errors.
+    """
+
+    def __init__(self, max_workers: int, max_attempts: int, backoff_seconds: float):
+        self.max_workers = max_workers
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="cover-enricher"
+                )
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def submit(self, book_id: int, title: str, author: Optional[str]):
+        self.start()
+        return self._executor.submit(self._run, book_id, title, author)
+
+    def enqueue_pending(self, limit: int = 500) -> int:
+        """Re-queue books left pending (or failed) by a previous process, e.g. after a restart."""
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Book.id, Book.title, Book.author)
+                .filter(Book.cover_status.in_((COVER_PENDING, COVER_FAILED)))
+                .order_by(Book.id)
+                .limit(limit)
+                .all()
+            )
+        finally:
+            db.close()
+
+        for book_id, title, author in rows:
+            self.submit(book_id, title, author)
+        return len(rows)
+
+    def _run(self, book_id: int, title: str, author: Optional[str]) -> Optional[str]:
+        # runs in a Future nobody reads: every error is logged here, and the
+        # book ends up failed rather than pending until the next restart
+        try:
+            cover_url, status = self._lookup(book_id, title, author)
+        except Exception as e:
+            print(f"Cover lookup for book {book_id} failed: {e!r}")
+            cover_url, status = None, COVER_FAILED
+
+        try:
+            self._store(book_id, title, author, cover_url, status)
+            return cover_url
+        except Exception as e:
+            print(f"Storing the cover for book {book_id} failed: {e!r}")
+
+        if status != COVER_FAILED:
+            try:
+                self._store(book_id, title, author, None, COVER_FAILED)
+            except Exception as e:
+                print(f"Marking the cover of book {book_id} failed did not work either: {e!r}")
+        return None
+
+    def _lookup(self, book_id: int, title: str, author: Optional[str]) -> Tuple[Optional[str], str]:
+        """(cover_url, status), retrying transport errors with backoff."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                cover_url = cover_cache.lookup(title, author, cover_client.search_cover)
+                return cover_url, COVER_FOUND if cover_url else COVER_MISSING
+            except requests.exceptions.RequestException as e:
+                print(f"Cover lookup for book {book_id} failed (attempt {attempt}/{self.max_attempts}): {e}")
+                if attempt < self.max_attempts:
+                    time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+        return None, COVER_FAILED
+
+    def _store(
+        self,
+        book_id: int,
+        title: str,
+        author: Optional[str],
+        cover_url: Optional[str],
+        status: str,
+    ) -> None:
+        # only touch the row if it still describes the book we looked up;
+        # an edit in the meantime re-queues its own lookup
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(Book)
+                .where(
+                    Book.id == book_id,
+                    Book.cover_status.in_((COVER_PENDING, COVER_FAILED)),
+                    Book.title == title,
+                    Book.author.is_not_distinct_from(author),
+                )
+                .values(cover_image_url=cover_url, cover_status=status)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        if result.rowcount:
+            feed_cache.invalidate_book(book_id)
+
+
+cover_enricher = CoverEnricher(
+    max_workers=settings.COVER_WORKERS,
+    max_attempts=settings.COVER_MAX_ATTEMPTS,
+    backoff_seconds=settings.COVER_RETRY_BACKOFF_SECONDS,
+)
@@ -3,31 +3,228 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict, Any
 
-from sqlalchemy import and_, desc, asc, func
+from sqlalchemy import desc, asc, func, select, tuple_
 from sqlalchemy.orm import Session
 
-from api.models import Book, Like, Comment
+from api.models import Book, Like
 from api.auth_models import User
+from api.services.counters import counter_buffer
+from api.services.feed_cache import FeedPageKey, feed_cache
+from api.services.likes import add_like, remove_like
 
 
-def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+# review_type sort order (asc, same as the old NULLs-first is_recommended
+# order); a review_type cursor stores the position of its group in this tuple
+_REVIEW_TYPE_GROUPS: Tuple[str, ...] = ("NEUTRAL", "NOT_RECOMMENDED", "RECOMMENDED")
+_REVIEW_TYPE_FILTERS = {name: group for group, name in enumerate(_REVIEW_TYPE_GROUPS)}
+
+
+def _parse_cursor(cursor: Optional[str], sort: str = "newest") -> Optional[tuple]:
+    """
+    Cursor formats per sort mode:
+      newest / oldest:  "<created_at>|<id>"
+      review_length:    "<review_length>|<id>"
+      review_type:      "<group>|<created_at>|<id>"
+    Raises ValueError on a malformed cursor.
+    """
     if not cursor:
         return None
-    ts, id_str = cursor.split("|", 1)
+    parts = cursor.split("|")
+    if sort == "review_length":
+        length, id_str = parts
+        return (int(length), int(id_str))
+    if sort == "review_type":
+        group, ts, id_str = parts
+        if not 0 <= int(group) < len(_REVIEW_TYPE_GROUPS):
+            raise ValueError("bad review_type cursor")
+        return (int(group), datetime.fromisoformat(ts), int(id_str))
+    ts, id_str = parts
     return (datetime.fromisoformat(ts), int(id_str))
 
 
-def _encode_cursor(dt: datetime, rid: int) -> str:
-    return f"{dt.isoformat()}|{rid}"
+def _encode_cursor(*parts) -> str:
+    return "|".join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+
+
+def _next_cursor(sort: str, last) -> Optional[str]:
+    if sort == "review_length":
+        return _encode_cursor(last.review_length, last.id)
+    if not last.created_at:
+        return None
+    if sort == "review_type":
+        return _encode_cursor(_REVIEW_TYPE_GROUPS.index(last.review_type), last.created_at, last.id)
+    return _encode_cursor(last.created_at, last.id)
+
+
+PREVIEW_CHARS = 280
+
+
+def _review_type_label(review_type: Optional[str]) -> Optional[str]:
+    # neutral reviews have always gone out as null
+    return None if review_type == "NEUTRAL" else review_type
+
+
+def _feed_columns(user_id: Optional[int], full_body: bool) -> list:
+    """
+    Only the columns a feed card needs, with the owner flattened in, so a
+    page is a single SELECT with no ORM hydration or lazy owner loads.
+    """
+    body = (
+        Book.review_text.label("body")
+        if full_body
+        # one extra char tells us whether the preview was truncated
+        else func.substr(Book.review_text, 1, PREVIEW_CHARS + 1).label("body")
+    )
+    cols = [
+        Book.id,
+        Book.title,
+        Book.author,
+        Book.genre,
+        Book.cover_image_url,
+        body,
+        Book.review_type,
+        Book.review_length,
+        Book.review_date,
+        Book.created_at,
+        Book.like_count,
+        Book.comment_count,
+        User.id.label("owner_id"),
+        User.username.label("owner_username"),
+    ]
+    if user_id is not None:
+        liked = (
+            select(Like.review_id)
+            .where(Like.user_id == user_id, Like.review_id == Book.id)
+            .exists()
+        )
+        cols.append(liked.label("liked_by_me"))
+    return cols
+
+
+def _feed_row_to_dict(row, full_body: bool) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "id": row.id,
+        "book": {
+            "id": row.id,
+            "title": row.title,
+            "author": row.author,
+            "genre": row.genre,
+            "cover_image_url": row.cover_image_url,
+        },
+        "author": {
+            "id": row.owner_id,
+            "username": row.owner_username,
+        },
+    }
+    if full_body:
+        out["body"] = row.body
+    else:
+        out["body_preview"] = (
+            row.body[:PREVIEW_CHARS] + "..."
+            if row.body and len(row.body) > PREVIEW_CHARS
+            else row.body
+        )
+    out.update(
+        {
+            "review_type": _review_type_label(row.review_type),
+            "review_date": row.review_date.isoformat() if row.review_date else None,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "like_count": row.like_count or 0,
+            "comment_count": row.comment_count or 0,
+            "liked_by_me": bool(getattr(row, "liked_by_me", False)),
+        }
+    )
+    return out
+
+
+def _review_type_group_filter(group: int):
+    return Book.review_type == _REVIEW_TYPE_GROUPS[group]
 
 
-def _review_type_label(b: Book) -> Optional[str]:
-    val = getattr(b, "is_recommended", None)
-    if val is True:
-        return "RECOMMENDED"
-    if val is False:
-        return "NOT_RECOMMENDED"
-    return None
+def _review_type_page(db: Session, q, cursor: Optional[tuple], page_size: int, review_type: Optional[str]):
+    """
+    review_type sort = (review_type asc, created_at desc, id desc).
+    Each group is read with its own index range scan on
+    idx_books_review_type_created_id, continuing into the next group(s)
+    only if the page isn't full, so deep pages cost the same as the first.
+    """
+    first_group = cursor[0] if cursor else 0
+    groups = range(first_group, len(_REVIEW_TYPE_GROUPS))
+    if review_type:
+        groups = [g for g in groups if g == _REVIEW_TYPE_FILTERS.get(review_type, 0)]
+
+    rows: list = []
+    for group in groups:
+        gq = q.where(_review_type_group_filter(group))
+        if cursor and group == cursor[0]:
+            gq = gq.where(tuple_(Book.created_at, Book.id) < (cursor[1], cursor[2]))
+        gq = gq.order_by(desc(Book.created_at), desc(Book.id)).limit(page_size - len(rows))
+        rows.extend(db.execute(gq).all())
+        if len(rows) >= page_size:
+            break
+    return rows
+
+
+def _load_feed_page(
+    db: Session,
+    sort: str,
+    genre: Optional[str],
+    review_type: Optional[str],
+    page_size: int,
+    cursor: Optional[tuple],
+) -> Dict[str, Any]:
+    """Anonymous (shareable) page: liked_by_me is always False here."""
+    q = select(*_feed_columns(None, full_body=False)).join(User, Book.owner_id == User.id)
+
+    if genre:
+        # every sort has a (genre, <sort key>, id) index; see models.Book
+        q = q.where(Book.genre == genre)
+
+    if review_type:
+        q = q.where(_review_type_group_filter(_REVIEW_TYPE_FILTERS.get(review_type, 0)))
+
+    if sort == "review_type":
+        rows = _review_type_page(db, q, cursor, page_size, review_type)
+    else:
+        if sort == "oldest":
+            order_cols = (asc(Book.created_at), asc(Book.id))
+            if cursor:
+                q = q.where(tuple_(Book.created_at, Book.id) > cursor)
+        elif sort == "review_length":
+            order_cols = (desc(Book.review_length), desc(Book.id))
+            if cursor:
+                q = q.where(tuple_(Book.review_length, Book.id) < cursor)
+        else:
+            order_cols = (desc(Book.created_at), desc(Book.id))
+            if cursor:
+                q = q.where(tuple_(Book.created_at, Book.id) < cursor)
+
+        rows = db.execute(q.order_by(*order_cols).limit(page_size)).all()
+
+    next_cursor = _next_cursor(sort, rows[-1]) if rows else None
+
+    return {
+        "items": [_feed_row_to_dict(r, full_body=False) for r in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def _normalize_genre(genre: Optional[str]) -> Optional[str]:
+    """
+    One spelling per genre filter, so "SciFi", "scifi" and " scifi " share a
+    cache entry. Folds ASCII case only, like the column's NOCASE collation.
+    """
+    genre = (genre or "").strip()
+    return "".join(c.lower() if c.isascii() else c for c in genre) or None
+
+
+def _liked_ids(db: Session, user_id: int, ids: List[int]) -> set[int]:
+    if not ids:
+        return set()
+    rows = db.execute(
+        select(Like.review_id).where(Like.user_id == user_id, Like.review_id.in_(ids))
+    ).all()
+    return {rid for (rid,) in rows}
 
 
 def get_public_feed(
@@ -38,96 +235,37 @@ def get_public_feed(
     limit: int = 20,
     after: Optional[str] = None,
     user_id: Optional[int] = None,
+    coalesce: bool = True,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
-    print("DEBUG user_id =", user_id)
-    cursor = _parse_cursor(after)
-
-    q = db.query(Book).join(User, Book.owner_id == User.id)
+    # parse first so a malformed cursor never reaches the cache
+    cursor = _parse_cursor(after, sort)
+    page_size = min(limit, 50)
+    genre = _normalize_genre(genre)
+
+    if use_cache:
+        key = FeedPageKey(sort, genre, review_type, after, page_size)
+        page = feed_cache.get_or_load(
+            key,
+            lambda: _load_feed_page(db, sort, genre, review_type, page_size, cursor),
+            coalesce=coalesce,
+        )
+    else:
+        # a reader who must see their own writes; cached pages may predate them
+        page = _load_feed_page(db, sort, genre, review_type, page_size, cursor)
 
-    if genre and hasattr(Book, "genre"):
-        q = q.filter(getattr(Book, "genre") == genre)
+    # counters buffered by write-behind aren't in the stored (or cached) page yet
+    items = counter_buffer.apply_pending(page["items"])
 
-    if review_type:
-        is_rec = getattr(Book, "is_recommended", None)
-        if review_type == "RECOMMENDED":
-            q = q.filter(is_rec == True)
-        elif review_type == "NOT_RECOMMENDED":
-            q = q.filter(is_rec == False)
-        else:
-            q = q.filter(is_rec == None)
-
-    if sort == "oldest":
-        order_cols = (asc(Book.created_at), asc(Book.id))
-        if cursor:
-            q = q.filter(
-                (Book.created_at > cursor[0])
-                | and_(Book.created_at == cursor[0], Book.id > cursor[1])
-            )
-    elif sort == "review_length":
-        order_cols = (desc(func.length(Book.review_text)), desc(Book.id))
-        cursor = None
-    elif sort == "review_type":
-        cursor = None
-        is_rec = getattr(Book, "is_recommended", None)
-        order_cols = (asc(is_rec), desc(Book.created_at), desc(Book.id))
-    else:
-        order_cols = (desc(Book.created_at), desc(Book.id))
-        if cursor:
-            q = q.filter(
-                (Book.created_at < cursor[0])
-                | and_(Book.created_at == cursor[0], Book.id < cursor[1])
-            )
-
-    q = q.order_by(*order_cols).limit(min(limit, 50))
-    items: List[Book] = q.all()
-
-    next_cursor = None
-    if items and sort in ("newest", "oldest"):
-        last = items[-1]
-        if last.created_at:
-            next_cursor = _encode_cursor(last.created_at, last.id)
-
-    liked_ids: set[int] = set()
-    if user_id is not None and items:
-        ids = [b.id for b in items]
-        liked_rows = (
-            db.query(Like.review_id)
-            .filter(Like.user_id == user_id, Like.review_id.in_(ids))
-            .all()
-        )
-        liked_ids = {rid for (rid,) in liked_rows}
-
-    out: List[Dict[str, Any]] = []
-    for b in items:
-        out.append(
-            {
-                "id": b.id,
-                "book": {
-                    "id": b.id,
-                    "title": b.title,
-                    "author": b.author,
-                    "genre": getattr(b, "genre", None),
-                    "cover_image_url": getattr(b, "cover_image_url", None),
-                },
-                "author": {
-                    "id": b.owner.id if b.owner else None,
-                    "username": b.owner.username if b.owner else None,
-                },
-                "body_preview": (
-                    b.review_text[:280] + "..."
-                    if b.review_text and len(b.review_text) > 280
-                    else b.review_text
-                ),
-                "review_type": _review_type_label(b),
-                "review_date": b.review_date.isoformat() if b.review_date else None,
-                "created_at": b.created_at.isoformat() if b.created_at else None,
-                "like_count": b.like_count or 0,
-                "comment_count": b.comment_count or 0,
-                "liked_by_me": (b.id in liked_ids) if user_id is not None else False,
-            }
-        )
+    if user_id is None:
+        return {"items": items, "next_cursor": page["next_cursor"]}
 
-    return {"items": out, "next_cursor": next_cursor}
+    # overlay per-user state on the shared page instead of caching per user
+    liked = _liked_ids(db, user_id, [item["id"] for item in items])
+    return {
+        "items": [{**item, "liked_by_me": item["id"] in liked} for item in items],
+        "next_cursor": page["next_cursor"],
+    }
 
 
 def get_public_feed_item(
@@ -135,56 +273,55 @@ def get_public_feed_item(
     book_id: int,
     user_id: Optional[int] = None,
 ) -> Optional[Dict[str, Any]]:
-    book = (
-        db.query(Book)
+    row = db.execute(
+        select(*_feed_columns(user_id, full_body=True))
         .join(User, Book.owner_id == User.id)
-        .filter(Book.id == book_id)
-        .first()
-    )
-    if not book:
+        .where(Book.id == book_id)
+    ).first()
+    if row is None:
         return None
+    return counter_buffer.apply_pending([_feed_row_to_dict(row, full_body=True)])[0]
 
-    owner = book.owner
 
-    liked = False
-    if user_id is not None:
-        liked = (
-            db.query(Like)
-            .filter(Like.user_id == user_id, Like.review_id == book_id)
-            .first()
-            is not None
-        )
+MAX_ENGAGEMENT_IDS = 200
 
-    return {
-        "id": book.id,
-        "book": {
-            "id": book.id,
-            "title": book.title,
-            "author": book.author,
-            "genre": getattr(book, "genre", None),
-            "cover_image_url": book.cover_image_url,
-        },
-        "author": {
-            "id": owner.id if owner else None,
-            "username": owner.username if owner else None,
-        },
-        "body": book.review_text,
-        "review_type": _review_type_label(book),
-        "review_date": book.review_date.isoformat() if book.review_date else None,
-        "like_count": book.like_count or 0,
-        "comment_count": book.comment_count or 0,
-        "created_at": book.created_at.isoformat() if book.created_at else None,
-        "liked_by_me": liked if user_id is not None else False,
-    }
 
+def get_engagement(
+    db: Session,
+    ids: List[int],
+    user_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    like_count / comment_count / liked_by_me for many reviews at once, in
+    the order asked for; unknown or non-public ids are left out.
+    One primary-key IN query on books, plus one on likes when signed in.
+    Raises ValueError("too_many_ids") past MAX_ENGAGEMENT_IDS.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_ENGAGEMENT_IDS:
+        raise ValueError("too_many_ids")
+    if not ids:
+        return []
 
-def _get_public_book_for_engagement(db: Session, book_id: int) -> Optional[Book]:
-    return (
-        db.query(Book)
+    rows = db.execute(
+        select(Book.id, Book.like_count, Book.comment_count)
         .join(User, Book.owner_id == User.id)
-        .filter(Book.id == book_id)
-        .first()
-    )
+        .where(Book.id.in_(ids))
+    ).all()
+    by_id = {r.id: r for r in rows}
+    liked = _liked_ids(db, user_id, list(by_id)) if user_id else set()
+
+    items = [
+        {
+            "id": i,
+            "like_count": by_id[i].like_count or 0,
+            "comment_count": by_id[i].comment_count or 0,
+            "liked_by_me": i in liked,
+        }
+        for i in ids
+        if i in by_id
+    ]
+    return counter_buffer.apply_pending(items)
 
 
 def has_liked(db: Session, user_id: int, book_id: int) -> bool:
@@ -197,105 +334,8 @@ def has_liked(db: Session, user_id: int, book_id: int) -> bool:
 
 
 def set_like(db: Session, user_id: int, book_id: int) -> int:
-    book = _get_public_book_for_engagement(db, book_id)
-    if not book:
-        raise ValueError("Post not found")
-
-    existing = (
-        db.query(Like)
-        .filter(Like.user_id == user_id, Like.review_id == book_id)
-        .first()
-    )
-    if existing:
-        return book.like_count or 0
-
-    db.add(Like(user_id=user_id, review_id=book_id))
-    book.like_count = (book.like_count or 0) + 1
-    db.commit()
-    db.refresh(book)
-    return book.like_count or 0
+    return add_like(db, book_id=book_id, user_id=user_id)
 
 
 def unset_like(db: Session, user_id: int, book_id: int) -> int:
-    book = _get_public_book_for_engagement(db, book_id)
-    if not book:
-        raise ValueError("Post not found")
-
-    existing = (
-        db.query(Like)
-        .filter(Like.user_id == user_id, Like.review_id == book_id)
-        .first()
-    )
-    if not existing:
-        return book.like_count or 0
-
-    db.delete(existing)
-    book.like_count = max(0, (book.like_count or 0) - 1)
-    db.commit()
-    db.refresh(book)
-    return book.like_count or 0
-
-
-def list_comments(db: Session, book_id: int) -> list[dict]:
-    book = (
-        db.query(Book)
-        .join(User, Book.owner_id == User.id)
-        .filter(Book.id == book_id)
-        .first()
-    )
-    if not book:
-        return []
-
-    rows = (
-        db.query(Comment, User)
-        .join(User, Comment.user_id == User.id)
-        .filter(Comment.review_id == book_id)
-        .order_by(Comment.created_at.asc(), Comment.id.asc())
-        .all()
-    )
-
-    out: list[dict] = []
-    for c, u in rows:
-        out.append(
-            {
-                "id": c.id,
-                "book_id": c.review_id,
-                "user": {"id": u.id, "username": u.username},
-                "body": c.body,
-                "created_at": c.created_at.isoformat() if c.created_at else None,
-            }
-        )
-    return out
-
-
-def add_comment(db: Session, user_id: int, book_id: int, body: str) -> dict:
-    body = (body or "").strip()
-    if not body:
-        raise ValueError("Empty comment")
-
-    book = (
-        db.query(Book)
-        .join(User, Book.owner_id == User.id)
-        .filter(Book.id == book_id)
-        .first()
-    )
-    if not book:
-        raise ValueError("Post not found")
-
-    c = Comment(review_id=book_id, user_id=user_id, body=body)
-    db.add(c)
-
-    book.comment_count = (book.comment_count or 0) + 1
-
-    db.commit()
-    db.refresh(c)
-
-    u = db.query(User).filter(User.id == user_id).first()
-
-    return {
-        "id": c.id,
-        "book_id": c.review_id,
-        "user": {"id": u.id if u else user_id, "username": u.username if u else None},
-        "body": c.body,
-        "created_at": c.created_at.isoformat() if c.created_at else None,
-    }
+    return remove_like(db, book_id=book_id, user_id=user_id)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from api.config import settings
+from api.utils.metrics import get_stats
+
+
+class FeedPageKey(NamedTuple):
+    sort: str
+    genre: Optional[str]
+    review_type: Optional[str]
+    after: Optional[str]
+    limit: int
+
+
+# which cached pages a change to a given column can reorder / refilter,
+# beyond the pages that already contain the book
+_FIELD_AFFECTS: Dict[str, Callable[[FeedPageKey], bool]] = {
+    "review_text": lambda k: k.sort == "review_length",
+    "review_type": lambda k: k.sort == "review_type" or k.review_type is not None,
+    # the API field; Book writes it through to review_type
+    "is_recommended": lambda k: k.sort == "review_type" or k.review_type is not None,
+    "genre": lambda k: k.genre is not None,
+}
+
+
+@dataclass
+class _Entry:
+    page: Dict[str, Any]
+    expires_at: float
+    book_ids: frozenset
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    page: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+
+class FeedPageCache:
+    """
+    Per-process cache of rendered anonymous feed pages.
+
+    - concurrent misses for the same key collapse into one load (single-flight)
+    - like/comment/edit/delete of a book drops exactly the pages that contain it
+      (plus pages whose order/filter depends on a changed column)
+    - creating a book drops everything, since it can land on any page
+    - a TTL bounds staleness across worker processes
+
+    Pages are stored with liked_by_me=False; callers overlay per-user state.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict[FeedPageKey, _Entry] = OrderedDict()
+        self._by_book: Dict[int, set] = {}
+        self._inflight: Dict[FeedPageKey, _Flight] = {}
+        # bumped on every invalidation; a load that overlaps one isn't stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = get_stats("feed_cache")
+
+    def get_or_load(
+        self,
+        key: FeedPageKey,
+        loader: Callable[[], Dict[str, Any]],
+        coalesce: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        coalesce=False skips waiting on another caller's in-flight load and
+        loads independently; the async stack needs that, since a blocking
+        wait on the event loop would stall the load it's waiting for.
+        """
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.incr("hits")
+                return entry.page
+            if entry is not None:
+                self._drop(key)
+
+            flight = self._inflight.get(key) if coalesce else None
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                if coalesce:
+                    self._inflight[key] = flight
+            generation = self._generation
+
+        if not leader:
+            self.stats.incr("hits")
+            self.stats.incr("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.page
+
+        self.stats.incr("misses")
+        started = time.perf_counter()
+        try:
+            page = loader()
+            flight.page = page
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self.stats.observe(time.perf_counter() - started)
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                if flight.error is None and generation == self._generation:
+                    self._store(key, flight.page)
+            flight.done.set()
+        return page
+
+    def invalidate_book(self, book_id: int, fields: Iterable[str] = ()) -> None:
+        checks = [_FIELD_AFFECTS[f] for f in fields if f in _FIELD_AFFECTS]
+        with self._lock:
+            self._generation += 1
+            keys = set(self._by_book.get(book_id, ()))
+            if checks:
+                keys.update(k for k in self._entries if any(check(k) for check in checks))
+            for key in keys:
+                self._drop(key)
+        self.stats.incr("invalidations")
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_book.clear()
+        self.stats.incr("invalidations")
+
+    def _store(self, key: FeedPageKey, page: Dict[str, Any]) -> None:
+        if key in self._entries:
+            self._drop(key)
+        ids = frozenset(item["id"] for item in page.get("items", ()))
+        self._entries[key] = _Entry(page, time.monotonic() + self.ttl_seconds, ids)
+        for book_id in ids:
+            self._by_book.setdefault(book_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: FeedPageKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for book_id in entry.book_ids:
+            keys = self._by_book.get(book_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_book[book_id]
+
+
+feed_cache = FeedPageCache(
+    ttl_seconds=settings.FEED_CACHE_TTL_SECONDS,
+    max_entries=settings.FEED_CACHE_MAX_ENTRIES,
+    enabled=settings.FEED_CACHE_ENABLED,
+)
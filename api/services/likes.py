@@ -1,52 +1,96 @@
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from api.models import Book, Like
 from api.auth_models import User
+from api.services.counters import counter_buffer
+from api.services.feed_cache import feed_cache
 
+# Only PUBLIC books whose owner's profile is PUBLIC (same rule as the feed).
+_is_public = exists().where(User.id == Book.owner_id)
 
-def _get_public_book_or_none(db: Session, book_id: int) -> Book | None:
+
+def _apply_like_delta(db: Session, book_id: int, delta: int) -> int:
     """
-    Only allow liking PUBLIC books whose owner's profile is PUBLIC
-    (same rule as your public feed).
+    like_count = like_count + delta, in the database, returning the new value.
+    With write-behind enabled (or delta == 0) the row is only read; the
+    caller buffers the delta after commit. Rolls back and raises ValueError
+    if the book doesn't exist.
     """
-    return (
-        db.query(Book)
-        .join(User, Book.owner_id == User.id)
-        .filter(
-            Book.id == book_id
-        )
-        .first()
-    )
+    if delta and not counter_buffer.enabled:
+        new_count = func.max(Book.like_count + delta, 0) if delta < 0 else Book.like_count + delta
+        count = db.execute(
+            update(Book)
+            .where(Book.id == book_id, _is_public)
+            .values(like_count=new_count)
+            .returning(Book.like_count)
+        ).scalar()
+    else:
+        count = db.execute(
+            select(Book.like_count).where(Book.id == book_id, _is_public)
+        ).scalar()
 
+    if count is None:
+        db.rollback()
+        raise ValueError("Post not found")
+    return count
 
-def toggle_like(db: Session, book_id: int, user_id: int) -> tuple[bool, int]:
-    """
-    Toggle like for (user_id, book_id).
 
-    Returns: (liked_now, like_count)
+def _after_commit(book_id: int, delta: int, count: int) -> int:
+    if delta:
+        if counter_buffer.enabled:
+            counter_buffer.add(book_id, likes=delta)
+        else:
+            feed_cache.invalidate_book(book_id)
+    return max(0, count + counter_buffer.pending(book_id)[0])
+
+
+def add_like(db: Session, book_id: int, user_id: int) -> int:
+    """
+    Idempotent like: insert-or-ignore + in-database increment, one commit.
+    Returns the new like_count.
     """
-    book = _get_public_book_or_none(db, book_id)
-    if not book:
+    try:
+        inserted = db.execute(
+            sqlite_insert(Like)
+            .values(user_id=user_id, review_id=book_id)
+            .on_conflict_do_nothing()
+        ).rowcount
+    except IntegrityError:
+        # foreign_keys=ON (SQLITE_PROFILE) rejects a like on a missing book
+        db.rollback()
         raise ValueError("Post not found")
+    delta = 1 if inserted else 0
+    count = _apply_like_delta(db, book_id, delta)
+    db.commit()
+    return _after_commit(book_id, delta, count)
 
-    existing = (
-        db.query(Like)
-        .filter(Like.user_id == user_id, Like.review_id == book_id)
-        .first()
-    )
-
-    if existing:
-        # unlike
-        db.delete(existing)
-        book.like_count = max((book.like_count or 0) - 1, 0)
-        liked_now = False
-    else:
-        # like
-        db.add(Like(user_id=user_id, review_id=book_id))
-        book.like_count = (book.like_count or 0) + 1
-        liked_now = True
 
+def remove_like(db: Session, book_id: int, user_id: int) -> int:
+    """Idempotent unlike. Returns the new like_count."""
+    deleted = db.execute(
+        delete(Like).where(Like.user_id == user_id, Like.review_id == book_id)
+    ).rowcount
+    delta = -1 if deleted else 0
+    count = _apply_like_delta(db, book_id, delta)
     db.commit()
-    db.refresh(book)
+    return _after_commit(book_id, delta, count)
+
+
+def toggle_like(db: Session, book_id: int, user_id: int) -> tuple[bool, int]:
+    """
+    Toggle like for (user_id, book_id).
+
+    Returns: (liked_now, like_count)
+    """
+    deleted = db.execute(
+        delete(Like).where(Like.user_id == user_id, Like.review_id == book_id)
+    ).rowcount
+    if deleted:
+        count = _apply_like_delta(db, book_id, -1)
+        db.commit()
+        return False, _after_commit(book_id, -1, count)
 
-    return liked_now, book.like_count or 0
+    return True, add_like(db, book_id, user_id)
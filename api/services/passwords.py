@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+
+from api.config import settings
+from api.utils.metrics import get_stats
+
+# set up password hashing context
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+)
+
+
+# The auth routes are sync, so every hash, running or queued, holds one of
+# the request threadpool's threads (40 by default in Starlette). Hashing may
+# never hold more than this many of them, whatever the settings say.
+MAX_HASH_THREADS = 8
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Every worker is busy and the wait queue is full; callers answer 503."""
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    try:
+        return pwd_context.verify(password, password_hash)
+    except ValueError:
+        return False
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small process pool so a burst of logins burns CPU in
+    other processes instead of holding the GIL (and the request threadpool)
+    away from everything else.
+
+    At most `workers` hashes run at once and `queue_size` more may wait,
+    capped at MAX_HASH_THREADS together; past that, a caller waits up to
+    `queue_timeout` seconds for a slot (0 = not at all) and then gets
+    PasswordHasherBusy. workers=0 hashes inline (scripts, tests).
+    """
+
+    def __init__(self, workers: int, queue_size: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.slots = max(1, min(workers + queue_size, MAX_HASH_THREADS))
+        self._slots = threading.BoundedSemaphore(self.slots)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = get_stats("password_hasher")
+
+    def start(self) -> None:
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the parent has live threads and DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._run(_verify, password, password_hash)
+
+    def _run(self, fn: Callable, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        if self.queue_timeout > 0:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            self.stats.incr("rejected")
+            raise PasswordHasherBusy("password hashing is saturated")
+        started = time.perf_counter()
+        try:
+            self.start()
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+            self.stats.incr("calls")
+            self.stats.observe(time.perf_counter() - started)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.database import ReadSessionLocal, SessionLocal, engine, read_engine
+from api.jwt_utils import _claims_user_id, decode_access_token, oauth2_scheme_optional
+from api.models import ReplicaHeartbeat
+from api.services.auth_cache import _TTLCache, auth_cache
+from api.utils.metrics import get_stats
+
+_HEARTBEAT_ID = 1
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only requests: the read replica when it's
+    fresh enough, the primary otherwise.
+
+    - Lag: a background thread rewrites replica_heartbeat on the primary
+      every heartbeat_interval and reads it back from the replica. The age
+      of the replica's copy is an upper bound on how far behind it is (it
+      includes up to one heartbeat interval), so max_lag should be a few
+      intervals. A stalled thread only makes the replica look staler.
+    - Read-your-writes: after a user's successful write, their reads go to
+      the primary until the replica has a heartbeat newer than that write,
+      capped at ryw_seconds. Tracked per process.
+    - sync_interval > 0 copies a SQLite primary file into a SQLite replica
+      file with the backup API, for running the whole setup locally.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Engine,
+        max_lag: float,
+        heartbeat_interval: float,
+        sync_interval: float,
+        ryw_seconds: float,
+        max_users: int,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.enabled = replica is not primary
+        self.max_lag = max_lag
+        self.heartbeat_interval = heartbeat_interval
+        self.sync_interval = sync_interval
+        self.ryw_seconds = ryw_seconds
+        # primary's clock at the newest heartbeat seen on the replica; 0 = never
+        self._replica_as_of = 0.0
+        self._last_sync: Optional[float] = None
+        self._writes = _TTLCache(max_users)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = get_stats("replica")
+        self.stats.gauge("lag_seconds", lambda: round(self.lag(), 3) if self._replica_as_of else None)
+
+    def lag(self) -> float:
+        return max(0.0, time.time() - self._replica_as_of)
+
+    def note_write(self, user_id: int) -> None:
+        with self._lock:
+            self._writes.put(user_id, time.time(), time.monotonic() + self.ryw_seconds)
+
+    def session(self, user_id: Optional[int] = None) -> Session:
+        """A session on the replica, or on the primary when that's required."""
+        if not self.enabled:
+            return SessionLocal()
+
+        if user_id is not None:
+            with self._lock:
+                wrote_at = self._writes.get(user_id, time.monotonic())
+            if wrote_at is not None and wrote_at >= self._replica_as_of:
+                self.stats.incr("primary_read_your_writes")
+                return _primary_session(fresh=True)
+
+        if self.lag() > self.max_lag:
+            self.stats.incr("primary_stale_replica")
+            return _primary_session(fresh=False)
+
+        self.stats.incr("replica_reads")
+        return ReadSessionLocal()
+
+    def heartbeat(self) -> None:
+        now = datetime.utcnow()
+        with self.primary.begin() as conn:
+            conn.execute(
+                sqlite_insert(ReplicaHeartbeat)
+                .values(id=_HEARTBEAT_ID, written_at=now)
+                .on_conflict_do_update(index_elements=["id"], set_={"written_at": now})
+            )
+
+    def sync(self) -> None:
+        """Copy the primary SQLite file over the replica file."""
+        src = sqlite3.connect(self.primary.url.database)
+        dst = sqlite3.connect(self.replica.url.database)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        self._last_sync = time.monotonic()
+        self.stats.incr("file_syncs")
+
+    def refresh(self) -> None:
+        """Re-read the replica's heartbeat."""
+        with self.replica.connect() as conn:
+            written_at = conn.execute(
+                select(ReplicaHeartbeat.written_at).where(ReplicaHeartbeat.id == _HEARTBEAT_ID)
+            ).scalar()
+        if written_at is not None:
+            self._replica_as_of = written_at.replace(tzinfo=timezone.utc).timestamp()
+
+    def tick(self) -> None:
+        self.heartbeat()
+        if self.sync_interval > 0 and (
+            self._last_sync is None or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+        self.refresh()
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        if self.sync_interval > 0 and not (_is_sqlite_file(self.primary) and _is_sqlite_file(self.replica)):
+            raise RuntimeError("READ_REPLICA_SYNC_SECONDS needs SQLite files for both the primary and the replica")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="replica-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.heartbeat_interval * 2 + 5)
+        self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                self.stats.incr("heartbeat_errors")
+                print(f"Replica heartbeat failed, will retry: {e}")
+            if self._stop.wait(self.heartbeat_interval):
+                return
+
+
+def _primary_session(fresh: bool) -> Session:
+    db = SessionLocal()
+    # fresh: this reader must see its own writes, so shared caches filled from
+    # the replica (feed pages) are bypassed too; see wants_fresh_reads
+    db.info["fresh_reads"] = fresh
+    return db
+
+
+def _is_sqlite_file(e: Engine) -> bool:
+    return e.dialect.name == "sqlite" and e.driver == "pysqlite" and e.url.database not in (None, "", ":memory:")
+
+
+def wants_fresh_reads(db: Session) -> bool:
+    return bool(db.info.get("fresh_reads"))
+
+
+def token_user_id(token: Optional[str]) -> Optional[int]:
+    """User id of a bearer token, via the auth cache; None if absent or invalid."""
+    if not token:
+        return None
+    return _claims_user_id(auth_cache.claims(token, decode_access_token))
+
+
+def get_read_db(token: Optional[str] = Depends(oauth2_scheme_optional)) -> Iterator[Session]:
+    """get_db for read-only routes; see ReplicaRouter.session."""
+    db = replica_router.session(token_user_id(token))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replica=read_engine,
+    max_lag=settings.READ_REPLICA_MAX_LAG_SECONDS,
+    heartbeat_interval=settings.READ_REPLICA_HEARTBEAT_SECONDS,
+    sync_interval=settings.READ_REPLICA_SYNC_SECONDS,
+    ryw_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_users=settings.AUTH_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from api.auth_models import TokenBlocklist
+from api.config import settings
+from api.database import SessionLocal
+from api.utils.metrics import get_stats
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """
+    In-memory view of token_blocklist, checked on every authenticated request.
+
+    A Bloom filter answers "definitely not revoked" for almost every token
+    without touching the dict; a hit is confirmed against the jti -> expiry
+    map. The table stays the source of truth: revoke() writes it first, and
+    a background thread pulls rows added by other workers (by id, so each
+    sync reads only new rows) and bulk-deletes entries whose token has
+    expired anyway, rebuilding the filter since Bloom filters can't delete.
+    """
+
+    def __init__(self, capacity: int, sync_interval: float, prune_interval: float):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self._bloom = BloomFilter(capacity)
+        self._expires: Dict[str, datetime] = {}
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = get_stats("revocation")
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        if jti not in self._bloom:
+            self.stats.incr("bloom_negatives")
+            return False
+        with self._lock:
+            revoked = jti in self._expires
+        self.stats.incr("revoked_hits" if revoked else "bloom_false_positives")
+        return revoked
+
+    def revoke(self, db: Session, jti: str, expires_at: Optional[datetime]) -> None:
+        db.add(TokenBlocklist(jti=jti, expires_at=expires_at))
+        db.commit()
+        self._remember([(jti, expires_at)])
+        self.stats.incr("revoked")
+
+    def sync(self, db: Session) -> int:
+        """Load rows added since the last sync. Returns how many were new."""
+        rows = db.execute(
+            select(TokenBlocklist.id, TokenBlocklist.jti, TokenBlocklist.expires_at, TokenBlocklist.created_at)
+            .where(TokenBlocklist.id > self._last_id)
+            .order_by(TokenBlocklist.id)
+        ).all()
+        if rows:
+            self._remember((r.jti, r.expires_at or _legacy_expiry(r.created_at)) for r in rows)
+            self._last_id = rows[-1].id
+            self.stats.incr("synced", len(rows))
+        return len(rows)
+
+    def prune(self, db: Session) -> int:
+        """Bulk-delete expired entries from the table and from memory."""
+        now = datetime.utcnow()
+        result = db.execute(
+            delete(TokenBlocklist).where(
+                or_(
+                    TokenBlocklist.expires_at < now,
+                    # rows written before expires_at existed
+                    (TokenBlocklist.expires_at.is_(None))
+                    & (TokenBlocklist.created_at < now - _token_lifetime()),
+                )
+            )
+        )
+        db.commit()
+
+        with self._lock:
+            self._expires = {j: exp for j, exp in self._expires.items() if exp is None or exp >= now}
+            self._rebuild()
+        self._last_prune = time.monotonic()
+        self.stats.incr("pruned", result.rowcount)
+        return result.rowcount
+
+    def load(self) -> None:
+        db = SessionLocal()
+        try:
+            self.prune(db)
+            self.sync(db)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.sync_interval * 2 + 5)
+        self._thread = None
+
+    def _remember(self, entries: Iterable) -> None:
+        with self._lock:
+            for jti, expires_at in entries:
+                self._expires[jti] = expires_at
+                self._bloom.add(jti)
+            if len(self._expires) > self._bloom.capacity:
+                self._rebuild()
+
+    def _rebuild(self) -> None:
+        # caller holds the lock; swap in a fresh filter sized for what's left
+        bloom = BloomFilter(max(self.capacity, 2 * len(self._expires)))
+        for jti in self._expires:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            db = SessionLocal()
+            try:
+                self.sync(db)
+                if time.monotonic() - self._last_prune >= self.prune_interval:
+                    self.prune(db)
+            except Exception as e:
+                db.rollback()
+                print(f"Token blocklist sync failed, will retry: {e}")
+            finally:
+                db.close()
+
+
+def _token_lifetime() -> timedelta:
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def _legacy_expiry(created_at: Optional[datetime]) -> Optional[datetime]:
+    return created_at + _token_lifetime() if created_at else None
+
+
+def expiry_from_claims(payload: dict) -> Optional[datetime]:
+    """Naive-UTC expiry of a decoded token, as stored in token_blocklist."""
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)):
+        return None
+    return datetime.fromtimestamp(exp, tz=timezone.utc).replace(tzinfo=None)
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    sync_interval=settings.REVOCATION_SYNC_SECONDS,
+    prune_interval=settings.REVOCATION_PRUNE_SECONDS,
+)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import column, func, literal_column, select, table, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api.auth_models import User
+from api.config import settings
+from api.models import Book
+from api.services.counters import counter_buffer
+from api.services.feed import (
+    _REVIEW_TYPE_FILTERS,
+    _encode_cursor,
+    _feed_columns,
+    _feed_row_to_dict,
+)
+
+# Full-text search over public reviews: an FTS5 index on books(title, author,
+# review_text), kept in sync by triggers, so every write path (routes, seed
+# scripts, bulk loads) updates it. External content: the index stores only
+# the inverted lists and reads column values back from books.
+#
+# Results are ordered by bm25 (title and author hits weigh more than the
+# review body) and paged by keyset on (score, id). Scoring is per match, so
+# only the newest SEARCH_MAX_RANKED_MATCHES matches are ranked: FTS5 walks a
+# term's matches in rowid order and stops there, and a word that appears in
+# most reviews costs the same as a rare one.
+
+MAX_QUERY_TERMS = 8
+# "word*" prefix-matches only from this length; "a*" expands to most of the index
+MIN_PREFIX_CHARS = 3
+# bm25 column weights: title, author, review_text
+_WEIGHTS = (10.0, 5.0, 1.0)
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, review_text,
+        content='books', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+    END
+    """,
+    # only the indexed columns, so like/comment counter updates don't touch it
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, review_text ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, review_text)
+        VALUES ('delete', old.id, old.title, old.author, old.review_text);
+        INSERT INTO books_fts(rowid, title, author, review_text)
+        VALUES (new.id, new.title, new.author, new.review_text);
+    END
+    """,
+]
+
+books_fts = table("books_fts", column("rowid"))
+_fts = literal_column("books_fts")
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS table and triggers if missing, indexing existing rows once."""
+    with engine.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'"
+        ).first()
+        for ddl in SEARCH_INDEX_DDL:
+            conn.exec_driver_sql(ddl)
+        if not exists:
+            conn.exec_driver_sql("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def _match_expression(query: str) -> str:
+    """
+    User text -> FTS5 query: each word quoted (so operators and punctuation
+    are literal) and all words required. A trailing * asks for a prefix match.
+    Raises ValueError("empty_query") if there's nothing to search for.
+    """
+    terms = re.findall(r"(\w+)(\*?)", query or "")[:MAX_QUERY_TERMS]
+    if not terms:
+        raise ValueError("empty_query")
+    return " ".join(
+        f'"{word}"*' if star and len(word) >= MIN_PREFIX_CHARS else f'"{word}"'
+        for word, star in terms
+    )
+
+
+def _parse_search_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Search cursor "<score>|<id>"; raises ValueError on a malformed cursor."""
+    if not cursor:
+        return None
+    score, id_str = cursor.split("|")
+    return (float(score), int(id_str))
+
+
+def search_reviews(
+    db: Session,
+    query: str,
+    review_types: Optional[List[str]] = None,
+    limit: int = 20,
+    after: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Public reviews matching `query`, best match first.
+    review_types: any of RECOMMENDED / NOT_RECOMMENDED / NEUTRAL (OR'ed).
+    Raises ValueError for an empty query, unknown review type or bad cursor.
+    """
+    match = _match_expression(query)
+    cursor = _parse_search_cursor(after)
+    page_size = min(limit, 50)
+
+    review_types = sorted(set(review_types or ()))
+    if any(t not in _REVIEW_TYPE_FILTERS for t in review_types):
+        raise ValueError("bad_review_type")
+
+    # bm25 is negative, lower = better. It can't be referenced in the WHERE
+    # of the query that computes it, hence the nesting.
+    scored = (
+        select(books_fts.c.rowid.label("id"), func.bm25(_fts, *_WEIGHTS).label("score"))
+        .select_from(books_fts)
+        .where(_fts.op("MATCH")(match))
+    )
+    if settings.SEARCH_MAX_RANKED_MATCHES > 0:
+        scored = scored.order_by(books_fts.c.rowid.desc()).limit(settings.SEARCH_MAX_RANKED_MATCHES)
+    scored = scored.subquery("scored")
+    if review_types:
+        # the filter lives on books, so rank after the join
+        hits = scored
+    else:
+        # rank on (score, id) and fetch feed columns for the page only. The
+        # books / users joins stay inside, so LIMIT counts only matches the
+        # page can return (a book without an owner row would shorten it)
+        top = (
+            select(scored.c.id, scored.c.score)
+            .join(Book, Book.id == scored.c.id)
+            .join(User, Book.owner_id == User.id)
+        )
+        if cursor:
+            top = top.where(tuple_(scored.c.score, scored.c.id) > cursor)
+        hits = top.order_by(scored.c.score, scored.c.id).limit(page_size + 1).subquery("hits")
+
+    q = (
+        select(*_feed_columns(user_id, full_body=False), hits.c.score)
+        .join(hits, hits.c.id == Book.id)
+        .join(User, Book.owner_id == User.id)
+    )
+    if review_types:
+        q = q.where(Book.review_type.in_(review_types))
+        if cursor:
+            q = q.where(tuple_(hits.c.score, Book.id) > cursor)
+
+    rows = db.execute(q.order_by(hits.c.score, Book.id).limit(page_size + 1)).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    return {
+        "items": counter_buffer.apply_pending([_feed_row_to_dict(r, full_body=False) for r in rows]),
+        "next_cursor": _encode_cursor(rows[-1].score, rows[-1].id) if has_more else None,
+    }
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, bindparam, delete, desc, literal, select, text, true, tuple_, update
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from api.config import settings
+from api.models import Book, Follow, TimelineEntry
+from api.auth_models import User
+from api.services.counters import counter_buffer
+from api.services.feed import _encode_cursor, _feed_columns, _feed_row_to_dict, _parse_cursor
+
+# Home timeline = reviews by the accounts a user follows, newest first.
+#
+# Authors with at most TIMELINE_FANOUT_MAX_FOLLOWERS followers are pushed:
+# each new review is copied into every follower's timeline_entries with one
+# INSERT ... SELECT. Bigger authors are pulled: on read, each one contributes
+# its newest reviews past the cursor (one bounded index range per author)
+# and the streams are k-way merged with the pushed entries.
+#
+# An author that drops back under the threshold is pushed again from then on.
+# At that point their newest TIMELINE_BACKFILL_ON_FOLLOW reviews are copied
+# into every follower's timeline, the same backfill a new follow gets, so
+# recent reviews posted while they were pulled stay visible.
+
+_PULL_CHUNK = 100
+
+
+def follow_user(db: Session, follower_id: int, followee_id: int) -> int:
+    """
+    Idempotent follow. Returns the followee's follower_count.
+    Raises ValueError("cannot_follow_self") / ValueError("user_not_found").
+    """
+    if follower_id == followee_id:
+        raise ValueError("cannot_follow_self")
+
+    count = db.execute(select(User.follower_count).where(User.id == followee_id)).scalar()
+    if count is None:
+        raise ValueError("user_not_found")
+
+    inserted = db.execute(
+        sqlite_insert(Follow)
+        .values(follower_id=follower_id, followee_id=followee_id)
+        .on_conflict_do_nothing()
+    ).rowcount
+
+    if inserted:
+        count = db.execute(
+            update(User)
+            .where(User.id == followee_id)
+            .values(follower_count=User.follower_count + 1)
+            .returning(User.follower_count)
+        ).scalar_one()
+        if count <= settings.TIMELINE_FANOUT_MAX_FOLLOWERS:
+            _backfill(db, follower_id, followee_id, settings.TIMELINE_BACKFILL_ON_FOLLOW)
+
+    db.commit()
+    return count or 0
+
+
+def unfollow_user(db: Session, follower_id: int, followee_id: int) -> int:
+    """Idempotent unfollow. Returns the followee's follower_count (0 if unknown)."""
+    deleted = db.execute(
+        delete(Follow).where(Follow.follower_id == follower_id, Follow.followee_id == followee_id)
+    ).rowcount
+
+    if deleted:
+        count = db.execute(
+            update(User)
+            .where(User.id == followee_id)
+            .values(follower_count=User.follower_count - 1)
+            .returning(User.follower_count)
+        ).scalar()
+        db.execute(
+            delete(TimelineEntry).where(
+                TimelineEntry.user_id == follower_id,
+                TimelineEntry.author_id == followee_id,
+            )
+        )
+        if count == settings.TIMELINE_FANOUT_MAX_FOLLOWERS:
+            # just crossed back under: pushed from now on, so push the recent past too
+            _backfill_followers(db, followee_id, settings.TIMELINE_BACKFILL_ON_FOLLOW)
+    else:
+        count = db.execute(select(User.follower_count).where(User.id == followee_id)).scalar()
+
+    db.commit()
+    return max(0, count or 0)
+
+
+def fan_out_review(db: Session, book_id: int, author_id: int, created_at: datetime) -> None:
+    """
+    Push a new review into its author's followers' timelines, unless the
+    author is above the fan-out threshold. Single statement; the caller commits.
+    """
+    follower_count = (
+        select(User.follower_count).where(User.id == author_id).scalar_subquery()
+    )
+    rows = select(
+        Follow.follower_id,
+        literal(book_id),
+        literal(author_id),
+        literal(created_at),
+    ).where(
+        Follow.followee_id == author_id,
+        follower_count <= settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+    )
+    db.execute(
+        sqlite_insert(TimelineEntry)
+        .from_select(["user_id", "review_id", "author_id", "created_at"], rows)
+        .on_conflict_do_nothing()
+    )
+
+
+def remove_review(db: Session, book_id: int) -> None:
+    """Drop a deleted review from every timeline. The caller commits."""
+    db.execute(delete(TimelineEntry).where(TimelineEntry.review_id == book_id))
+
+
+def get_following_timeline(
+    db: Session,
+    user_id: int,
+    limit: int = 20,
+    after: Optional[str] = None,
+) -> Dict[str, Any]:
+    cursor = _parse_cursor(after)
+    page_size = min(limit, 50)
+
+    pushed = select(TimelineEntry.created_at, TimelineEntry.review_id).where(
+        TimelineEntry.user_id == user_id
+    )
+    if cursor:
+        pushed = pushed.where(tuple_(TimelineEntry.created_at, TimelineEntry.review_id) < cursor)
+    pushed = pushed.order_by(desc(TimelineEntry.created_at), desc(TimelineEntry.review_id)).limit(page_size)
+    streams: List[List[Tuple[datetime, int]]] = [[tuple(r) for r in db.execute(pushed).all()]]
+
+    # every pulled author, read _PULL_CHUNK at a time by _pull_streams
+    pulled_authors = db.execute(
+        select(Follow.followee_id)
+        .join(User, User.id == Follow.followee_id)
+        .where(
+            Follow.follower_id == user_id,
+            User.follower_count > settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+        )
+        .order_by(Follow.followee_id)
+    ).scalars().all()
+    streams.extend(_pull_streams(db, pulled_authors, cursor, page_size))
+
+    # k-way merge of already-sorted streams, newest first
+    page: List[Tuple[datetime, int]] = []
+    seen: set[int] = set()
+    for created_at, review_id in heapq.merge(*streams, reverse=True):
+        if review_id in seen:
+            continue
+        seen.add(review_id)
+        page.append((created_at, review_id))
+        if len(page) >= page_size:
+            break
+
+    ids = [review_id for _, review_id in page]
+    rows = []
+    if ids:
+        rows = db.execute(
+            select(*_feed_columns(user_id, full_body=False))
+            .join(User, Book.owner_id == User.id)
+            .where(Book.id.in_(ids))
+        ).all()
+    by_id = {r.id: r for r in rows}
+
+    return {
+        "items": counter_buffer.apply_pending(
+            [_feed_row_to_dict(by_id[i], full_body=False) for i in ids if i in by_id]
+        ),
+        # every stream asked for page_size rows, so a short page means all ran out
+        "next_cursor": _encode_cursor(*page[-1]) if len(page) >= page_size else None,
+    }
+
+
+def _backfill(db: Session, follower_id: int, followee_id: int, n: int) -> None:
+    if n <= 0:
+        return
+    recent = (
+        select(literal(follower_id), Book.id, Book.owner_id, Book.created_at)
+        .where(Book.owner_id == followee_id, Book.created_at.is_not(None))
+        .order_by(desc(Book.created_at), desc(Book.id))
+        .limit(n)
+    )
+    db.execute(
+        sqlite_insert(TimelineEntry)
+        .from_select(["user_id", "review_id", "author_id", "created_at"], recent)
+        .on_conflict_do_nothing()
+    )
+
+
+def _backfill_followers(db: Session, author_id: int, n: int) -> None:
+    """_backfill for every current follower of author_id, in one INSERT ... SELECT."""
+    if n <= 0:
+        return
+    recent = (
+        select(Book.id, Book.owner_id, Book.created_at)
+        .where(Book.owner_id == author_id, Book.created_at.is_not(None))
+        .order_by(desc(Book.created_at), desc(Book.id))
+        .limit(n)
+        .subquery()
+    )
+    rows = (
+        select(Follow.follower_id, recent.c.id, recent.c.owner_id, recent.c.created_at)
+        .join(recent, true())
+        .where(Follow.followee_id == author_id)
+    )
+    db.execute(
+        sqlite_insert(TimelineEntry)
+        .from_select(["user_id", "review_id", "author_id", "created_at"], rows)
+        .on_conflict_do_nothing()
+    )
+
+
+@lru_cache(maxsize=64)
+def _pull_chunk_stmt(n_authors: int, with_cursor: bool) -> TextClause:
+    """
+    UNION ALL of one bounded range scan per author on
+    idx_books_owner_created_id. Built once per shape and cached; the ORM
+    construct for a few hundred branches costs more than the query itself.
+    """
+    cursor_sql = "AND (created_at, id) < (:ts, :rid) " if with_cursor else ""
+    branches = [
+        "SELECT * FROM (SELECT owner_id, created_at, id FROM books "
+        f"WHERE owner_id = :a{i} AND created_at IS NOT NULL {cursor_sql}"
+        "ORDER BY created_at DESC, id DESC LIMIT :n)"
+        for i in range(n_authors)
+    ]
+    stmt = text(" UNION ALL ".join(branches))
+    if with_cursor:
+        stmt = stmt.bindparams(bindparam("ts", type_=DateTime()))
+    return stmt.columns(owner_id=Integer(), created_at=DateTime(), id=Integer())
+
+
+def _pull_streams(
+    db: Session,
+    author_ids: Iterable[int],
+    cursor: Optional[tuple],
+    page_size: int,
+) -> List[List[Tuple[datetime, int]]]:
+    """Newest `page_size` reviews past the cursor for each pulled author."""
+    author_ids = list(author_ids)
+    by_author: Dict[int, List[Tuple[datetime, int]]] = {}
+
+    for i in range(0, len(author_ids), _PULL_CHUNK):
+        chunk = author_ids[i : i + _PULL_CHUNK]
+        params: Dict[str, Any] = {f"a{j}": author_id for j, author_id in enumerate(chunk)}
+        params["n"] = page_size
+        if cursor:
+            params["ts"], params["rid"] = cursor
+
+        stmt = _pull_chunk_stmt(len(chunk), cursor is not None)
+        for owner_id, created_at, review_id in db.execute(stmt, params).all():
+            by_author.setdefault(owner_id, []).append((created_at, review_id))
+
+    return [sorted(stream, reverse=True) for stream in by_author.values()]
@@ -0,0 +1,142 @@
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from api.auth_models import User
+from api.config import settings
+from api.database import Base
+from api.models import Book
+from api.services.counters import counter_buffer
+from api.utils.sqlite import install_sqlite_profile
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A fresh SQLite file per test, with the app's connection profile."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite'}",
+        connect_args={"check_same_thread": False},
+    )
+    install_sqlite_profile(engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def Session(engine):
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db(Session):
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def _no_write_behind(monkeypatch):
+    # counters go straight to books.like_count / comment_count in tests
+    monkeypatch.setattr(counter_buffer, "enabled", False)
+
+
+@contextmanager
+def count_statements(engine):
+    """Collect the SQL of every statement the engine runs inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_user(db, username: str) -> User:
+    user = User(username=username, password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_books(db, owner: User, n: int) -> list[Book]:
+    start = datetime(2024, 1, 1)
+    books = [
+        Book(
+            title=f"Book {i}",
+            author="Someone",
+            review_text="word " * (i + 1),
+            owner_id=owner.id,
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+    db.add_all(books)
+    db.commit()
+    return books
+
+
+class StubOpenLibrary:
+    """
+    Local stand-in for the Open Library search API. `status` and `cover_id`
+    decide every answer; `requests` and `connections` count what came in.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.cover_id = 42
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                docs = [{"cover_i": stub.cover_id}] if stub.cover_id else []
+                body = json.dumps({"numFound": len(docs), "docs": docs}).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/search.json"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def openlibrary():
+    stub = StubOpenLibrary()
+    stub.start()
+    yield stub
+    stub.stop()
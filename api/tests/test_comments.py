@@ -0,0 +1,117 @@
+import pytest
+from sqlalchemy import select
+
+from api.models import Book
+from api.services.auth_cache import AuthUser
+from api.services.comments import add_comment, delete_comment, list_comments
+from api.tests.conftest import count_statements, make_books, make_user
+
+
+@pytest.fixture
+def thread(db):
+    """A book with 7 comments; most share a CURRENT_TIMESTAMP second, so ids break the ties."""
+    owner = make_user(db, "owner")
+    book_id = make_books(db, owner, 1)[0].id
+    reader = AuthUser(id=make_user(db, "reader").id, username="reader")
+    ids = [add_comment(db, book_id, reader, f"c{i}")["id"] for i in range(7)]
+    return book_id, ids
+
+
+def walk(db, book_id, order, limit):
+    pages, after, before = [], None, None
+    for _ in range(10):
+        page = list_comments(db, book_id, limit=limit, after=after, before=before, order=order)
+        pages.append([c["id"] for c in page["items"]])
+        if not page["next_cursor"]:
+            return pages
+        if order == "asc":
+            after = page["next_cursor"]
+        else:
+            before = page["next_cursor"]
+    raise AssertionError("comment pages never ran out")
+
+
+def test_pages_walk_every_comment_once(db, thread):
+    book_id, ids = thread
+    assert walk(db, book_id, "asc", 3) == [ids[0:3], ids[3:6], ids[6:7]]
+    assert walk(db, book_id, "desc", 3) == [ids[6:3:-1], ids[3:0:-1], ids[0:1]]
+
+
+def test_exact_last_page_has_no_cursor(db, thread):
+    book_id, ids = thread
+    page = list_comments(db, book_id, limit=7)
+    assert [c["id"] for c in page["items"]] == ids
+    assert page["next_cursor"] is None
+
+
+def test_after_and_before_combine(db, thread):
+    book_id, ids = thread
+    first = list_comments(db, book_id, limit=2)
+    last = list_comments(db, book_id, limit=2, order="desc")
+    middle = list_comments(db, book_id, after=first["next_cursor"], before=last["next_cursor"])
+    assert [c["id"] for c in middle["items"]] == ids[2:5]
+
+
+def test_items_carry_review_and_author(db, thread):
+    book_id, ids = thread
+    item = list_comments(db, book_id, limit=1)["items"][0]
+    assert item["review_id"] == book_id
+    assert item["user"]["username"] == "reader"
+    assert item["created_at"].endswith("Z")
+
+
+def test_unknown_book_is_an_empty_page(db, thread):
+    assert list_comments(db, 999) == {"items": [], "next_cursor": None}
+
+
+def test_malformed_cursor_raises(db, thread):
+    book_id, _ = thread
+    with pytest.raises(ValueError):
+        list_comments(db, book_id, after="not-a-cursor")
+
+
+def comment_count(db, book_id):
+    db.expire_all()
+    return db.execute(select(Book.comment_count).where(Book.id == book_id)).scalar_one()
+
+
+def test_add_comment_is_two_statements_and_echoes_the_caller(engine, db, thread):
+    book_id, _ = thread
+    caller = AuthUser(id=1, username="owner")
+    with count_statements(engine) as statements:
+        comment = add_comment(db, book_id, caller, "  nice review  ")
+    # counter bump (doubles as the book check) + INSERT ... RETURNING; no User re-query
+    assert len(statements) == 2
+    assert comment["user"] == {"id": 1, "username": "owner"}
+    assert comment["body"] == "nice review"
+    assert comment["review_id"] == book_id and comment["created_at"].endswith("Z")
+    assert comment_count(db, book_id) == 8
+
+
+@pytest.mark.parametrize(
+    "book, body, error",
+    [(None, "", "empty_body"), (None, "x" * 2001, "too_long"), (999, "hi", "book_not_commentable")],
+)
+def test_add_comment_rejects_without_touching_the_counter(db, thread, book, body, error):
+    book_id, _ = thread
+    with pytest.raises(ValueError, match=error):
+        add_comment(db, book or book_id, AuthUser(id=1, username="owner"), body)
+    assert comment_count(db, book_id) == 7
+
+
+def test_delete_own_comment_is_two_statements(engine, db, thread):
+    book_id, ids = thread
+    reader_id = list_comments(db, book_id, limit=1)["items"][0]["user"]["id"]
+    with count_statements(engine) as statements:
+        assert delete_comment(db, ids[0], reader_id) is True
+    assert len(statements) == 2
+    assert comment_count(db, book_id) == 6
+    assert ids[0] not in [c["id"] for c in list_comments(db, book_id)["items"]]
+
+
+def test_delete_someone_elses_or_a_missing_comment(db, thread):
+    book_id, ids = thread
+    with pytest.raises(PermissionError):
+        delete_comment(db, ids[0], user_id=1)
+    assert delete_comment(db, 999, user_id=1) is False
+    assert comment_count(db, book_id) == 7
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import select, update
+
+from api.config import settings
+from api.models import Book, Comment, Like
+from api.services.counters import reconcile_counters
+from api.tests.conftest import make_books, make_user
+
+
+@pytest.fixture
+def drifted(db):
+    owner = make_user(db, "owner")
+    readers = [make_user(db, f"r{i}").id for i in range(3)]
+    ids = [b.id for b in make_books(db, owner, 5)]
+    # true counts: book i has i % 4 likes and i % 3 comments
+    for i, book_id in enumerate(ids):
+        db.add_all(Like(user_id=u, review_id=book_id) for u in readers[: i % 4])
+        db.add_all(Comment(review_id=book_id, user_id=readers[0], body="c") for _ in range(i % 3))
+    db.commit()
+    # stored counts: right for ids[0], off for the rest
+    for i, book_id in enumerate(ids[1:], start=1):
+        db.execute(update(Book).where(Book.id == book_id).values(like_count=10 + i, comment_count=0))
+    db.commit()
+    return ids
+
+
+def counts(db, ids):
+    db.expire_all()
+    rows = db.execute(select(Book.id, Book.like_count, Book.comment_count).where(Book.id.in_(ids))).all()
+    return {r.id: (r.like_count, r.comment_count) for r in rows}
+
+
+def expected(ids):
+    return {book_id: (i % 4, i % 3) for i, book_id in enumerate(ids)}
+
+
+def test_reconcile_fixes_drift_chunk_by_chunk(db, drifted):
+    report = reconcile_counters(db, chunk_size=2)
+    assert report["scanned"] == 5
+    assert report["drifted"] == report["fixed"] == 4
+    assert report["like_drift"] == sum(abs(10 + i - i % 4) for i in range(1, 5))
+    assert report["comment_drift"] == sum(i % 3 for i in range(1, 5))
+    assert counts(db, drifted) == expected(drifted)
+
+    # nothing left to fix
+    assert reconcile_counters(db, chunk_size=2)["drifted"] == 0
+
+
+def test_dry_run_reports_without_writing(db, drifted):
+    before = counts(db, drifted)
+    report = reconcile_counters(db, chunk_size=2, dry_run=True)
+    assert report["drifted"] == 4 and report["fixed"] == 0
+    assert len(report["samples"]) == 4
+    assert counts(db, drifted) == before
+
+
+def test_refuses_to_write_while_web_workers_may_buffer_deltas(db, drifted, monkeypatch):
+    monkeypatch.setattr(settings, "COUNTER_WRITE_BEHIND", True)
+    before = counts(db, drifted)
+    with pytest.raises(RuntimeError):
+        reconcile_counters(db)
+    assert counts(db, drifted) == before
+
+    assert reconcile_counters(db, dry_run=True)["drifted"] == 4
+    assert reconcile_counters(db, write_behind_drained=True)["fixed"] == 4
+    assert counts(db, drifted) == expected(drifted)
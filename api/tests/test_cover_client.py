@@ -0,0 +1,131 @@
+import time
+
+import pytest
+import requests
+
+from api.services.cover_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ClientSaturatedError,
+    OpenLibraryClient,
+    TokenBucket,
+)
+
+COVERS_URL = "https://covers.example/b/id"
+
+
+def make_client(stub, failures=3, reset=0.2, rate=0.0, concurrency=4, timeout=2.0):
+    return OpenLibraryClient(
+        search_url=stub.url,
+        covers_url=COVERS_URL,
+        timeout=timeout,
+        max_concurrency=concurrency,
+        rate_per_second=rate,
+        breaker=CircuitBreaker(failure_threshold=failures, reset_timeout=reset),
+    )
+
+
+def test_search_returns_cover_url(openlibrary):
+    client = make_client(openlibrary)
+    assert client.search_cover("Dune", "Herbert") == f"{COVERS_URL}/42-M.jpg"
+    openlibrary.cover_id = None
+    assert client.search_cover("Nothing", "") is None
+    client.close()
+
+
+def test_breaker_opens_after_consecutive_failures(openlibrary):
+    client = make_client(openlibrary, failures=3, reset=60)
+    openlibrary.status = 503
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.search_cover("Dune", "Herbert")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # open: fails fast without reaching the upstream
+    with pytest.raises(CircuitOpenError):
+        client.search_cover("Dune", "Herbert")
+    assert openlibrary.requests == 3
+    client.close()
+
+
+def test_client_errors_do_not_open_the_breaker(openlibrary):
+    client = make_client(openlibrary, failures=2, reset=60)
+    openlibrary.status = 404
+    for _ in range(4):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.search_cover("Dune", "Herbert")
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    client.close()
+
+
+def test_half_open_trial_closes_or_reopens(openlibrary):
+    client = make_client(openlibrary, failures=1, reset=0.1)
+    openlibrary.status = 500
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search_cover("Dune", "Herbert")
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # a failed trial opens it again
+    time.sleep(0.15)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search_cover("Dune", "Herbert")
+    assert client.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        client.search_cover("Dune", "Herbert")
+
+    # a successful trial closes it
+    time.sleep(0.15)
+    openlibrary.status = 200
+    assert client.search_cover("Dune", "Herbert") == f"{COVERS_URL}/42-M.jpg"
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert openlibrary.requests == 3
+    client.close()
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
+
+
+def test_token_bucket_limits_request_rate(openlibrary):
+    # burst of 1 (= max_concurrency), then 20/s
+    client = make_client(openlibrary, rate=20.0, concurrency=1)
+    started = time.perf_counter()
+    for _ in range(6):
+        client.search_cover("Dune", "Herbert")
+    elapsed = time.perf_counter() - started
+    assert elapsed >= 5 / 20 * 0.9
+    assert openlibrary.requests == 6
+    client.close()
+
+
+def test_token_bucket_gives_up_past_its_timeout(openlibrary):
+    client = make_client(openlibrary, rate=1.0, concurrency=1, timeout=0.05)
+    client.search_cover("Dune", "Herbert")
+    with pytest.raises(ClientSaturatedError):
+        client.search_cover("Dune", "Herbert")
+    assert openlibrary.requests == 1
+    client.close()
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate_per_second=50.0, burst=2)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+    time.sleep(0.03)
+    assert bucket.acquire(timeout=0)
+
+
+def test_pool_reuses_connections(openlibrary):
+    client = make_client(openlibrary)
+    for _ in range(10):
+        client.search_cover("Dune", "Herbert")
+    assert openlibrary.requests == 10
+    assert openlibrary.connections == 1
+    client.close()
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from api.models import Book
+from api.services import cover_cache as cover_cache_module
+from api.services import covers
+from api.services.cover_cache import CoverCache
+from api.services.cover_client import CircuitBreaker, OpenLibraryClient
+from api.services.covers import COVER_FAILED, COVER_FOUND, COVER_MISSING, COVER_PENDING, CoverEnricher
+from api.tests.conftest import make_books, make_user
+
+COVERS_URL = "https://covers.example/b/id"
+
+
+@pytest.fixture
+def enricher(Session, openlibrary, monkeypatch):
+    # the enricher and cover cache open their own sessions on the test database
+    monkeypatch.setattr(covers, "SessionLocal", Session)
+    monkeypatch.setattr(cover_cache_module, "SessionLocal", Session)
+    monkeypatch.setattr(covers, "cover_cache", CoverCache(max_entries=100, ttl_seconds=3600, negative_ttl_seconds=60))
+    client = OpenLibraryClient(
+        search_url=openlibrary.url,
+        covers_url=COVERS_URL,
+        timeout=2.0,
+        max_concurrency=2,
+        rate_per_second=0,
+        breaker=CircuitBreaker(failure_threshold=100, reset_timeout=60),
+    )
+    monkeypatch.setattr(covers, "cover_client", client)
+    enricher = CoverEnricher(max_workers=2, max_attempts=2, backoff_seconds=0)
+    yield enricher
+    enricher.shutdown()
+    client.close()
+
+
+@pytest.fixture
+def pending_book(db):
+    book = make_books(db, make_user(db, "owner"), 1)[0]
+    book.cover_status = COVER_PENDING
+    db.commit()
+    return {"id": book.id, "title": book.title, "author": book.author}
+
+
+def enrich(enricher, book):
+    return enricher.submit(book["id"], book["title"], book["author"]).result(timeout=10)
+
+
+def cover_of(db, book_id):
+    db.expire_all()
+    return db.execute(select(Book.cover_status, Book.cover_image_url).where(Book.id == book_id)).one()
+
+
+def test_pending_to_found(db, enricher, pending_book):
+    assert enrich(enricher, pending_book) == f"{COVERS_URL}/42-M.jpg"
+    assert cover_of(db, pending_book["id"]) == (COVER_FOUND, f"{COVERS_URL}/42-M.jpg")
+
+
+def test_pending_to_missing(db, enricher, openlibrary, pending_book):
+    openlibrary.cover_id = None
+    assert enrich(enricher, pending_book) is None
+    assert cover_of(db, pending_book["id"]) == (COVER_MISSING, None)
+
+
+def test_upstream_errors_end_failed_after_retries(db, enricher, openlibrary, pending_book):
+    openlibrary.status = 503
+    assert enrich(enricher, pending_book) is None
+    assert openlibrary.requests == 2
+    assert cover_of(db, pending_book["id"]) == (COVER_FAILED, None)
+
+
+def test_other_errors_end_failed_not_pending(db, enricher, pending_book, monkeypatch):
+    def broken_store(key, cover_url):
+        raise OperationalError("INSERT INTO cover_cache ...", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(covers.cover_cache, "store", broken_store)
+    assert enrich(enricher, pending_book) is None
+    assert cover_of(db, pending_book["id"]) == (COVER_FAILED, None)
+
+
+def test_edited_book_is_left_alone(db, enricher, pending_book):
+    book = db.get(Book, pending_book["id"])
+    book.title = "Renamed"
+    db.commit()
+    enrich(enricher, pending_book)
+    assert cover_of(db, pending_book["id"]) == (COVER_PENDING, None)
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import update
+
+from api.models import Book, Like
+from api.services.feed import MAX_ENGAGEMENT_IDS, get_engagement
+from api.tests.conftest import count_statements, make_books, make_user
+
+
+@pytest.fixture
+def grid(db):
+    owner = make_user(db, "owner")
+    reader = make_user(db, "reader")
+    ids = [b.id for b in make_books(db, owner, 4)]
+    db.add_all(Like(user_id=reader.id, review_id=i) for i in ids[:2])
+    for book_id, likes, comments in zip(ids, (1, 2, 0, 0), (0, 0, 3, 1)):
+        db.execute(update(Book).where(Book.id == book_id).values(like_count=likes, comment_count=comments))
+    db.commit()
+    return {"ids": ids, "reader_id": reader.id}
+
+
+def test_counts_and_like_state_in_the_order_asked(engine, db, grid):
+    ids = grid["ids"]
+    asked = [ids[3], ids[0], 999, ids[1], ids[0]]
+    with count_statements(engine) as statements:
+        items = get_engagement(db, asked, user_id=grid["reader_id"])
+    # one IN query on books, one on likes
+    assert len(statements) == 2
+    assert items == [
+        {"id": ids[3], "like_count": 0, "comment_count": 1, "liked_by_me": False},
+        {"id": ids[0], "like_count": 1, "comment_count": 0, "liked_by_me": True},
+        {"id": ids[1], "like_count": 2, "comment_count": 0, "liked_by_me": True},
+    ]
+
+
+def test_anonymous_is_one_query(engine, db, grid):
+    with count_statements(engine) as statements:
+        items = get_engagement(db, grid["ids"])
+    assert len(statements) == 1
+    assert [i["liked_by_me"] for i in items] == [False] * 4
+
+
+def test_statement_count_does_not_grow_with_ids(engine, db, grid):
+    many = grid["ids"] * 3 + list(range(1000, 1000 + MAX_ENGAGEMENT_IDS - 4))
+    with count_statements(engine) as statements:
+        items = get_engagement(db, many, user_id=grid["reader_id"])
+    assert len(statements) == 2
+    assert [i["id"] for i in items] == grid["ids"]
+
+
+def test_too_many_ids(db, grid):
+    with pytest.raises(ValueError, match="too_many_ids"):
+        get_engagement(db, list(range(1, MAX_ENGAGEMENT_IDS + 2)))
+    assert get_engagement(db, []) == []
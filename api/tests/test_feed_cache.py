@@ -0,0 +1,27 @@
+from api.services import feed
+from api.services.feed import get_public_feed
+from api.services.feed_cache import FeedPageCache
+from api.tests.conftest import make_books, make_user
+
+
+def test_genre_spellings_share_one_cache_entry(db, monkeypatch):
+    owner = make_user(db, "owner")
+    books = make_books(db, owner, 3)
+    books[0].genre = "SciFi"
+    books[1].genre = "scifi"
+    db.commit()
+
+    cache = FeedPageCache(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(feed, "feed_cache", cache)
+    loads = []
+    load = feed._load_feed_page
+    monkeypatch.setattr(feed, "_load_feed_page", lambda *a: loads.append(a[2]) or load(*a))
+
+    pages = [get_public_feed(db, genre=g) for g in ("SciFi", "scifi", " scifi ", "SCIFI")]
+    assert loads == ["scifi"]
+    assert all(page == pages[0] for page in pages)
+    assert sorted(item["book"]["title"] for item in pages[0]["items"]) == ["Book 0", "Book 1"]
+
+    # blank is no filter at all
+    assert len(get_public_feed(db, genre="  ")["items"]) == 3
+    assert loads == ["scifi", None]
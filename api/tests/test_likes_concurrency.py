@@ -0,0 +1,56 @@
+import random
+import threading
+
+from sqlalchemy import func, select
+
+from api.models import Book, Like
+from api.services.feed import set_like, unset_like
+from api.tests.conftest import make_books, make_user
+
+THREADS = 8
+ROUNDS = 40
+
+
+def test_parallel_like_unlike_keeps_like_count_exact(db, Session):
+    users = [make_user(db, f"u{i}").id for i in range(THREADS)]
+    book_id = make_books(db, make_user(db, "owner"), 1)[0].id
+
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def worker(user_id: int, seed: int):
+        rng = random.Random(seed)
+        session = Session()
+        try:
+            barrier.wait()
+            for _ in range(ROUNDS):
+                # repeats on purpose: like/unlike are idempotent
+                op = set_like if rng.random() < 0.5 else unset_like
+                count = op(session, user_id, book_id)
+                assert 0 <= count <= THREADS
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(u, i)) for i, u in enumerate(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+    db.expire_all()
+    like_count = db.execute(select(Book.like_count).where(Book.id == book_id)).scalar_one()
+    likes = db.execute(select(func.count()).select_from(Like).where(Like.review_id == book_id)).scalar_one()
+    assert like_count == likes
+
+
+def test_like_and_unlike_are_idempotent(db):
+    user_id = make_user(db, "reader").id
+    book_id = make_books(db, make_user(db, "owner"), 1)[0].id
+
+    assert set_like(db, user_id, book_id) == 1
+    assert set_like(db, user_id, book_id) == 1
+    assert unset_like(db, user_id, book_id) == 0
+    assert unset_like(db, user_id, book_id) == 0
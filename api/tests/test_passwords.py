@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+from api.services.passwords import MAX_HASH_THREADS, PasswordHasher, PasswordHasherBusy, _hash
+
+
+def test_slots_are_capped_below_the_request_threadpool():
+    hasher = PasswordHasher(workers=2, queue_size=100, queue_timeout=0)
+    assert hasher.slots == MAX_HASH_THREADS
+
+
+def test_saturated_hasher_rejects_at_once():
+    hasher = PasswordHasher(workers=1, queue_size=1, queue_timeout=0)
+    password_hash = _hash("pw")
+    # every slot taken, as if two hashes were running / queued
+    for _ in range(hasher.slots):
+        assert hasher._slots.acquire(blocking=False)
+
+    started = time.perf_counter()
+    with pytest.raises(PasswordHasherBusy):
+        hasher.verify("pw", password_hash)
+    # no waiting for a slot while holding a request thread
+    assert time.perf_counter() - started < 0.1
+    assert hasher._executor is None
+
+
+def test_process_pool_hashes_and_verifies():
+    hasher = PasswordHasher(workers=1, queue_size=0, queue_timeout=0)
+    try:
+        password_hash = hasher.hash("hunter22")
+        assert hasher.verify("hunter22", password_hash)
+        assert not hasher.verify("wrong", password_hash)
+    finally:
+        hasher.shutdown()
+    # the slot is handed back after every call
+    assert hasher._slots.acquire(blocking=False)
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.models import Comment, Like
+from api.services.comments import list_comments
+from api.services.feed import get_public_feed, get_public_feed_item
+from api.tests.conftest import count_statements, make_books, make_user
+
+# Feed, feed item and comment listings are single projected queries: the
+# statement count per call is fixed and doesn't grow with the page size.
+
+
+@pytest.fixture
+def seeded(db):
+    owner = make_user(db, "owner")
+    reader = make_user(db, "reader")
+    books = make_books(db, owner, 60)
+    start = datetime(2024, 2, 1)
+    db.add_all(
+        Comment(review_id=books[0].id, user_id=reader.id, body=f"c{i}", created_at=start + timedelta(seconds=i))
+        for i in range(60)
+    )
+    db.add_all(Like(user_id=reader.id, review_id=b.id) for b in books[::2])
+    db.commit()
+    # plain ids: touching expired ORM objects inside count_statements would reload them
+    return {"reader_id": reader.id, "book_id": books[0].id}
+
+
+@pytest.mark.parametrize("limit", [5, 50])
+@pytest.mark.parametrize("as_reader, expected", [(False, 1), (True, 2)])
+def test_feed_page_statement_count(engine, db, seeded, limit, as_reader, expected):
+    user_id = seeded["reader_id"] if as_reader else None
+    with count_statements(engine) as statements:
+        page = get_public_feed(db, limit=limit, user_id=user_id, use_cache=False)
+    assert len(page["items"]) == limit
+    # the page itself, plus one liked_by_me lookup for a signed-in reader
+    assert len(statements) == expected
+
+
+@pytest.mark.parametrize("as_reader", [False, True])
+def test_feed_item_statement_count(engine, db, seeded, as_reader):
+    user_id = seeded["reader_id"] if as_reader else None
+    with count_statements(engine) as statements:
+        item = get_public_feed_item(db, seeded["book_id"], user_id=user_id)
+    assert item["author"]["username"] == "owner"
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("limit", [5, 50])
+def test_comment_page_statement_count(engine, db, seeded, limit):
+    with count_statements(engine) as statements:
+        page = list_comments(db, seeded["book_id"], limit=limit)
+    assert len(page["items"]) == limit
+    assert all(c["user"]["username"] == "reader" for c in page["items"])
+    assert len(statements) == 1
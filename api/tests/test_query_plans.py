@@ -0,0 +1,27 @@
+from api.scripts.check_query_plans import _capture, _cases, _explain, _seed
+from api.services import books
+from api.services.feed_cache import feed_cache
+
+# The check_query_plans cases under pytest: every statement the hot paths
+# issue must be served by an index, with no full scan or temp B-tree sort.
+
+
+def test_hot_paths_use_indexes(engine, Session, monkeypatch):
+    # plans of the loaders, not cache hits; no background cover lookups
+    monkeypatch.setattr(feed_cache, "enabled", False)
+    monkeypatch.setattr(books.cover_enricher, "submit", lambda *a, **kw: None)
+    _seed(Session)
+
+    captured = _capture(engine)
+    failures = {}
+    with Session() as db:
+        for label, fn in _cases(db):
+            captured.clear()
+            fn()
+            explained = _explain(engine, captured)
+            assert explained, f"{label}: no statements captured"
+            bad = {" ".join(statement.split()): problems for statement, _, problems in explained if problems}
+            if bad:
+                failures[label] = bad
+
+    assert failures == {}
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from api.config import settings
+from api.database import Base
+from api.models import Book
+from api.services import replica
+from api.services.replica import ReplicaRouter, wants_fresh_reads
+from api.tests.conftest import make_books, make_user
+from api.utils.sqlite import install_sqlite_profile
+
+# Primary and replica are two local SQLite files; ReplicaRouter.sync copies
+# one over the other, as READ_REPLICA_SYNC_SECONDS does.
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.sqlite'}", connect_args={"check_same_thread": False})
+    install_sqlite_profile(engine, settings.SQLITE_PROFILE, settings.SQLITE_BUSY_TIMEOUT_MS)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_router(engine, Session, replica_engine, monkeypatch):
+    monkeypatch.setattr(replica, "SessionLocal", Session)
+    monkeypatch.setattr(replica, "ReadSessionLocal", sessionmaker(bind=replica_engine, autoflush=False))
+
+    def make(max_lag=5.0, ryw_seconds=10.0):
+        return ReplicaRouter(
+            primary=engine,
+            replica=replica_engine,
+            max_lag=max_lag,
+            heartbeat_interval=1.0,
+            sync_interval=0.001,
+            ryw_seconds=ryw_seconds,
+            max_users=100,
+        )
+
+    return make
+
+
+def bind_of(db):
+    try:
+        return db.get_bind()
+    finally:
+        db.close()
+
+
+def test_reads_use_the_replica_once_it_reports_in(engine, replica_engine, make_router):
+    router = make_router()
+    # no heartbeat seen yet: the replica's lag is unknown
+    assert bind_of(router.session()) is engine
+
+    router.tick()
+    assert router.lag() < 1.0
+    assert bind_of(router.session()) is replica_engine
+    assert bind_of(router.session(user_id=7)) is replica_engine
+
+
+def test_replica_serves_what_was_synced(db, engine, replica_engine, make_router):
+    router = make_router()
+    owner = make_user(db, "owner")
+    make_books(db, owner, 2)
+    router.tick()
+    make_books(db, owner, 1)  # after the sync: primary only
+
+    count = select(func.count()).select_from(Book)
+    with router.session() as read:
+        assert read.get_bind() is replica_engine
+        assert read.execute(count).scalar() == 2
+    assert db.execute(count).scalar() == 3
+
+
+def test_read_your_writes_until_the_replica_catches_up(engine, replica_engine, make_router):
+    router = make_router()
+    router.tick()
+    router.note_write(7)
+
+    db = router.session(user_id=7)
+    assert db.get_bind() is engine and wants_fresh_reads(db)
+    db.close()
+    assert bind_of(router.session(user_id=8)) is replica_engine
+
+    # a heartbeat newer than the write has reached the replica
+    time.sleep(0.01)
+    router.tick()
+    assert bind_of(router.session(user_id=7)) is replica_engine
+
+
+def test_read_your_writes_is_capped(engine, replica_engine, make_router):
+    router = make_router(ryw_seconds=0.05)
+    router.tick()
+    router.note_write(7)
+    assert bind_of(router.session(user_id=7)) is engine
+    time.sleep(0.1)
+    assert bind_of(router.session(user_id=7)) is replica_engine
+
+
+def test_stale_replica_falls_back_to_the_primary(engine, replica_engine, make_router):
+    router = make_router(max_lag=0.05)
+    router.tick()
+    assert bind_of(router.session()) is replica_engine
+
+    time.sleep(0.1)
+    db = router.session()
+    assert db.get_bind() is engine and not wants_fresh_reads(db)
+    db.close()
+
+
+def test_without_a_replica_everything_reads_the_primary(engine, Session, monkeypatch):
+    monkeypatch.setattr(replica, "SessionLocal", Session)
+    router = ReplicaRouter(engine, engine, 5.0, 1.0, 0.0, 10.0, 100)
+    assert not router.enabled
+    assert bind_of(router.session()) is engine
+
+
+def test_file_sync_needs_two_sqlite_files(engine):
+    memory = create_engine("sqlite://")
+    router = ReplicaRouter(engine, memory, 5.0, 1.0, 1.0, 10.0, 100)
+    with pytest.raises(RuntimeError):
+        router.start()
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, bindparam, text
+
+from api.services.feed import get_public_feed
+from api.tests.conftest import make_books, make_user
+
+
+def test_rows_inserted_around_the_orm_are_neutral(db):
+    owner = make_user(db, "owner")
+    make_books(db, owner, 2)  # NEUTRAL via the ORM
+    # no review_type: left to the column's server default
+    raw_insert = text(
+        "INSERT INTO books (title, owner_id, created_at, like_count, comment_count) "
+        "VALUES (:title, :owner, :created, 0, 0)"
+    ).bindparams(bindparam("created", type_=DateTime()))
+    start = datetime(2023, 1, 1)
+    for i in range(3):
+        db.execute(raw_insert, {"title": f"Raw {i}", "owner": owner.id, "created": start + timedelta(minutes=i)})
+    db.commit()
+
+    assert db.execute(text("SELECT COUNT(*) FROM books WHERE review_type IS NULL")).scalar() == 0
+
+    # every row is in the sort and the NEUTRAL filter, and a raw row can end a page
+    for review_type in (None, "NEUTRAL"):
+        seen, after = [], None
+        for _ in range(10):
+            page = get_public_feed(db, sort="review_type", review_type=review_type, limit=2, after=after, use_cache=False)
+            seen += [item["book"]["title"] for item in page["items"]]
+            after = page["next_cursor"]
+            if not after:
+                break
+        assert sorted(seen) == ["Book 0", "Book 1", "Raw 0", "Raw 1", "Raw 2"]
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from api.auth_models import TokenBlocklist
+from api.services.revocation import BloomFilter, RevocationList
+
+
+def make_list(capacity=1000):
+    return RevocationList(capacity=capacity, sync_interval=60, prune_interval=3600)
+
+
+def test_revoke_is_seen_at_once(db):
+    revoked = make_list()
+    revoked.revoke(db, "jti-1", datetime.utcnow() + timedelta(minutes=5))
+    assert revoked.is_revoked("jti-1")
+    assert not revoked.is_revoked("jti-2")
+    assert not revoked.is_revoked(None)
+    assert db.execute(select(func.count()).select_from(TokenBlocklist)).scalar() == 1
+
+
+def test_other_workers_pick_up_revocations_on_sync(db):
+    here, there = make_list(), make_list()
+    here.revoke(db, "jti-1", datetime.utcnow() + timedelta(minutes=5))
+    assert not there.is_revoked("jti-1")
+
+    assert there.sync(db) == 1
+    assert there.is_revoked("jti-1")
+    # by id: a second sync reads nothing old
+    assert there.sync(db) == 0
+    here.revoke(db, "jti-2", None)
+    assert there.sync(db) == 1 and there.is_revoked("jti-2")
+
+
+def test_prune_drops_expired_tokens_only(db):
+    now = datetime.utcnow()
+    revoked = make_list()
+    revoked.revoke(db, "live", now + timedelta(minutes=5))
+    revoked.revoke(db, "expired", now - timedelta(minutes=1))
+    # written before expires_at existed: expires a token lifetime after created_at
+    db.add(TokenBlocklist(jti="legacy-old", created_at=now - timedelta(days=1)))
+    db.add(TokenBlocklist(jti="legacy-new", created_at=now))
+    db.commit()
+    revoked.sync(db)
+
+    assert revoked.prune(db) == 2
+    remaining = set(db.execute(select(TokenBlocklist.jti)).scalars())
+    assert remaining == {"live", "legacy-new"}
+    assert revoked.is_revoked("live") and revoked.is_revoked("legacy-new")
+    assert not revoked.is_revoked("expired") and not revoked.is_revoked("legacy-old")
+
+
+def test_filter_outgrowing_its_capacity_keeps_every_entry(db):
+    revoked = make_list(capacity=8)
+    expires = datetime.utcnow() + timedelta(minutes=5)
+    for i in range(50):
+        revoked.revoke(db, f"jti-{i}", expires)
+    assert all(revoked.is_revoked(f"jti-{i}") for i in range(50))
+    assert not any(revoked.is_revoked(f"other-{i}") for i in range(50))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=500)
+    items = [f"token-{i}" for i in range(500)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03
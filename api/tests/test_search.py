@@ -0,0 +1,38 @@
+import pytest
+
+from api.models import Book
+from api.services.search import ensure_search_index, search_reviews
+from api.tests.conftest import make_books, make_user
+
+
+@pytest.fixture
+def search_db(engine, db):
+    ensure_search_index(engine)
+    return db
+
+
+def collect(db, query, limit, review_types=None):
+    pages, after = [], None
+    for _ in range(20):
+        page = search_reviews(db, query, review_types=review_types, limit=limit, after=after)
+        pages.append([item["book"]["title"] for item in page["items"]])
+        after = page["next_cursor"]
+        if not after:
+            return pages
+    raise AssertionError("search never ran out of pages")
+
+
+def test_matches_without_an_owner_do_not_end_pagination_early(search_db):
+    db = search_db
+    owner = make_user(db, "owner")
+    books = make_books(db, owner, 4)
+    for book in books:
+        book.review_text = "a long slow read about spice"
+    # ownerless (legacy) rows that match better: title hits weigh the most
+    db.add_all(Book(title=f"Spice {i}", review_text="spice", owner_id=None) for i in range(6))
+    db.commit()
+
+    for review_types in (None, ["NEUTRAL"]):
+        pages = collect(db, "spice", limit=2, review_types=review_types)
+        assert sorted(t for p in pages for t in p) == ["Book 0", "Book 1", "Book 2", "Book 3"]
+        assert [len(p) for p in pages] == [2, 2]
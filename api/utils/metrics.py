@@ -0,0 +1,75 @@
+import threading
+from collections import deque
+from typing import Any, Callable
+
+
+class Stats:
+    """
+    Thread-safe counters plus a bounded window of latency samples.
+    Counters named "hits" and "misses" also get a derived hit_rate.
+    Gauges are callables read at snapshot time (current pool usage etc.).
+    """
+
+    def __init__(self, name: str, window: int = 2048):
+        self.name = name
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, Callable[[], Any]] = {}
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def gauge(self, key: str, read: Callable[[], Any]) -> None:
+        with self._lock:
+            self._gauges[key] = read
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = sorted(self._latencies)
+
+        out: dict = dict(counters)
+        for key, read in gauges.items():
+            out[key] = read()
+        if "hits" in counters or "misses" in counters:
+            total = counters.get("hits", 0) + counters.get("misses", 0)
+            out["hit_rate"] = round(counters.get("hits", 0) / total, 4) if total else None
+        if samples:
+            out["latency_ms"] = {
+                "count": len(samples),
+                "p50": _percentile_ms(samples, 0.50),
+                "p95": _percentile_ms(samples, 0.95),
+                "p99": _percentile_ms(samples, 0.99),
+                "max": round(samples[-1] * 1000, 3),
+            }
+        return out
+
+
+def _percentile_ms(samples: list[float], q: float) -> float:
+    idx = min(len(samples) - 1, int(q * len(samples)))
+    return round(samples[idx] * 1000, 3)
+
+
+_registry: dict[str, Stats] = {}
+_registry_lock = threading.Lock()
+
+
+def get_stats(name: str) -> Stats:
+    with _registry_lock:
+        stats = _registry.get(name)
+        if stats is None:
+            stats = _registry[name] = Stats(name)
+        return stats
+
+
+def snapshot_all() -> dict:
+    with _registry_lock:
+        items = list(_registry.items())
+    return {name: stats.snapshot() for name, stats in sorted(items)}
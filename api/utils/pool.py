@@ -0,0 +1,119 @@
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from api.utils.metrics import Stats, get_stats
+
+# Connection pool instrumentation and liveness checks for api/database.py.
+#
+# Checkout latency is the time spent in the pool's _do_get: ~0 when a
+# connection is idle, connect time when the pool grows, and queueing time
+# once pool_size + max_overflow connections are all in use.
+
+
+class _TimedGet:
+    stats: Stats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.incr("checkout_timeouts")
+            raise
+        finally:
+            self.stats.observe(time.perf_counter() - started)
+        self.stats.incr("checkouts")
+        return conn
+
+
+class InstrumentedQueuePool(_TimedGet, QueuePool):
+    """QueuePool that reports checkout latency and usage under `stats_name`."""
+
+    def __init__(self, *args, stats_name: str = "db_pool", **kw):
+        super().__init__(*args, **kw)
+        self.stats = get_stats(stats_name)
+        _register_gauges(self)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the gauges on the live one
+        pool = super().recreate()
+        pool.stats = self.stats
+        _register_gauges(pool)
+        return pool
+
+
+class InstrumentedReadQueuePool(InstrumentedQueuePool):
+    """Same, for the read-replica engine (create_engine can't pass stats_name through)."""
+
+    def __init__(self, *args, stats_name: str = "db_pool_read", **kw):
+        super().__init__(*args, stats_name=stats_name, **kw)
+
+
+class InstrumentedAsyncQueuePool(_TimedGet, AsyncAdaptedQueuePool):
+    def __init__(self, *args, stats_name: str = "db_pool_async", **kw):
+        super().__init__(*args, **kw)
+        self.stats = get_stats(stats_name)
+        _register_gauges(self)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        _register_gauges(pool)
+        return pool
+
+
+def _register_gauges(pool: QueuePool) -> None:
+    pool.stats.gauge("size", pool.size)
+    pool.stats.gauge("in_use", pool.checkedout)
+    pool.stats.gauge("idle", pool.checkedin)
+    pool.stats.gauge("overflow", lambda: max(0, pool.overflow()))
+
+
+def install_liveness_check(engine: Engine, idle_seconds: Optional[float], stats: Stats) -> None:
+    """
+    Track connection churn, and (when idle_seconds is set) ping a connection
+    on checkout only if it sat idle longer than that. Replaces pool_pre_ping,
+    which pays a SELECT 1 round trip on every checkout.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        stats.incr("connects")
+        record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_conn, record):
+        stats.incr("closes")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        stats.incr("invalidations")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        if record is not None:
+            record.info["last_used"] = time.monotonic()
+
+    if not idle_seconds:
+        return
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        if time.monotonic() - record.info.get("last_used", 0.0) < idle_seconds:
+            return
+        stats.incr("liveness_pings")
+        try:
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception:
+            stats.incr("liveness_failures")
+            # the pool discards this connection and retries with a new one
+            raise exc.DisconnectionError()
+        record.info["last_used"] = time.monotonic()
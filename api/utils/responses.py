@@ -0,0 +1,46 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row
+
+# naive datetimes are UTC throughout the app; render them as "...Z" like iso_utc
+_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+@lru_cache(maxsize=None)
+def _column_keys(mapper) -> tuple:
+    return tuple(mapper.column_attrs.keys())
+
+
+def _default(obj: Any) -> Any:
+    # orjson calls this only for types it can't serialize itself
+    # (dicts, lists, str/int/float, datetime/date, dataclasses are native)
+    if isinstance(obj, Row):
+        return obj._asdict()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    state = inspect(obj, raiseerr=False)
+    if state is not None and hasattr(state, "mapper"):
+        # loaded columns only: never lazy-loads (fatal on an AsyncSession)
+        # and never follows relationships
+        loaded = state.dict
+        return {key: loaded[key] for key in _column_keys(state.mapper) if key in loaded}
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class UTCJSONResponse(JSONResponse):
+    """
+    The app's response class: one orjson pass over dicts, ORM objects, rows
+    and dataclasses, with no jsonable_encoder walk first.
+
+    Set as the app's default_response_class; routes that return plain data
+    still get FastAPI's jsonable_encoder before render, so hot routes return
+    UTCJSONResponse(payload) themselves.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Connection-level PRAGMA profiles for local SQLite files (settings.SQLITE_PROFILE).
+#
+# - defaults: SQLite's own: rollback journal, synchronous=FULL, ~2 MB page
+#   cache, no mmap, foreign keys off (so ON DELETE CASCADE never fires)
+# - durable: WAL, so readers don't block the writer and vice versa, with
+#   synchronous=FULL: every commit survives power loss
+# - fast: WAL with synchronous=NORMAL (a power loss can drop the last few
+#   commits, never corrupt the file), a bigger page cache, mmap'd reads and
+#   in-memory temp tables
+#
+# cache_size is negative KiB and per connection, so it's paid pool_size +
+# max_overflow times. journal_mode=WAL is stored in the file; setting it on
+# each connection is a no-op after the first.
+
+SQLITE_PROFILES: Dict[str, List[str]] = {
+    "defaults": [],
+    "durable": [
+        "journal_mode=WAL",
+        "synchronous=FULL",
+        "foreign_keys=ON",
+    ],
+    "fast": [
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "cache_size=-32000",
+        "mmap_size=268435456",
+        "temp_store=MEMORY",
+        "foreign_keys=ON",
+    ],
+}
+
+# drivers that open a local file; libsql (Turso) manages its own connection
+_LOCAL_DRIVERS = ("pysqlite", "aiosqlite")
+
+
+def sqlite_pragmas(profile: str, busy_timeout_ms: int) -> List[str]:
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"unknown SQLite profile {profile!r}")
+    pragmas = list(SQLITE_PROFILES[profile])
+    if profile != "defaults":
+        pragmas.append(f"busy_timeout={int(busy_timeout_ms)}")
+    return pragmas
+
+
+def install_sqlite_profile(engine: Engine, profile: str, busy_timeout_ms: int) -> None:
+    """Run the profile's PRAGMAs on every new connection of a local SQLite engine."""
+    pragmas = sqlite_pragmas(profile, busy_timeout_ms)
+    if not pragmas or engine.dialect.name != "sqlite" or engine.driver not in _LOCAL_DRIVERS:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_conn, record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
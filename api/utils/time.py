@@ -1,8 +1,9 @@
 from datetime import timezone
 
+
 def iso_utc(dt):
     if not dt:
         return None
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
\ No newline at end of file
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")